@@ -0,0 +1,32 @@
+"""加载旧版 database.py
+
+database.py 依赖仓库根目录的 models.py，但同名的 models 包会遮住它。
+这里临时把 models.py 作为 models 模块装入，再导入 database。
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_legacy_database():
+    """返回 (database 模块, 旧 models 模块)"""
+    legacy_models = _load("models", ROOT / "models.py")
+    saved = sys.modules.get("models")
+    sys.modules["models"] = legacy_models
+    try:
+        database = _load("legacy_database", ROOT / "database.py")
+    finally:
+        if saved is None:
+            sys.modules.pop("models", None)
+        else:
+            sys.modules["models"] = saved
+    return database, legacy_models
@@ -0,0 +1,48 @@
+"""批量导出基准测试：多份课程表的全部周次，对比当前进程依次导出与进程池导出的吞吐量
+
+运行：QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_batch_export [课程表数] [进程数]
+"""
+import os
+import random
+import sys
+import tempfile
+
+from PyQt6.QtGui import QGuiApplication
+
+from models.course import Course
+from ui.timetable_model import TIME_SLOTS
+from utils.batch_export import batch_export
+
+
+def _timetable(rng: random.Random, count: int = 24):
+    """一名学生的课程表"""
+    courses = []
+    for course_id in range(count):
+        _, start, end = rng.choice(TIME_SLOTS)
+        first = rng.randrange(1, 9)
+        courses.append(Course(
+            id=course_id, name=f"课程{rng.randrange(500)}", room=f"{rng.randrange(1, 20)}-{rng.randrange(101, 640)}",
+            teacher=f"老师{rng.randrange(80)}", weeks=f"{first}-{first + rng.randrange(4, 12)}周",
+            day_of_week=rng.randrange(1, 8), start_time=start, end_time=end,
+        ))
+    return courses
+
+
+def main(students: int = 8, workers: int = None):
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+    rng = random.Random(42)
+    timetables = {f"学生{i:03d}": _timetable(rng) for i in range(students)}
+    workers = workers or os.cpu_count()
+    print(f"{students} 份课程表 × 20 周，CPU核数 {os.cpu_count()}")
+    for fmt in ("pdf", "png"):
+        with tempfile.TemporaryDirectory() as output:
+            serial = batch_export(timetables, output, fmt, workers=1)
+        with tempfile.TemporaryDirectory() as output:
+            pooled = batch_export(timetables, output, fmt, workers=workers)
+        print(f"{fmt.upper()}  依次导出 {serial.pages_per_second:6.1f} 页/秒  "
+              f"{workers} 个进程 {pooled.pages_per_second:6.1f} 页/秒  "
+              f"({pooled.pages_per_second / serial.pages_per_second:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
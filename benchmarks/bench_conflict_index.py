@@ -0,0 +1,75 @@
+"""冲突检测基准测试：对比线性扫描 conflicts_with 与 ConflictIndex
+
+运行：python -m benchmarks.bench_conflict_index [课程数 ...]
+"""
+import random
+import sys
+import time
+from datetime import time as dtime
+
+from models.conflict_index import ConflictIndex
+from models.course import Course
+
+LINEAR_LIMIT = 100_000  # 超过这个规模不再跑线性扫描
+
+
+def _random_course(rng: random.Random, course_id: int) -> Course:
+    start = rng.randrange(8 * 60, 21 * 60)
+    end = start + rng.randrange(45, 120)
+    first = rng.randrange(1, 20)
+    last = min(20, first + rng.randrange(0, 4))
+    return Course(
+        id=course_id, name=f"课程{course_id}", room="", teacher="",
+        weeks=f"{first}-{last}周", day_of_week=rng.randrange(1, 8),
+        start_time=dtime(start // 60, start % 60),
+        end_time=dtime(min(end, 1439) // 60, min(end, 1439) % 60),
+    )
+
+
+def main(*sizes: int):
+    sizes = sizes or (10_000, 100_000, 1_000_000)
+    rng = random.Random(42)
+    queries = [_random_course(rng, -1) for _ in range(200)]
+
+    print(f"{'课程数':>10}{'建索引(s)':>12}{'是否冲突(us)':>14}{'全部冲突(us)':>14}"
+          f"{'线性扫描(us)':>14}{'增删(us)':>10}{'平均冲突数':>12}")
+    for size in sizes:
+        courses = [_random_course(rng, i) for i in range(size)]
+
+        start = time.perf_counter()
+        index = ConflictIndex.build(courses)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for q in queries:
+            index.has_conflict(q)
+        first = (time.perf_counter() - start) / len(queries) * 1e6
+
+        start = time.perf_counter()
+        hits = sum(len(index.conflicts(q)) for q in queries)
+        indexed = (time.perf_counter() - start) / len(queries) * 1e6
+
+        if size <= LINEAR_LIMIT:
+            sample = queries[:20]
+            start = time.perf_counter()
+            for q in sample:
+                [c for c in courses if q.conflicts_with(c)]
+            linear = f"{(time.perf_counter() - start) / len(sample) * 1e6:14.0f}"
+        else:
+            linear = f"{'-':>14}"
+
+        extra = [_random_course(rng, size + i) for i in range(200)]
+        start = time.perf_counter()
+        for course in extra:
+            index.add(course)
+        for course in extra:
+            index.remove(course.id)
+        mutate = (time.perf_counter() - start) / (2 * len(extra)) * 1e6
+
+        print(f"{size:>10}{build:>12.2f}{first:>14.1f}{indexed:>14.1f}{linear}"
+              f"{mutate:>10.1f}{hits / len(queries):>12.1f}")
+        del courses, index
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
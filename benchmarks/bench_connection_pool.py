@@ -0,0 +1,97 @@
+"""连接池基准测试：对比每次调用新建连接与使用连接池的单次调用延迟
+
+运行：python -m benchmarks.bench_connection_pool [课程数] [重复次数]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from models.course_manager import COURSE_COLUMNS, CourseManager
+
+
+def _seed(manager: CourseManager, count: int):
+    with manager._pool.writer() as conn:
+        conn.executemany(
+            """
+            INSERT INTO courses (name, room, teacher, weeks, day_of_week,
+                                 start_time, end_time, description, color)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(f"课程{i}", f"教{i % 50}", f"老师{i % 80}", "1-16周", i % 7 + 1,
+              "08:20", "09:55", "", "#e3f2fd") for i in range(count)]
+        )
+
+
+# 旧实现：每次调用都新建并关闭连接
+def _legacy_get_course_score(db_path, course_id):
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute("SELECT score FROM courses WHERE id = ?", (course_id,)).fetchone()
+        return row[0] if row else None
+
+
+def _legacy_get_feedback(db_path, course_id):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("""
+            SELECT content, score, created_at FROM feedback
+            WHERE course_id = ? ORDER BY created_at DESC
+        """, (course_id,)).fetchall()
+
+
+def _legacy_search(manager, keyword):
+    with sqlite3.connect(manager.db_path) as conn:
+        cursor = conn.execute(f"""
+            SELECT {COURSE_COLUMNS} FROM courses WHERE name LIKE ? OR teacher LIKE ? OR room LIKE ?
+        """, (f"%{keyword}%",) * 3)
+        return [manager._row_to_course(row) for row in cursor.fetchall()]
+
+
+def _legacy_add_feedback(db_path, course_id, content, score):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO feedback (course_id, content, score) VALUES (?, ?, ?)",
+                     (course_id, content, score))
+        conn.execute("UPDATE courses SET score = ? WHERE id = ?", (score, course_id))
+
+
+def _measure(func, repeat: int) -> float:
+    """返回单次调用的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(count: int = 2000, repeat: int = 2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        manager = CourseManager(db_path)
+        _seed(manager, count)
+
+        cases = [
+            ("get_course_score",
+             lambda i: _legacy_get_course_score(db_path, i % count + 1),
+             lambda i: manager.get_course_score(i % count + 1)),
+            ("get_feedback",
+             lambda i: _legacy_get_feedback(db_path, i % count + 1),
+             lambda i: manager.get_feedback(i % count + 1)),
+            ("search_courses",
+             lambda i: _legacy_search(manager, f"课程{i % count}"),
+             lambda i: manager.search_courses(f"课程{i % count}")),
+            ("add_feedback",
+             lambda i: _legacy_add_feedback(db_path, i % count + 1, "很好", 4.5),
+             lambda i: manager.add_feedback(i % count + 1, "很好", 4.5)),
+        ]
+
+        print(f"{'调用':<18}{'新建连接(us)':>14}{'连接池(us)':>14}{'加速比':>10}")
+        for name, legacy, pooled in cases:
+            n = repeat if name != "search_courses" else max(repeat // 10, 1)
+            before = _measure(legacy, n)
+            after = _measure(pooled, n)
+            print(f"{name:<18}{before:>14.1f}{after:>14.1f}{before / after:>9.1f}x")
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,77 @@
+"""列式快照基准测试：对比逐个遍历Course对象与CourseColumns的筛选、分组统计
+
+运行：python -m benchmarks.bench_course_columns [课程数]
+"""
+import random
+import sys
+import time
+from collections import Counter
+
+from models.course import Course
+from models.course_columns import CourseColumns
+
+
+def _random_course(rng: random.Random, course_id: int) -> Course:
+    start = rng.randrange(8 * 60, 20 * 60)
+    first = rng.randrange(1, 17)
+    return Course(
+        id=course_id, name=f"课程{course_id % 2000}", room=f"教室{course_id % 300}",
+        teacher=f"老师{course_id % 800}", weeks=f"{first}-{min(20, first + 7)}周",
+        day_of_week=rng.randrange(1, 8), start_time=start, end_time=start + 95,
+    )
+
+
+def _timed(func, repeat: int = 5) -> float:
+    """返回单次调用的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def _group_teachers(courses):
+    groups = {}
+    for course in courses:
+        groups.setdefault(course.name, set()).add(course.teacher)
+    return groups
+
+
+def main(count: int = 200_000):
+    rng = random.Random(42)
+    courses = [_random_course(rng, i) for i in range(count)]
+
+    start = time.perf_counter()
+    columns = CourseColumns.build(courses)
+    print(f"建立列式快照 {count} 门课程: {(time.perf_counter() - start) * 1e3:.0f}ms")
+
+    mask = (1 << 3) | (1 << 4)
+    cases = [
+        ("某天某周的课程",
+         lambda: sorted((c for c in courses if c.day_of_week == 3 and c.week_mask >> 5 & 1),
+                        key=lambda c: c.start_min),
+         lambda: columns.courses(day=3, week=5)),
+        ("多周课程",
+         lambda: [c for c in courses if c.week_mask & mask],
+         lambda: columns.take(columns.select(weeks_mask=mask))),
+        ("某教师某教室",
+         lambda: [c for c in courses if c.teacher == "老师7" and c.room == "教室7"],
+         lambda: columns.courses(teacher="老师7", room="教室7")),
+        ("按星期计数",
+         lambda: Counter(c.day_of_week for c in courses),
+         lambda: columns.count_by("day")),
+        ("按教师计数",
+         lambda: Counter(c.teacher for c in courses),
+         lambda: columns.count_by("teacher")),
+        ("课程-教师分组",
+         lambda: _group_teachers(courses),
+         lambda: columns.group_by("name", "teacher")),
+    ]
+
+    print(f"{'操作':<12}{'遍历对象(ms)':>14}{'列式(ms)':>12}{'加速比':>10}")
+    for name, objects, columnar in cases:
+        before, after = _timed(objects), _timed(columnar)
+        print(f"{name:<12}{before:>14.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
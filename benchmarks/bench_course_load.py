@@ -0,0 +1,101 @@
+"""课程加载基准测试：对比原先的dataclass + strptime 与紧凑的 __slots__ 课程对象
+
+运行：python -m benchmarks.bench_course_load [课程数]
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, time as dtime
+from typing import List
+
+from models.course_manager import COURSE_COLUMNS, CourseManager
+
+
+@dataclass
+class LegacyCourse:
+    """原先的课程数据模型"""
+    id: int
+    name: str
+    room: str
+    teacher: str
+    weeks: str
+    day_of_week: int
+    start_time: dtime
+    end_time: dtime
+    description: str = ""
+    score: float = 0.0
+    feedback: List[str] = None
+    color: str = "#e3f2fd"
+
+
+def _legacy_load(manager: CourseManager) -> list:
+    with manager._pool.reader() as conn:
+        rows = conn.execute("SELECT * FROM courses").fetchall()
+    return [
+        LegacyCourse(
+            id=row['id'], name=row['name'], room=row['room'], teacher=row['teacher'],
+            weeks=row['weeks'], day_of_week=row['day_of_week'],
+            start_time=datetime.strptime(row['start_time'], '%H:%M').time(),
+            end_time=datetime.strptime(row['end_time'], '%H:%M').time(),
+            description=row['description'], color=row['color'],
+        )
+        for row in rows
+    ]
+
+
+def _compact_load(manager: CourseManager) -> list:
+    with manager._pool.reader() as conn:
+        return manager._query_courses(conn, f"SELECT {COURSE_COLUMNS} FROM courses")
+
+
+def _seed(manager: CourseManager, count: int):
+    slots = [("08:20", "09:55"), ("10:15", "11:50"), ("14:00", "15:35"),
+             ("15:55", "17:30"), ("19:00", "20:35")]
+    with manager._pool.writer() as conn:
+        conn.executemany(
+            """
+            INSERT INTO courses (name, room, teacher, weeks, week_mask, day_of_week,
+                                 start_time, end_time, description, color)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(f"课程{i}", f"{i % 30 + 1}教{i % 400 + 100}", f"老师{i % 500}", "1-16周",
+              (1 << 17) - 2, i % 7 + 1, *slots[i % len(slots)], "", "#e3f2fd")
+             for i in range(count)]
+        )
+
+
+def _measure(load, manager: CourseManager):
+    """返回 (耗时秒, 常驻内存字节)"""
+    gc.collect()
+    start = time.perf_counter()
+    courses = load(manager)
+    elapsed = time.perf_counter() - start
+    del courses
+    gc.collect()
+    tracemalloc.start()
+    courses = load(manager)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del courses
+    return elapsed, size
+
+
+def main(count: int = 200_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = CourseManager(os.path.join(tmp, "bench.db"))
+        _seed(manager, count)
+
+        print(f"{'实现':<16}{'加载(ms)':>12}{'内存(MB)':>12}{'每门(字节)':>12}")
+        for name, load in (("dataclass", _legacy_load), ("__slots__", _compact_load)):
+            elapsed, size = _measure(load, manager)
+            print(f"{name:<16}{elapsed * 1e3:>12.0f}{size / 2 ** 20:>12.1f}{size / count:>12.0f}")
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""PDF课表网格构造基准测试：对比逐小时扫描全部课程与按时间段索引直接放置
+
+运行：python -m benchmarks.bench_export_grid [最大课程数]
+"""
+import random
+import sys
+import time
+
+from models.course import Course
+from ui.timetable_model import TIME_SLOTS
+from utils.export import build_week_grid
+
+
+def _random_course(rng: random.Random, course_id: int) -> Course:
+    # 从某个时间段开始，有时连上后面几个时间段
+    first = rng.randrange(len(TIME_SLOTS))
+    last = min(len(TIME_SLOTS) - 1, first + rng.choice((0, 0, 0, 1, 2)))
+    start, end = TIME_SLOTS[first][1], TIME_SLOTS[last][2]
+    return Course(id=course_id, name=f"课程{course_id}", room=f"教室{rng.randrange(50)}",
+                  teacher=f"老师{rng.randrange(80)}", weeks="1-16周",
+                  day_of_week=rng.randrange(1, 8), start_time=start, end_time=end)
+
+
+def _hourly_grid(courses):
+    # 原先的做法：每个整点扫描一遍全部课程，同一格后来的课程覆盖先前的
+    time_slots = {}
+    for hour in range(8, 20):
+        for course in courses:
+            if course.start_time.hour <= hour < course.end_time.hour:
+                if hour not in time_slots:
+                    time_slots[hour] = [f"{hour}:00"] + [""] * 7
+                time_slots[hour][course.day_of_week] = f"{course.name}\n{course.teacher}\n{course.room}"
+    return [time_slots.get(hour, [f"{hour}:00"] + [""] * 7) for hour in range(8, 20)]
+
+
+def _timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main(max_count: int = 100000):
+    rng = random.Random(42)
+    count = 100
+    while count <= max_count:
+        courses = [_random_course(rng, i) for i in range(count)]
+        repeat = max(1, 20000 // count)
+        before = _timed(lambda: _hourly_grid(courses), repeat)
+        after = _timed(lambda: build_week_grid(courses), repeat)
+        print(f"{count:>7} 门课程  逐小时扫描 {before:8.2f}ms  时间段索引 {after:8.2f}ms  "
+              f"({before / after:.1f}x)")
+        count *= 10
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""模糊搜索基准测试：整学期课程上的部分字符串、拼音首字母、错别字查询及增量更新耗时
+
+运行：python -m benchmarks.bench_fuzzy_search [课程数]
+"""
+import random
+import sys
+import time
+
+from models.course import Course
+from models.fuzzy_index import FuzzyCourseIndex
+
+_SUBJECTS = ["数据结构", "高等数学", "线性代数", "大学英语", "计算机网络", "操作系统",
+             "管理学原理", "概率论与数理统计", "Python语言程序设计", "大学物理", "体育",
+             "马克思主义基本原理", "离散数学", "编译原理", "数据库系统", "软件工程"]
+_SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗"
+_GIVEN = "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂"
+
+
+def _random_course(rng: random.Random, course_id: int) -> Course:
+    start = rng.randrange(8 * 60, 20 * 60)
+    return Course(
+        id=course_id, name=f"{rng.choice(_SUBJECTS)}{'ABCD'[course_id % 4]}",
+        room=f"{rng.randrange(1, 20)}-{rng.randrange(101, 640)}",
+        teacher=rng.choice(_SURNAMES) + rng.choice(_GIVEN) + rng.choice(_GIVEN),
+        weeks="1-16周", day_of_week=rng.randrange(1, 8), start_time=start, end_time=start + 95,
+    )
+
+
+def _timed(func, repeat: int = 200) -> float:
+    """返回单次调用的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main(count: int = 3000):
+    rng = random.Random(42)
+    courses = [_random_course(rng, i) for i in range(count)]
+
+    start = time.perf_counter()
+    index = FuzzyCourseIndex.build(courses)
+    print(f"建立索引 {count} 门课程: {(time.perf_counter() - start) * 1e3:.0f}ms")
+
+    queries = [
+        ("部分字符串", "结构"),
+        ("拼音首字母", "czxt"),
+        ("错别字", "数剧结构"),
+        ("英文错拼", "pyhton"),
+        ("教室号", "12-3"),
+        ("多个词", "数学 王"),
+    ]
+    for label, query in queries:
+        hits = len(index.search(query))
+        top = _timed(lambda: index.search(query, limit=20))
+        print(f"{label:<8}{query:<10}命中 {hits:>5}  前20条 {top:.3f}ms")
+
+    changed = courses[:100]
+    elapsed = _timed(lambda: [index.update(course) for course in changed], repeat=10)
+    print(f"增量更新单门课程: {elapsed / len(changed) * 1e3:.1f}µs")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
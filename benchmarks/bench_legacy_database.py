@@ -0,0 +1,90 @@
+"""旧版 Database 索引基准测试：对比整表扫描与增量索引
+
+运行：python -m benchmarks.bench_legacy_database [课程数] [重复次数]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import time as dtime
+
+from benchmarks._legacy import load_legacy_database
+
+
+# 原先的实现：每次都扫描整个列表
+def _old_by_day(courses, weekday):
+    return [course for course in courses if course.weekday == weekday]
+
+
+def _old_has_conflict(courses, course):
+    return any(existing.has_time_conflict(course) for existing in courses)
+
+
+def _old_index_of(courses, course):
+    return courses.index(course)
+
+
+def _old_remove_add(courses, course):
+    courses.remove(course)
+    courses.append(course)
+
+
+def _measure(func, repeat: int) -> float:
+    """返回单次调用的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(count: int = 10_000, repeat: int = 500):
+    database, legacy_models = load_legacy_database()
+
+    def course(i: int, minute_offset: int = 0):
+        # 每门课占一分钟，星期0-6轮换，互不冲突
+        minute = i // 7 + minute_offset
+        return legacy_models.Course(
+            name=f"课程{i}", teacher=f"老师{i % 300}", location=f"教室{i % 200}",
+            start_time=dtime(minute // 60, minute % 60),
+            end_time=dtime((minute + 1) // 60, (minute + 1) % 60), weekday=i % 7,
+        )
+
+    count = min(count, 7 * (24 * 60 - 1))
+    with tempfile.TemporaryDirectory() as tmp:
+        db = database.Database(os.path.join(tmp, "courses.json"), journaled=True,
+                               compact_every=10 ** 9)
+        db.courses = [course(i) for i in range(count)]
+        db._rebuild_indexes()
+        old = list(db.courses)
+        clash = [course(i * 37 % count) for i in range(repeat)]  # 与已有课程冲突
+
+        cases = [
+            ("get_courses_by_day",
+             lambda i: _old_by_day(old, i % 7),
+             lambda i: db.get_courses_by_day(i % 7)),
+            ("冲突检查",
+             lambda i: _old_has_conflict(old, clash[i]),
+             lambda i: db.add_course(clash[i])),
+            ("按对象查位置",
+             lambda i: _old_index_of(old, old[-1 - i % 100]),
+             lambda i: db._index_of(old[-1 - i % 100])),
+            ("按相等查位置",
+             lambda i: _old_index_of(old, clash[i]),
+             lambda i: db._index_of(clash[i])),
+        ]
+
+        print(f"{'操作':<20}{'扫描(us)':>12}{'索引(us)':>12}{'加速比':>10}")
+        for name, before_func, after_func in cases:
+            before, after = _measure(before_func, repeat), _measure(after_func, repeat)
+            print(f"{name:<20}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+        # 删除后再加入同一门课（新实现包含追加日志的开销）
+        targets = [db.courses[i * 13 % count] for i in range(repeat)]
+        before = _measure(lambda i: _old_remove_add(old, targets[i]), repeat)
+        after = _measure(lambda i: (db.remove_course(targets[i]), db.add_course(targets[i])), repeat)
+        print(f"{'删除后重新加入':<20}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
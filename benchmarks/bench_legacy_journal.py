@@ -0,0 +1,51 @@
+"""旧版JSON存储基准测试：对比每次修改整体重写与追加日志
+
+运行：python -m benchmarks.bench_legacy_journal [课程数] [修改次数]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import time as dtime
+
+from benchmarks._legacy import load_legacy_database
+
+
+def main(count: int = 20_000, edits: int = 200):
+    database, legacy_models = load_legacy_database()
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "courses.json")
+        seed = database.Database(filename, journaled=False)
+        seed.courses = [
+            legacy_models.Course(
+                name=f"课程{i}", teacher=f"老师{i % 300}", location=f"教室{i % 200}",
+                start_time=dtime(8 + i % 12, 0), end_time=dtime(8 + i % 12, 50),
+                weekday=i % 7, description="课程说明",
+            )
+            for i in range(count)
+        ]
+        seed.save_data()
+        print(f"快照: {count} 门课程, {os.path.getsize(filename) / 2 ** 20:.1f}MB")
+
+        print(f"{'模式':<10}{'单次修改(ms)':>14}{'加载(ms)':>12}")
+        for journaled in (False, True):
+            db = database.Database(filename, journaled=journaled, compact_every=edits + 1)
+            start = time.perf_counter()
+            for i in range(edits):
+                db.set_rating(db.courses[i * 7 % count], i % 5 + 1.0)
+            per_edit = (time.perf_counter() - start) / edits * 1e3
+            db._close_journal()  # 保留日志，测量加载时的重放
+
+            start = time.perf_counter()
+            reloaded = database.Database(filename, journaled=journaled)
+            load = (time.perf_counter() - start) * 1e3
+            print(f"{'日志' if journaled else '整体重写':<10}{per_edit:>14.3f}{load:>12.0f}")
+
+            start = time.perf_counter()
+            reloaded.close()
+            if journaled:
+                print(f"合并 {edits} 条日志: {(time.perf_counter() - start) * 1e3:.0f}ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
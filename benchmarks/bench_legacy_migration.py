@@ -0,0 +1,67 @@
+"""旧数据迁移基准测试：流式迁移的耗时与内存峰值，对比一次性 json.load
+
+运行：python -m benchmarks.bench_legacy_migration [课程数] [每门反馈数]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from models.course_manager import CourseManager
+from utils.legacy_migration import migrate_legacy_json
+
+
+def _write_legacy(path: str, count: int, feedback: int):
+    """逐条写出旧格式文件；每门课占一分钟，星期0-6轮换，互不冲突"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(count):
+            minute = i // 7 % (24 * 60 - 1)
+            course = {
+                "name": f"课程{i}", "teacher": f"老师{i % 300}", "location": f"教室{i % 200}",
+                "start_time": f"{minute // 60:02d}:{minute % 60:02d}",
+                "end_time": f"{(minute + 1) // 60:02d}:{(minute + 1) % 60:02d}",
+                "weekday": i % 7, "description": "课程说明" * 5, "rating": 4.0,
+                "feedback": [f"第{k}条反馈，内容比较长" * 3 for k in range(feedback)],
+            }
+            f.write(("  " if i == 0 else ",\n  ") + json.dumps(course, ensure_ascii=False))
+        f.write("\n]\n")
+
+
+def _peak(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(count: int = 10_000, feedback: int = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "courses.json")
+        _write_legacy(legacy, count, feedback)
+        size = os.path.getsize(legacy)
+        print(f"旧文件: {count} 门课程, {size / 2 ** 20:.1f}MB")
+
+        def load_all():
+            with open(legacy, encoding="utf-8") as f:
+                return len(json.load(f))
+
+        _, elapsed, peak = _peak(load_all)
+        print(f"json.load       耗时 {elapsed:6.2f}s  内存峰值 {peak / 2 ** 20:7.1f}MB")
+
+        for batch in (100, 1000):
+            manager = CourseManager(os.path.join(tmp, f"courses_{batch}.db"))
+            report, elapsed, peak = _peak(lambda: migrate_legacy_json(legacy, manager, batch))
+            manager.close()
+            state = report.progress
+            print(f"流式迁移(批{batch:>5}) 耗时 {elapsed:6.2f}s  内存峰值 {peak / 2 ** 20:7.1f}MB"
+                  f"  课程 {state.migrated}  反馈 {state.feedback}  拒绝 {state.rejected}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
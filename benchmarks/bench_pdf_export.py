@@ -0,0 +1,60 @@
+"""矢量PDF导出基准测试：大量学生课表时，每份文档重新解析字体、构造样式与进程内缓存的对比
+
+字体取环境变量 TIMETABLE_PDF_FONT 或系统中的中文 TrueType 字体；都没有时用
+reportlab 自带的 Vera.ttf 演示 TrueType 的解析和子集嵌入开销（无法显示中文）。
+
+运行：python -m benchmarks.bench_pdf_export [课表数]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import reportlab
+
+from benchmarks.bench_batch_export import _timetable
+from utils import export
+from utils.export import CJK_FONT_CANDIDATES, CJK_FONT_ENV, export_many_to_pdf
+
+
+def _font_path() -> str:
+    for path, _ in [(os.environ.get(CJK_FONT_ENV), 0)] + CJK_FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return path
+    return os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+
+
+def _clear_caches():
+    export.register_cjk_font.cache_clear()
+    export._table_style.cache_clear()
+    export._title_style.cache_clear()
+
+
+def main(students: int = 200):
+    rng = random.Random(42)
+    timetables = {f"学生{i:04d}": _timetable(rng) for i in range(students)}
+    font_path = _font_path()
+    print(f"{students} 份课表，字体 {os.path.basename(font_path)} "
+          f"({os.path.getsize(font_path) / 1024:.0f}KB)")
+
+    with tempfile.TemporaryDirectory() as output:
+        start = time.perf_counter()
+        for name, courses in timetables.items():
+            _clear_caches()  # 每份文档都重新解析字体
+            export.export_to_pdf(courses, os.path.join(output, f"{name}.pdf"), font_path=font_path)
+        before = (time.perf_counter() - start) / students * 1e3
+
+    with tempfile.TemporaryDirectory() as output:
+        _clear_caches()
+        start = time.perf_counter()
+        files = export_many_to_pdf(timetables, output, font_path=font_path)
+        after = (time.perf_counter() - start) / students * 1e3
+        size = sum(os.path.getsize(f) for f in files) / len(files) / 1024
+
+    print(f"每份文档  重新解析字体 {before:.1f}ms  缓存 {after:.1f}ms  ({before / after:.1f}x)")
+    print(f"平均文件大小 {size:.1f}KB（只嵌入用到的字形）")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,84 @@
+"""课程提醒基准测试：用模拟时钟和无界面通知后端走完整个学期，检查每次提醒是否准时送达
+
+定时器每次都在下一次提醒到期时触发；脚本把模拟时钟直接拨到该时刻，
+统计唤醒次数、送达的提醒和通知条数，并与每分钟轮询一次的唤醒次数对比。
+
+运行：python -m benchmarks.bench_reminders [课程数]
+"""
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from PyQt6.QtCore import QCoreApplication
+
+from models.course import Course
+from models.reminder_scheduler import ReminderScheduler
+from ui.timetable_model import TIME_SLOTS
+from utils.notifications import HeadlessBackend, NotificationQueue, Reminder
+
+TERM_START = date(2024, 9, 9)
+LEAD_MINUTES = 15
+
+
+def _random_course(rng: random.Random, course_id: int) -> Course:
+    _, start, end = rng.choice(TIME_SLOTS)
+    first = rng.randrange(1, 9)
+    return Course(
+        id=course_id, name=f"课程{course_id}", room=f"{rng.randrange(1, 20)}-{rng.randrange(101, 640)}",
+        teacher=f"老师{rng.randrange(200)}", weeks=f"{first}-{first + rng.randrange(4, 12)}周",
+        day_of_week=rng.randrange(1, 8), start_time=start, end_time=end,
+    )
+
+
+def main(count: int = 3000):
+    # 通知队列的定时器需要应用对象
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    rng = random.Random(42)
+    courses = [_random_course(rng, i) for i in range(count)]
+    holidays = [TERM_START + timedelta(days=24), TERM_START + timedelta(days=25)]
+
+    now = datetime(TERM_START.year, TERM_START.month, TERM_START.day)
+    clock = lambda: now
+    backend = HeadlessBackend(clock)
+    queue = NotificationQueue(backend, clock=clock)
+    scheduler = ReminderScheduler(TERM_START, LEAD_MINUTES, holidays)
+
+    start = time.perf_counter()
+    scheduler.set_courses(courses, now)
+    print(f"展开 {count} 门课程的 {len(scheduler)} 次上课: "
+          f"{(time.perf_counter() - start) * 1e3:.1f}ms")
+
+    expected = {(course.id, start) for course in courses
+                for start in scheduler.occurrences(course)}
+    term_begin = now
+    wakeups = 0
+    start = time.perf_counter()
+    while True:
+        due = scheduler.next_due()
+        if due is None:
+            break
+        now = due  # 定时器在提醒时刻触发
+        wakeups += 1
+        lead = scheduler.lead
+        queue.push(Reminder(course, begin, begin - lead)
+                   for course, begin in scheduler.pop_due(now))
+        queue.flush()
+    elapsed = time.perf_counter() - start
+
+    delivered = [(sent, reminder) for sent, notification in backend.delivered
+                 for reminder in notification.reminders]
+    late = sum(1 for sent, reminder in delivered if sent != reminder.due)
+    keys = [(reminder.course.id, reminder.start) for _, reminder in delivered]
+    assert len(keys) == len(set(keys)), "重复提醒"
+    assert set(keys) == expected, "遗漏提醒"
+    assert late == 0, f"{late} 次提醒未准时送达"
+
+    polls = int((now - term_begin).total_seconds() // 60)
+    print(f"送达 {len(delivered)} 次提醒，合并为 {len(backend.delivered)} 条通知，全部准时")
+    print(f"定时器唤醒 {wakeups} 次（每分钟轮询需 {polls} 次），"
+          f"每次唤醒 {elapsed / wakeups * 1e6:.0f}µs")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""搜索基准测试：对比LIKE全表扫描与FTS5全文索引
+
+运行：python -m benchmarks.bench_search [课程数] [重复次数]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from models.course_manager import CourseManager
+
+SUBJECTS = ["高等数学", "线性代数", "大学物理", "程序设计", "数据结构", "操作系统",
+            "计算机网络", "数据库原理", "大学英语", "概率统计", "软件工程", "编译原理"]
+SURNAMES = "王李张刘陈杨黄赵周吴徐孙马朱胡郭何林罗高"
+GIVEN = "伟芳娜敏静丽强磊军洋勇艳杰涛明超秀兰霞平刚"
+
+
+def _teacher(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN)
+
+
+def _seed(manager: CourseManager, count: int, batch: int = 50_000):
+    rng = random.Random(7)
+    for offset in range(0, count, batch):
+        rows = []
+        for i in range(offset, min(offset + batch, count)):
+            subject = rng.choice(SUBJECTS)
+            rows.append((f"{subject}{i}", f"{rng.randrange(1, 30)}教{rng.randrange(100, 600)}",
+                         _teacher(rng), "1-16周", i % 7 + 1,
+                         "08:20", "09:55", f"{subject}课程说明", "#e3f2fd"))
+        with manager._pool.writer() as conn:
+            conn.executemany(
+                """
+                INSERT INTO courses (name, room, teacher, weeks, day_of_week,
+                                     start_time, end_time, description, color)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+
+
+def _measure(func, keywords) -> float:
+    """返回单次搜索的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for keyword in keywords:
+        func(keyword)
+    return (time.perf_counter() - start) / len(keywords) * 1e3
+
+
+def main(count: int = 1_000_000, repeat: int = 50):
+    rng = random.Random(42)
+    cases = {
+        "精确名称": [f"{rng.choice(SUBJECTS)}{rng.randrange(count)}" for _ in range(repeat)],
+        "教师+课程": [f"{_teacher(rng)} {rng.choice(SUBJECTS)}"
+                   for _ in range(repeat)],
+        "教室前缀": [f"{rng.randrange(1, 30)}教{rng.randrange(100, 600)}" for _ in range(repeat)],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = CourseManager(os.path.join(tmp, "bench.db"))
+        start = time.perf_counter()
+        _seed(manager, count)
+        print(f"写入 {count} 门课程（含索引维护）: {time.perf_counter() - start:.1f}s，"
+              f"分词器: {manager._get_fts_tokenizer()}")
+
+        print(f"{'查询':<10}{'LIKE(ms)':>12}{'FTS5(ms)':>12}{'FTS5前20(ms)':>16}")
+        for name, keywords in cases.items():
+            like_keywords = keywords[:max(len(keywords) // 10, 1)]
+            like = _measure(lambda k: manager._search_like(k.split(), None), like_keywords)
+            fts = _measure(manager.search_courses, keywords)
+            top = _measure(lambda k: manager.search_courses(k, limit=20), keywords)
+            print(f"{name:<10}{like:>12.2f}{fts:>12.2f}{top:>16.2f}")
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,63 @@
+"""启动耗时基准测试：对比每次启动重建feedback表与按版本迁移
+
+运行：python -m benchmarks.bench_startup [反馈条数]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from models.course_manager import CourseManager
+
+
+def _legacy_init_db(db_path: str):
+    """旧版 _init_db：每次启动都把feedback整表复制一遍"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS feedback_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                course_id INTEGER,
+                content TEXT,
+                score REAL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            INSERT INTO feedback_new (id, course_id, content, created_at)
+            SELECT id, course_id, content, created_at FROM feedback
+        """)
+        conn.execute("DROP TABLE feedback")
+        conn.execute("ALTER TABLE feedback_new RENAME TO feedback")
+
+
+def _seed(db_path: str, count: int):
+    manager = CourseManager(db_path)
+    with manager._pool.writer() as conn:
+        conn.executemany(
+            "INSERT INTO feedback (course_id, content, score) VALUES (?, ?, ?)",
+            ((i % 500 + 1, "老师讲得很清楚", 4.5) for i in range(count))
+        )
+    manager.close()
+
+
+def main(count: int = 1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        _seed(db_path, count)
+        print(f"feedback行数: {count}")
+
+        start = time.perf_counter()
+        _legacy_init_db(db_path)
+        print(f"旧版启动:   {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+        for _ in range(3):
+            start = time.perf_counter()
+            manager = CourseManager(db_path)
+            elapsed = time.perf_counter() - start
+            manager.close()
+            print(f"迁移后启动: {elapsed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
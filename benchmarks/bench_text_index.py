@@ -0,0 +1,54 @@
+"""搜索框基准测试：对比逐键对每门课程转换大小写后匹配与预先规范化的文本索引
+
+运行：python -m benchmarks.bench_text_index [课程数]
+"""
+import random
+import sys
+import time
+
+from models.course import Course
+from models.text_index import CourseTextIndex
+
+
+def _random_course(rng: random.Random, course_id: int) -> Course:
+    start = rng.randrange(8 * 60, 20 * 60)
+    return Course(
+        id=course_id, name=f"Python程序设计{course_id % 500}", room=f"12-{course_id % 300}",
+        teacher=f"老师{course_id % 800}", weeks="1-16周", day_of_week=rng.randrange(1, 8),
+        start_time=start, end_time=start + 95, description=f"第{course_id % 40}章 数据结构与算法",
+    )
+
+
+def _scan(courses, text: str):
+    # 原先每次按键的做法：逐门课程转换各字段的大小写
+    text = text.lower()
+    return {c.id for c in courses
+            if text in c.name.lower() or text in c.teacher.lower()
+            or text in c.room.lower() or text in c.description.lower()}
+
+
+def _type(search, query: str) -> float:
+    """逐字输入 query，返回每次按键的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for end in range(1, len(query) + 1):
+        search(query[:end])
+    return (time.perf_counter() - start) / len(query) * 1e3
+
+
+def main(count: int = 5000):
+    rng = random.Random(42)
+    courses = [_random_course(rng, i) for i in range(count)]
+
+    start = time.perf_counter()
+    index = CourseTextIndex.build(courses)
+    print(f"建立文本索引 {count} 门课程: {(time.perf_counter() - start) * 1e3:.1f}ms")
+
+    for query in ("python程序设计12", "老师42", "数据结构"):
+        before = _type(lambda text: _scan(courses, text), query)
+        index.search("")  # 每个查询从头开始
+        after = _type(index.search, query)
+        print(f"{query:<16}逐键扫描 {before:6.2f}ms  索引 {after:6.2f}ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
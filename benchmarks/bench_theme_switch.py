@@ -0,0 +1,142 @@
+"""主题切换基准测试：样式表生成、主题预览和打开对话框后应用主题的耗时
+
+运行：QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_theme_switch [轮数]
+"""
+import sys
+import time
+
+from PyQt6.QtCore import QCoreApplication, QEvent, Qt
+from PyQt6.QtWidgets import (QApplication, QComboBox, QFrame, QHBoxLayout, QLabel, QLineEdit,
+                             QMainWindow, QPushButton, QTableView, QVBoxLayout, QWidget)
+
+from ui.theme_dialog import ThemeDialog
+from ui.timetable_model import CourseCardDelegate, TimetableModel
+from utils.theme_manager import ThemeManager
+
+
+def _window(manager: ThemeManager) -> QMainWindow:
+    """与主窗口结构相近的控件树：工具栏按钮、周次下拉框、搜索框和课程表"""
+    window = QMainWindow()
+    central = QWidget()
+    layout = QVBoxLayout(central)
+    toolbar = QHBoxLayout()
+    for text in ("添加课程", "导入", "导出", "提醒设置", "主题"):
+        toolbar.addWidget(QPushButton(text))
+    combo = QComboBox()
+    combo.addItems([f"第{i}周" for i in range(1, 21)])
+    toolbar.addWidget(combo)
+    toolbar.addWidget(QLineEdit())
+    layout.addLayout(toolbar)
+    view = QTableView()
+    view.setModel(TimetableModel(view))
+    view.setItemDelegate(CourseCardDelegate(manager.get_card_palette(), view))
+    layout.addWidget(view)
+    window.setCentralWidget(central)
+    window.resize(1400, 800)
+    window.show()
+    return window
+
+
+def _old_preview(theme) -> QWidget:
+    """与原主题卡片相同结构的预览：色块、说明文字和预览文本各是一个带样式表的控件"""
+    preview = QWidget()
+    layout = QVBoxLayout(preview)
+    colors = QHBoxLayout()
+    for color_name, color in (("主色调", theme['primary']), ("强调色", theme['accent'])):
+        swatch = QFrame()
+        swatch.setFixedSize(32, 32)
+        swatch.setStyleSheet(f"background-color: {color}; border-radius: 4px;"
+                             f" border: 1px solid {theme['border']};")
+        label = QLabel(color_name)
+        label.setStyleSheet(f"color: {theme['text_secondary']}; font-size: 12px;")
+        column = QVBoxLayout()
+        column.addWidget(swatch, alignment=Qt.AlignmentFlag.AlignCenter)
+        column.addWidget(label, alignment=Qt.AlignmentFlag.AlignCenter)
+        colors.addLayout(column)
+    layout.addLayout(colors)
+    text = QLabel("预览文本")
+    text.setStyleSheet(f"color: {theme['text']}; font-size: 13px; padding: 8px;"
+                       f" background: {theme['surface']}; border-radius: 4px;")
+    layout.addWidget(text)
+    return preview
+
+
+def _show_previews(window: QMainWindow, make_preview):
+    """在主窗口上弹出一组主题预览，绘制后关闭"""
+    container = QWidget(window, Qt.WindowType.Window)
+    layout = QHBoxLayout(container)
+    for theme_name, theme in ThemeManager.THEMES.items():
+        layout.addWidget(make_preview(theme_name, theme))
+    container.show()
+    QApplication.processEvents()
+    container.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+def _pixmap_preview(manager: ThemeManager):
+    def make_preview(theme_name, _):
+        label = QLabel()
+        label.setPixmap(manager.get_preview_pixmap(theme_name))
+        return label
+    return make_preview
+
+
+def _timed(func, rounds: int) -> float:
+    """返回每轮的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for i in range(rounds):
+        func(i)
+        QApplication.processEvents()
+    return (time.perf_counter() - start) / rounds * 1e3
+
+
+def main(rounds: int = 20):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    manager = ThemeManager()
+    names = list(ThemeManager.THEMES)
+    window = _window(manager)
+    app.processEvents()
+
+    before = _timed(lambda i: ThemeManager._build_stylesheet(
+        manager.get_theme(names[i % len(names)])), rounds * 50)
+    after = _timed(lambda i: manager.get_stylesheet(names[i % len(names)]), rounds * 50)
+    print("获取样式表")
+    print(f"  每次生成: {before * 1e3:.1f}µs")
+    print(f"  缓存:     {after * 1e3:.1f}µs")
+
+    manager.compile_all()
+    before = _timed(lambda _: _show_previews(window, lambda _, theme: _old_preview(theme)), rounds)
+    after = _timed(lambda _: _show_previews(window, _pixmap_preview(manager)), rounds)
+    print(f"显示 {len(names)} 个主题预览")
+    print(f"  控件+样式表:   {before:.1f}ms")
+    print(f"  缓存的预览图: {after:.1f}ms  ({before / after:.1f}x)")
+
+    def switch(i):
+        window.setStyleSheet(manager.get_stylesheet(names[i % len(names)]))
+
+    # 对话框仍存在时切换，主窗口样式表的变化会连带重新套用到对话框的全部控件
+    def apply_open(i):
+        dialog = ThemeDialog(window)
+        dialog.show()
+        app.processEvents()
+        switch(i)
+        dialog.close()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    def apply_closed(i):
+        dialog = ThemeDialog(window)
+        dialog.show()
+        app.processEvents()
+        dialog.close()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        switch(i)
+
+    before = _timed(apply_open, rounds)
+    after = _timed(apply_closed, rounds)
+    print("打开主题对话框并应用主题")
+    print(f"  对话框关闭前切换: {before:.1f}ms")
+    print(f"  对话框销毁后切换: {after:.1f}ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""大尺寸图片导出基准测试：整张 QImage 渲染后保存与分块渲染、逐行编码的耗时和峰值内存
+
+每种情况在单独的子进程中运行，峰值内存取子进程的最大常驻内存。
+
+运行：QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_tiled_export [最大放大倍数]
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _run(mode: str, scale: float, file_path: str):
+    from PyQt6.QtGui import QGuiApplication
+    from benchmarks.bench_batch_export import _timetable
+    from utils.timetable_renderer import TimetableRenderer
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+    courses = _timetable(random.Random(42))
+    renderer = TimetableRenderer()
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "full":
+        if not renderer.render_image(courses, 3, scale).save(file_path, "PNG"):
+            raise OSError("图片过大，无法保存")
+    else:
+        renderer.save_image_tiled(file_path, courses, 3, scale)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed:.2f} {(peak - base) / 1024:.0f}")
+
+
+def main(max_scale: int = 8):
+    size = None
+    print(f"{'倍数':<6}{'尺寸':<14}{'整张 耗时/新增内存':<22}{'分块 耗时/新增内存'}")
+    scale = 2
+    while scale <= max_scale:
+        row = []
+        for mode in ("full", "tiled"):
+            with tempfile.TemporaryDirectory() as folder:
+                file_path = os.path.join(folder, "out.png")
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_tiled_export", "--run", mode,
+                     str(scale), file_path], capture_output=True, text=True)
+                if output.returncode:
+                    row.append("失败")
+                    continue
+                elapsed, memory = output.stdout.split()
+                row.append(f"{float(elapsed):.2f}s / {memory}MB")
+                if mode == "tiled":
+                    from PyQt6.QtGui import QImageReader
+                    size = QImageReader(file_path).size()
+        print(f"{scale:<7}{size.width()}x{size.height():<8}{row[0]:<24}{row[1]}")
+        scale *= 2
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        _run(sys.argv[2], float(sys.argv[3]), sys.argv[4])
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
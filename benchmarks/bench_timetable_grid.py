@@ -0,0 +1,126 @@
+"""课程表网格基准测试：对比逐格创建卡片控件与模型+委托绘制的翻周、悬停耗时
+
+运行：QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_timetable_grid [翻周次数]
+"""
+import random
+import sys
+import time
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import (QApplication, QFrame, QLabel, QTableView, QTableWidget,
+                             QVBoxLayout)
+
+from models.course import Course
+from ui.timetable_model import (TIME_SLOTS, WEEKDAY_HEADERS, CourseCardDelegate,
+                                TimetableModel)
+from utils.theme_manager import ThemeManager
+
+_CARD_STYLE = ("QFrame {{ background-color: {}; border: 1px solid #e2e2e2;"
+               " border-radius: 6px; }}")
+
+
+def _week_courses(rng: random.Random, week: int):
+    """排满整张课表的一周课程"""
+    courses = []
+    for row, (_, start, end) in enumerate(TIME_SLOTS):
+        for day in range(1, 8):
+            course_id = week * 100 + row * 7 + day
+            courses.append(Course(
+                id=course_id, name=f"课程{rng.randrange(500)}", room=f"教室{rng.randrange(50)}",
+                teacher=f"老师{rng.randrange(80)}", weeks=f"{week}周",
+                day_of_week=day, start_time=start, end_time=end,
+            ))
+    return courses
+
+
+def _card(course: Course) -> QFrame:
+    """与原 CourseCard 相同结构的卡片控件"""
+    card = QFrame()
+    layout = QVBoxLayout(card)
+    layout.setSpacing(4)
+    layout.setContentsMargins(8, 8, 8, 8)
+    for text in (course.name, f"📍 {course.room}", f"👤 {course.teacher}", f"🗓️ {course.weeks}"):
+        layout.addWidget(QLabel(text))
+    layout.addStretch()
+    card.setStyleSheet(_CARD_STYLE.format("#f8f9fa"))
+    card.setToolTip(f"<html><h3>{course.name}</h3></html>")
+    return card
+
+
+def _switch_widgets(table: QTableWidget, courses):
+    for row in range(table.rowCount()):
+        for col in range(table.columnCount()):
+            table.setCellWidget(row, col, None)
+    for course in courses:
+        row = [s for _, s, _ in TIME_SLOTS].index(course.start_time.strftime("%H:%M"))
+        table.setCellWidget(row, course.day_of_week - 1, _card(course))
+    table.viewport().repaint()
+
+
+def _switch_model(view: QTableView, model: TimetableModel, courses):
+    model.set_courses(courses)
+    view.viewport().repaint()
+
+
+def _hover_widgets(table: QTableWidget):
+    # 原 CourseCard 的 enterEvent/leaveEvent：每次进出都重新设置样式表
+    for row in range(table.rowCount()):
+        for col in range(table.columnCount()):
+            card = table.cellWidget(row, col)
+            card.setStyleSheet(_CARD_STYLE.format("#e8f0fe"))
+            table.viewport().repaint()
+            card.setStyleSheet(_CARD_STYLE.format("#f8f9fa"))
+
+
+def _hover_model(view: QTableView):
+    model = view.model()
+    for row in range(model.rowCount()):
+        for col in range(model.columnCount()):
+            QTest.mouseMove(view.viewport(), view.visualRect(model.index(row, col)).center())
+            view.viewport().repaint()
+
+
+def _timed(func, weeks) -> float:
+    """返回每轮的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for courses in weeks:
+        func(courses)
+        QApplication.processEvents()
+    return (time.perf_counter() - start) / len(weeks) * 1e3
+
+
+def main(switches: int = 40):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    rng = random.Random(42)
+    weeks = [_week_courses(rng, i % 20 + 1) for i in range(switches)]
+
+    table = QTableWidget(len(TIME_SLOTS), len(WEEKDAY_HEADERS))
+    table.resize(1400, 700)
+    table.show()
+
+    view = QTableView()
+    model = TimetableModel(view)
+    view.setModel(model)
+    view.setItemDelegate(CourseCardDelegate(ThemeManager().get_card_palette(), view))
+    view.resize(1400, 700)
+    view.show()
+    app.processEvents()
+
+    before = _timed(lambda courses: _switch_widgets(table, courses), weeks)
+    after = _timed(lambda courses: _switch_model(view, model, courses), weeks)
+    print(f"每次翻周（{len(weeks[0])} 门课程）")
+    print(f"  卡片控件: {before:.1f}ms")
+    print(f"  模型+委托: {after:.1f}ms  ({before / after:.1f}x)")
+
+    view.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover, True)
+    view.setMouseTracking(True)
+    before = _timed(lambda _: _hover_widgets(table), weeks[:5])
+    after = _timed(lambda _: _hover_model(view), weeks[:5])
+    print("鼠标扫过整张课表")
+    print(f"  卡片控件: {before:.1f}ms")
+    print(f"  模型+委托: {after:.1f}ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -1,51 +1,290 @@
 import json
 import os
-from typing import List, Optional
+import zlib
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
 from models import Course
 import sqlite3
 
+JOURNAL_SUFFIX = '.journal'
+REMOVAL_SCAN = 64  # 删除后按对象查位置时，最多向前找这么多个位置，找不到再更新位置索引
+
+
+def _seconds(t) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _snapshot_signature(data: bytes) -> dict:
+    """快照文件的标识，写在日志第一行，用来判断日志是否属于当前快照"""
+    return {'snapshot_size': len(data), 'snapshot_crc': zlib.crc32(data)}
+
+
 class Database:
-    def __init__(self, filename: str = 'courses.json'):
+    """课程数据的JSON存储
+
+    默认每次修改都把全部课程写回 <filename>。journaled=True 时改为日志模式：每次修改只向
+    <filename>.journal 追加一行紧凑的JSON记录，积累到 compact_every 条或调用 close() 时
+    再把全部数据写回快照并清空日志；加载时先读快照再重放日志。
+
+    内存中维护三个索引：对象身份 -> 列表位置、星期 -> 当天课程、每天按开始时间排序的
+    时间区间（用于冲突检查）。删除保持其余课程的先后顺序，被删课程之后的位置索引
+    在下次查找时再更新。
+    课程加入后请通过 update_course 修改时间和星期，直接改属性不会更新索引。
+    """
+
+    def __init__(self, filename: str = 'courses.json', journaled: bool = False,
+                 compact_every: int = 1000):
         self.filename = filename
+        self.journal_path = filename + JOURNAL_SUFFIX
+        self.journaled = journaled
+        self.compact_every = compact_every
         self.courses: List[Course] = []
+        self._positions: Dict[int, int] = {}                 # id(课程) -> 列表位置
+        self._positions_valid = 0       # 位置索引只对列表中前这么多门课程有效
+        self._by_day: Dict[int, Dict[int, Course]] = {}     # 星期 -> {id(课程): 课程}
+        self._intervals: Dict[int, List[Tuple[int, int, int]]] = {}  # 星期 -> [(开始, 结束, id)]
+        self._max_span: Dict[int, int] = {}                 # 星期 -> 最长课程时长，只增不减
+        self._journal = None            # 以追加方式打开的日志文件
+        self._journal_entries = 0       # 日志中尚未合并的记录数
+        self._snapshot = _snapshot_signature(b'')
         self.load_data()
 
     def load_data(self):
+        data = b''
         if os.path.exists(self.filename):
-            with open(self.filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.courses = [Course.from_dict(course_data) for course_data in data]
+            with open(self.filename, 'rb') as f:
+                data = f.read()
+            self.courses = [Course.from_dict(course_data) for course_data in json.loads(data)]
+        self._snapshot = _snapshot_signature(data)
+        self._journal_entries = 0
+        if self.journaled:
+            self._replay_journal()
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        self._positions = {}
+        self._positions_valid = 0
+        self._by_day = {}
+        self._intervals = {}
+        self._max_span = {}
+        for course in self.courses:
+            self._index_course(course, sort=False)
+        for intervals in self._intervals.values():
+            intervals.sort()
+
+    def _index_course(self, course: Course, sort: bool = True):
+        """把课程加入星期索引和时间区间索引（不含位置索引）"""
+        start, end = _seconds(course.start_time), _seconds(course.end_time)
+        self._by_day.setdefault(course.weekday, {})[id(course)] = course
+        intervals = self._intervals.setdefault(course.weekday, [])
+        if sort:
+            insort(intervals, (start, end, id(course)))
+        else:
+            intervals.append((start, end, id(course)))
+        if end - start > self._max_span.get(course.weekday, 0):
+            self._max_span[course.weekday] = end - start
+
+    def _unindex_course(self, course: Course):
+        del self._by_day[course.weekday][id(course)]
+        intervals = self._intervals[course.weekday]
+        entry = (_seconds(course.start_time), _seconds(course.end_time), id(course))
+        del intervals[bisect_left(intervals, entry)]
+
+    def _find_conflict(self, course: Course, exclude: Optional[Course] = None) -> Optional[Course]:
+        """返回一门与给定课程时间冲突的已有课程，exclude 为要忽略的课程"""
+        intervals = self._intervals.get(course.weekday)
+        if not intervals:
+            return None
+        start, end = _seconds(course.start_time), _seconds(course.end_time)
+        # 开始时间早于 start - 最长时长 的课程不可能与之重叠
+        lo = bisect_left(intervals, (start - self._max_span[course.weekday] + 1,))
+        hi = bisect_left(intervals, (end,))
+        for other_start, other_end, key in intervals[lo:hi]:
+            other = self._by_day[course.weekday][key]
+            if other_end > start and other is not exclude:
+                return other
+        return None
+
+    def _replay_journal(self):
+        """重放日志；丢弃不属于当前快照的旧日志，截掉末尾写了一半的记录"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb') as f:
+            try:
+                valid = json.loads(f.readline()) == self._snapshot
+            except ValueError:
+                valid = False
+            if not valid:
+                # 合并时快照已替换但日志还没清空，其中的修改已经包含在快照里
+                f.close()
+                os.remove(self.journal_path)
+                return
+            good = f.tell()
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, IndexError):
+                    break
+                good += len(line)
+                self._journal_entries += 1
+            size = f.seek(0, os.SEEK_END)
+        if good < size:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good)
+
+    def _apply(self, entry: dict):
+        """把一条日志记录应用到内存中的课程列表"""
+        op = entry['op']
+        if op == 'add':
+            self.courses.append(Course.from_dict(entry['course']))
+        elif op == 'remove':
+            del self.courses[entry['index']]
+        elif op == 'update':
+            self.courses[entry['index']] = Course.from_dict(entry['course'])
+        elif op == 'feedback':
+            course = self.courses[entry['index']]
+            if course.feedback is None:
+                course.feedback = []
+            course.feedback.append(entry['text'])
+        elif op == 'rating':
+            self.courses[entry['index']].rating = entry['value']
+        else:
+            raise ValueError(f"未知的日志操作: {op}")
+
+    def _log(self, entry: dict):
+        """记录一次修改：日志模式下追加一行，否则整体写回"""
+        if not self.journaled:
+            self.save_data()
+            return
+        if self._journal is None:
+            new = not os.path.exists(self.journal_path)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            if new:
+                self._journal.write(json.dumps(self._snapshot) + '\n')
+        self._journal.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._journal.flush()
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_every:
+            self.save_data()
 
     def save_data(self):
-        with open(self.filename, 'w', encoding='utf-8') as f:
-            json.dump([course.to_dict() for course in self.courses], f, ensure_ascii=False, indent=2)
+        """把全部课程写回快照（原子替换），日志模式下同时清空日志"""
+        data = json.dumps([course.to_dict() for course in self.courses],
+                          ensure_ascii=False, indent=2).encode('utf-8')
+        tmp_path = self.filename + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filename)
+        self._snapshot = _snapshot_signature(data)
+        self._journal_entries = 0
+        if self.journaled:
+            self._close_journal()
+            # 旧日志的文件头与新快照不匹配，即使在这里中断，加载时也会被丢弃
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(self._snapshot) + '\n')
+            os.replace(tmp_path, self.journal_path)
+
+    def close(self):
+        """把日志中尚未合并的修改写回快照，并关闭日志文件"""
+        if self.journaled and self._journal_entries:
+            self.save_data()
+        self._close_journal()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _position_map(self) -> Dict[int, int]:
+        """位置索引，先补上删除后前移了的那部分课程"""
+        valid, count = self._positions_valid, len(self.courses)
+        if valid < count:
+            self._positions.update(zip(map(id, self.courses[valid:]), range(valid, count)))
+            self._positions_valid = count
+        return self._positions
+
+    def _index_of(self, course: Course) -> int:
+        """课程在列表中的位置：先按对象身份查找，再在同一天同一开始时间的课程中按相等查找"""
+        index = self._positions.get(id(course))
+        if index is not None:
+            if index < self._positions_valid:
+                return index
+            # 记录的位置之后只可能因删除而前移，向前找回对象
+            index = min(index, len(self.courses) - 1)
+            for index in range(index, max(index - REMOVAL_SCAN, -1), -1):
+                if self.courses[index] is course:
+                    return index
+        positions = self._position_map()
+        index = positions.get(id(course))
+        if index is not None:
+            return index
+        intervals = self._intervals.get(course.weekday, [])
+        start = _seconds(course.start_time)
+        pos = bisect_left(intervals, (start,))
+        while pos < len(intervals) and intervals[pos][0] == start:
+            existing = self._by_day[course.weekday][intervals[pos][2]]
+            if existing == course:
+                return positions[id(existing)]
+            pos += 1
+        raise ValueError("课程不在库中")
 
     def add_course(self, course: Course) -> bool:
         # Check for time conflicts
-        for existing_course in self.courses:
-            if existing_course.has_time_conflict(course):
-                return False
+        if self._find_conflict(course) is not None:
+            return False
+        if self._positions_valid == len(self.courses):
+            self._positions[id(course)] = len(self.courses)
+            self._positions_valid += 1
         self.courses.append(course)
-        self.save_data()
+        self._index_course(course)
+        self._log({'op': 'add', 'course': course.to_dict()})
         return True
 
     def remove_course(self, course: Course):
-        self.courses.remove(course)
-        self.save_data()
+        index = self._index_of(course)
+        removed = self.courses.pop(index)
+        self._unindex_course(removed)
+        del self._positions[id(removed)]
+        # 后面课程的位置都前移了一位，下次查找时再更新
+        self._positions_valid = min(self._positions_valid, index)
+        self._log({'op': 'remove', 'index': index})
 
     def update_course(self, old_course: Course, new_course: Course) -> bool:
+        index = self._index_of(old_course)
+        stored = self.courses[index]
         # Check for time conflicts with other courses
-        for course in self.courses:
-            if course != old_course and course.has_time_conflict(new_course):
-                return False
+        if self._find_conflict(new_course, exclude=stored) is not None:
+            return False
         
-        index = self.courses.index(old_course)
+        same_day = new_course.weekday == stored.weekday
+        if same_day:
+            # 在原课程的位置换成新课程，当天的顺序不变
+            old_key = id(stored)
+            day = {(id(new_course) if key == old_key else key):
+                   (new_course if key == old_key else course)
+                   for key, course in self._by_day[stored.weekday].items()}
+        self._unindex_course(stored)
+        self._positions.pop(id(stored), None)
         self.courses[index] = new_course
-        self.save_data()
+        self._positions[id(new_course)] = index
+        self._index_course(new_course)
+        if same_day:
+            self._by_day[new_course.weekday] = day
+        else:
+            # 换到另一天时新课程被加在末尾，按列表位置把它移到正确的位置
+            positions = self._position_map()
+            day = self._by_day[new_course.weekday]
+            self._by_day[new_course.weekday] = dict(sorted(day.items(),
+                                                           key=lambda item: positions[item[0]]))
+        self._log({'op': 'update', 'index': index, 'course': new_course.to_dict()})
         return True
 
     def get_courses_by_day(self, weekday: int) -> List[Course]:
-        return [course for course in self.courses if course.weekday == weekday]
+        return list(self._by_day.get(weekday, {}).values())
 
     def search_courses(self, query: str) -> List[Course]:
         query = query.lower()
@@ -61,11 +300,19 @@ class Database:
         if course.feedback is None:
             course.feedback = []
         course.feedback.append(feedback)
-        self.save_data()
+        try:
+            index = self._index_of(course)
+        except ValueError:
+            return  # 不在库中的课程无需记录
+        self._log({'op': 'feedback', 'index': index, 'text': feedback})
 
     def set_rating(self, course: Course, rating: float):
         course.rating = rating
-        self.save_data()
+        try:
+            index = self._index_of(course)
+        except ValueError:
+            return  # 不在库中的课程无需记录
+        self._log({'op': 'rating', 'index': index, 'value': rating})
 
     def get_course_score(self, course_id: int) -> Optional[float]:
         """获取课程评分"""
@@ -2,11 +2,16 @@ from datetime import datetime
 import json
 import os
 import shutil
+import sqlite3
 import zipfile
+from typing import Optional
+
+from .connection_pool import ConnectionPool
 
 class BackupManager:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[ConnectionPool] = None):
         self.db_path = db_path
+        self.pool = pool  # 使用该数据库的连接池，恢复前关闭
         self.backup_dir = "backups"
         
         # 创建备份目录
@@ -19,6 +24,9 @@ class BackupManager:
         backup_name = f"backup_{timestamp}.zip"
         backup_path = os.path.join(self.backup_dir, backup_name)
         
+        # WAL模式下最近的写入可能还在-wal文件中，先合并回主库
+        self._checkpoint()
+        
         with zipfile.ZipFile(backup_path, 'w') as backup_zip:
             # 备份数据库
             backup_zip.write(self.db_path, "courses.db")
@@ -29,16 +37,38 @@ class BackupManager:
         
         return backup_path
     
+    def _checkpoint(self):
+        """把WAL日志合并进数据库文件并截断"""
+        if not os.path.exists(self.db_path):
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+    
     def restore_backup(self, backup_path: str) -> bool:
         """从备份恢复数据"""
         try:
             with zipfile.ZipFile(backup_path, 'r') as backup_zip:
                 # 恢复前创建临时备份
                 self.create_backup()
-                
-                # 恢复数据库
                 backup_zip.extract("courses.db", "temp")
-                shutil.move("temp/courses.db", self.db_path)
+                
+                # 恢复数据库：先清空WAL并关闭池中的连接，再替换文件，
+                # 避免旧的WAL/SHM被重放到恢复后的库上
+                self._checkpoint()
+                if self.pool is not None:
+                    self.pool.close()
+                try:
+                    for suffix in ("-wal", "-shm"):
+                        if os.path.exists(self.db_path + suffix):
+                            os.remove(self.db_path + suffix)
+                    shutil.move("temp/courses.db", self.db_path)
+                finally:
+                    # 无论替换是否成功都重新连接（恢复后的库或原来的库），连接池保持可用
+                    if self.pool is not None:
+                        self.pool.reopen()
                 
                 # 恢复设置
                 if "settings.json" in backup_zip.namelist():
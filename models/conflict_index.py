@@ -0,0 +1,109 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .course import Course
+from .weeks import WeekSet
+
+
+class ConflictIndex:
+    """课程时间冲突索引
+
+    按(星期, 周次)分桶，桶内是按开始时间排序的 (开始分钟, 结束分钟, 键) 列表。
+    查询时用二分定位开始时间落在 (s - 最长时长, e) 之间的条目，再检查结束时间，
+    因此单次查询为 O(log n + k)。同一课程在各个周次桶中共享同一个元组。
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], list] = {}
+        self._max_span: Dict[Tuple[int, int], int] = {}  # 桶内最长时长，只增不减
+        self._entries: Dict[int, Tuple[Tuple[int, int, int], int, int]] = {}
+        self._courses: Dict[int, Course] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def get(self, key: int) -> Optional[Course]:
+        """按键取出已索引的课程"""
+        return self._courses.get(key)
+
+    @classmethod
+    def build(cls, courses: Iterable[Course]) -> 'ConflictIndex':
+        """批量建立索引，每个桶只排序一次"""
+        index = cls()
+        for course in courses:
+            index._place(course, course.id, sort=False)
+        for bucket in index._buckets.values():
+            bucket.sort()
+        return index
+
+    def add(self, course: Course, key: Optional[int] = None):
+        """加入课程，key 默认为课程ID"""
+        key = course.id if key is None else key
+        if key in self._entries:
+            self.remove(key)
+        self._place(course, key, sort=True)
+
+    def _place(self, course: Course, key: int, sort: bool):
+        start, end = course.start_min, course.end_min
+        entry = (start, end, key)
+        mask = course.week_mask
+        day = course.day_of_week
+        span = end - start
+        for week in WeekSet(mask):
+            bucket_key = (day, week)
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = self._buckets[bucket_key] = []
+            if sort:
+                insort(bucket, entry)
+            else:
+                bucket.append(entry)
+            self._max_span[bucket_key] = max(span, self._max_span.get(bucket_key, 0))
+        self._entries[key] = (entry, day, mask)
+        self._courses[key] = course
+
+    def remove(self, key: int) -> Optional[Course]:
+        """移除课程，返回被移除的课程"""
+        item = self._entries.pop(key, None)
+        if item is None:
+            return None
+        entry, day, mask = item
+        for week in WeekSet(mask):
+            bucket = self._buckets[(day, week)]
+            pos = bisect_left(bucket, entry)
+            if pos < len(bucket) and bucket[pos] == entry:
+                del bucket[pos]
+        return self._courses.pop(key)
+
+    def update(self, course: Course, key: Optional[int] = None):
+        """更新课程（先移除旧条目再加入）"""
+        self.add(course, key)
+
+    def conflicts(self, course: Course, exclude: Optional[int] = None,
+                  limit: Optional[int] = None) -> List[Course]:
+        """返回与给定课程时间冲突的课程，按课程时间排序
+
+        exclude 为要忽略的键（如正在编辑的课程自身），limit 限制返回数量。
+        """
+        start, end = course.start_min, course.end_min
+        day = course.day_of_week
+        found = {}
+        for week in course.week_set:
+            bucket = self._buckets.get((day, week))
+            if not bucket:
+                continue
+            lo = bisect_left(bucket, (start - self._max_span.get((day, week), 0) + 1,))
+            hi = bisect_left(bucket, (end,))
+            for other_start, other_end, key in bucket[lo:hi]:
+                if other_end > start and key != exclude and key not in found:
+                    found[key] = (other_start, other_end)
+                    if limit is not None and len(found) >= limit:
+                        return [self._courses[k] for k in found]
+        return [self._courses[k] for k in sorted(found, key=found.get)]
+
+    def has_conflict(self, course: Course, exclude: Optional[int] = None) -> bool:
+        """是否存在冲突课程"""
+        return bool(self.conflicts(course, exclude, limit=1))
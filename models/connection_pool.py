@@ -0,0 +1,157 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ConnectionPool:
+    """SQLite连接池
+
+    线程规则：
+    - 只有一个长连接负责写入，由可重入锁串行化；同一线程内嵌套的 writer()
+      会并入最外层事务。
+    - 读连接放在池中按需借出，同一时刻只归一个线程使用；同一线程内嵌套的
+      reader() 复用已借出的连接。
+    - 持有写锁的线程调用 reader() 时直接使用写连接，以便读到本事务未提交的数据。
+    """
+
+    # 每个连接建立后执行的调优参数
+    PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",      # 约8MB页缓存
+        "PRAGMA mmap_size=67108864",    # 64MB内存映射
+    )
+
+    def __init__(self, db_path: str, max_readers: int = 4,
+                 cached_statements: int = 256, timeout: float = 5.0):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.cached_statements = cached_statements  # 每个连接缓存的预编译语句数
+        self.timeout = timeout
+        # 内存数据库的每个连接互不相通，只能共用写连接
+        self._shared = db_path == ":memory:" or db_path.startswith("file::memory:")
+
+        self._write_lock = threading.RLock()
+        self._writer_owner = None
+        self._write_depth = 0
+        self._reader_lock = threading.Lock()
+        self._local = threading.local()
+        self._open()
+
+    def _open(self):
+        self._writer = self._connect()
+        if not self._shared:
+            self._writer.execute("PRAGMA journal_mode=WAL")
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """创建一个调好参数的连接"""
+        # 连接可能在线程间传递，由本类保证同一时刻只有一个线程使用
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            isolation_level=None,  # 事务由 writer() 显式控制
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """获取写连接并开启事务，正常退出时提交，异常时回滚"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("连接池已关闭")
+        with self._write_lock:
+            outermost = self._write_depth == 0
+            if outermost:
+                self._writer.execute("BEGIN IMMEDIATE")
+                self._writer_owner = threading.get_ident()
+            self._write_depth += 1
+            try:
+                yield self._writer
+            except BaseException:
+                self._write_depth -= 1
+                if outermost:
+                    self._writer_owner = None
+                    self._writer.execute("ROLLBACK")
+                raise
+            else:
+                self._write_depth -= 1
+                if outermost:
+                    self._writer_owner = None
+                    try:
+                        self._writer.execute("COMMIT")
+                    except BaseException:
+                        # 提交失败时事务可能仍未结束，回滚后再释放写锁
+                        if self._writer.in_transaction:
+                            self._writer.execute("ROLLBACK")
+                        raise
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """借出一个只读连接"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("连接池已关闭")
+        if self._writer_owner == threading.get_ident():
+            yield self._writer
+            return
+        if self._shared:
+            with self._write_lock:
+                yield self._writer
+            return
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # 同一线程内嵌套调用，复用已借出的连接
+            yield conn
+            return
+
+        conn = self._acquire_reader()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                return self._connect()
+        # 连接数已达上限，等待其他线程归还
+        try:
+            return self._readers.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("等待读连接超时") from None
+
+    def close(self):
+        """关闭所有连接"""
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            self._writer.close()
+
+    def reopen(self):
+        """关闭所有连接后重新连接，用于数据库文件被整体替换之后"""
+        with self._write_lock:
+            self.close()
+            self._open()
@@ -1,46 +1,148 @@
-from dataclasses import dataclass
-from datetime import datetime, time
-from typing import List, Optional
+import sys
+from datetime import time
+from typing import List, Optional, Union
+from .weeks import WeekSet, parse_week_mask
+
+
+def parse_minutes(text: str) -> int:
+    """把 "HH:MM" 解析为当天的分钟数"""
+    hour, sep, minute = text.partition(':')
+    if not sep:
+        raise ValueError(f"时间格式无效: {text}")
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"时间格式无效: {text}")
+    return hour * 60 + minute
+
+
+def format_minutes(minutes: int) -> str:
+    """把分钟数格式化为 "HH:MM" """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _to_minutes(value: Union[time, int, str]) -> int:
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    if isinstance(value, str):
+        return parse_minutes(value)
+    return int(value)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # 教师、教室、周次的取值很少，驻留后所有课程共享同一个字符串对象
+    return sys.intern(value) if type(value) is str else value
+
 
-@dataclass
 class Course:
-    """课程数据模型"""
-    id: int
-    name: str                # 课程名称
-    room: str               # 教室
-    teacher: str            # 教师
-    weeks: str             # 周次
-    day_of_week: int       # 星期几(1-7)
-    start_time: time       # 开始时间
-    end_time: time         # 结束时间
-    description: str = ""   # 课程描述
-    score: float = 0.0     # 课程评分
-    feedback: List[str] = None  # 课程反馈
-    color: str = "#e3f2fd"  # 课程卡片颜色
+    """课程数据模型
+
+    时间按当天分钟数存储，周次同时保存字符串与位掩码；
+    使用 __slots__ 省去每个实例的 __dict__。
+    """
+
+    __slots__ = ('id', 'name', 'room', 'teacher', '_weeks', 'week_mask',
+                 'day_of_week', 'start_min', 'end_min', 'description',
+                 'score', 'feedback', 'color')
+
+    def __init__(self, id: int, name: str, room: str, teacher: str, weeks: str,
+                 day_of_week: int, start_time: Union[time, int, str],
+                 end_time: Union[time, int, str], description: str = "",
+                 score: float = 0.0, feedback: List[str] = None,
+                 color: str = "#e3f2fd"):
+        self.id = id
+        self.name = name                    # 课程名称
+        self.room = _intern(room)           # 教室
+        self.teacher = _intern(teacher)     # 教师
+        self.weeks = weeks                  # 周次
+        self.day_of_week = day_of_week      # 星期几(1-7)
+        self.start_min = _to_minutes(start_time)  # 开始时间（分钟）
+        self.end_min = _to_minutes(end_time)      # 结束时间（分钟）
+        self.description = description      # 课程描述
+        self.score = score                  # 课程评分
+        self.feedback = feedback            # 课程反馈
+        self.color = color                  # 课程卡片颜色
+
+    @classmethod
+    def from_db(cls, id: int, name: str, room: str, teacher: str, weeks: str,
+                week_mask: int, day_of_week: int, start_min: int, end_min: int,
+                description: str, score: float, color: str) -> 'Course':
+        """由已解析的字段直接构造，跳过周次解析和时间换算"""
+        course = cls.__new__(cls)
+        course.id = id
+        course.name = name
+        # 数据库中的值一定是str或None，直接驻留，省去类型检查
+        course.room = room and sys.intern(room)
+        course.teacher = teacher and sys.intern(teacher)
+        course._weeks = weeks and sys.intern(weeks)
+        course.week_mask = week_mask
+        course.day_of_week = day_of_week
+        course.start_min = start_min
+        course.end_min = end_min
+        course.description = description
+        course.score = score
+        course.feedback = None
+        course.color = color
+        return course
+
+    @property
+    def weeks(self) -> str:
+        return self._weeks
+
+    @weeks.setter
+    def weeks(self, value: str):
+        self._weeks = _intern(value)
+        try:
+            self.week_mask = parse_week_mask(value or "")
+        except ValueError:
+            self.week_mask = 0  # 无法解析的周次记为0，CourseManager 添加或修改时拒绝
+
+    @property
+    def start_time(self) -> time:
+        return time(self.start_min // 60, self.start_min % 60)
+
+    @start_time.setter
+    def start_time(self, value: Union[time, int, str]):
+        self.start_min = _to_minutes(value)
+
+    @property
+    def end_time(self) -> time:
+        return time(self.end_min // 60, self.end_min % 60)
+
+    @end_time.setter
+    def end_time(self, value: Union[time, int, str]):
+        self.end_min = _to_minutes(value)
+
+    @property
+    def week_set(self) -> WeekSet:
+        return WeekSet(self.week_mask)
+
+    def _key(self) -> tuple:
+        return (self.id, self.name, self.room, self.teacher, self._weeks,
+                self.day_of_week, self.start_min, self.end_min, self.description,
+                self.score, self.feedback, self.color)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Course):
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # 可变对象，与原先的dataclass一致不可哈希
+
+    def __repr__(self) -> str:
+        return (f"Course(id={self.id!r}, name={self.name!r}, room={self.room!r}, "
+                f"teacher={self.teacher!r}, weeks={self._weeks!r}, "
+                f"day_of_week={self.day_of_week!r}, "
+                f"start_time={format_minutes(self.start_min)!r}, "
+                f"end_time={format_minutes(self.end_min)!r})")
 
     def conflicts_with(self, other: 'Course') -> bool:
         """检查是否与其他课程时间冲突"""
         if self.day_of_week != other.day_of_week:
             return False
-            
+
         # 检查周次是否重叠
-        self_weeks = self._parse_weeks(self.weeks)
-        other_weeks = self._parse_weeks(other.weeks)
-        if not set(self_weeks).intersection(set(other_weeks)):
+        if not self.week_mask & other.week_mask:
             return False
-            
+
         # 检查时间是否重叠
-        return not (self.end_time <= other.start_time or 
-                   self.start_time >= other.end_time)
-    
-    @staticmethod
-    def _parse_weeks(weeks_str: str) -> List[int]:
-        """解析周次字符串，如 "1-16周" -> [1,2,3,...,16]"""
-        result = []
-        for part in weeks_str.replace('周', '').split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                result.extend(range(start, end + 1))
-            else:
-                result.append(int(part))
-        return result 
\ No newline at end of file
+        return self.start_min < other.end_min and other.start_min < self.end_min
@@ -0,0 +1,225 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from .course import Course
+from .weeks import week_bit
+
+
+class _Dictionary:
+    """字符串字典编码：相同的字符串映射到同一个整数ID"""
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self._ids: Dict[Optional[str], int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def lookup(self, value: Optional[str]) -> Optional[int]:
+        """已有字符串的ID，不存在时返回None"""
+        return self._ids.get(value)
+
+
+class CourseColumns:
+    """课程表的列式快照
+
+    星期、开始/结束分钟、周次掩码存放在 NumPy 数组中，名称、教师、教室按字典编码为
+    整数ID。筛选和分组统计对整列做向量化运算，不需要逐个访问 Course 对象的属性。
+    数组按容量倍增追加；删除时把最后一行移到空位，保持各列紧凑。
+    """
+
+    # 列名 -> 数据类型
+    _DTYPES = {
+        "ids": np.int64,
+        "days": np.int8,
+        "starts": np.int16,
+        "ends": np.int16,
+        "masks": np.int64,
+        "name_ids": np.int32,
+        "teacher_ids": np.int32,
+        "room_ids": np.int32,
+    }
+    # group_by / count_by 可用的字典编码列
+    _ENCODED = ("name", "teacher", "room")
+
+    def __init__(self, capacity: int = 64):
+        self._size = 0
+        self._data = {name: np.zeros(capacity, dtype) for name, dtype in self._DTYPES.items()}
+        self.names = _Dictionary()
+        self.teachers = _Dictionary()
+        self.rooms = _Dictionary()
+        self._courses: List[Course] = []
+        self._rows: Dict[int, int] = {}  # 课程ID -> 行号
+
+    @classmethod
+    def build(cls, courses: Iterable[Course]) -> "CourseColumns":
+        """一次性建立快照，各列整体写入"""
+        courses = list(courses)
+        n = len(courses)
+        columns = cls(max(n, 64))
+        data = columns._data
+        data["ids"][:n] = [c.id for c in courses]
+        data["days"][:n] = [c.day_of_week for c in courses]
+        data["starts"][:n] = [c.start_min for c in courses]
+        data["ends"][:n] = [c.end_min for c in courses]
+        data["masks"][:n] = [c.week_mask for c in courses]
+        data["name_ids"][:n] = [columns.names.encode(c.name) for c in courses]
+        data["teacher_ids"][:n] = [columns.teachers.encode(c.teacher) for c in courses]
+        data["room_ids"][:n] = [columns.rooms.encode(c.room) for c in courses]
+        columns._courses = courses
+        columns._rows = {c.id: row for row, c in enumerate(courses)}
+        columns._size = n
+        return columns
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, course_id: int) -> bool:
+        return course_id in self._rows
+
+    def column(self, name: str) -> np.ndarray:
+        """某一列有效部分的只读视图，name 为 _DTYPES 中的列名"""
+        view = self._data[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def add(self, course: Course):
+        """追加一门课程，已存在时按更新处理"""
+        if course.id in self._rows:
+            self.update(course)
+            return
+        row = self._size
+        if row == len(self._data["ids"]):
+            for name, column in self._data.items():
+                self._data[name] = np.concatenate([column, np.zeros_like(column)])
+        self._size += 1
+        self._rows[course.id] = row
+        self._courses.append(course)
+        self._data["ids"][row] = course.id
+        self._write(row, course)
+
+    def update(self, course: Course):
+        """原地更新某门课程所在的行"""
+        row = self._rows.get(course.id)
+        if row is None:
+            self.add(course)
+            return
+        self._courses[row] = course
+        self._write(row, course)
+
+    def _write(self, row: int, course: Course):
+        data = self._data
+        data["days"][row] = course.day_of_week
+        data["starts"][row] = course.start_min
+        data["ends"][row] = course.end_min
+        data["masks"][row] = course.week_mask
+        data["name_ids"][row] = self.names.encode(course.name)
+        data["teacher_ids"][row] = self.teachers.encode(course.teacher)
+        data["room_ids"][row] = self.rooms.encode(course.room)
+
+    def remove(self, course_id: int) -> Optional[Course]:
+        """删除课程，用最后一行填补空位"""
+        row = self._rows.pop(course_id, None)
+        if row is None:
+            return None
+        removed = self._courses[row]
+        last = self._size - 1
+        if row != last:
+            for column in self._data.values():
+                column[row] = column[last]
+            self._courses[row] = self._courses[last]
+            self._rows[int(self._data["ids"][row])] = row
+        self._courses.pop()
+        self._size -= 1
+        return removed
+
+    def select(self, day: Optional[int] = None, week: Optional[int] = None,
+               weeks_mask: Optional[int] = None, name: Optional[str] = None,
+               teacher: Optional[str] = None, room: Optional[str] = None) -> np.ndarray:
+        """按条件筛选，返回满足全部条件的行号数组
+
+        week 为单个周次，weeks_mask 为多个周次的掩码（与任一周次相交即可）。
+        """
+        n = self._size
+        data = self._data
+        conditions = []
+        if week is not None:
+            conditions.append(data["masks"][:n] & week_bit(week) != 0)
+        if weeks_mask is not None:
+            conditions.append(data["masks"][:n] & weeks_mask != 0)
+        if day is not None:
+            conditions.append(data["days"][:n] == day)
+        # 名称、教师、教室先换成字典ID，再比较整数列
+        for column, dictionary, value in (("name_ids", self.names, name),
+                                          ("teacher_ids", self.teachers, teacher),
+                                          ("room_ids", self.rooms, room)):
+            if value is not None:
+                value_id = dictionary.lookup(value)
+                if value_id is None:
+                    return np.empty(0, np.intp)
+                conditions.append(data[column][:n] == value_id)
+
+        if not conditions:
+            return np.arange(n)
+        selected = conditions[0]
+        for condition in conditions[1:]:
+            selected &= condition
+        return np.flatnonzero(selected)
+
+    def order_by_time(self, rows: np.ndarray) -> np.ndarray:
+        """按星期、开始时间排序行号"""
+        order = np.lexsort((self._data["starts"][rows], self._data["days"][rows]))
+        return rows[order]
+
+    def take(self, rows: Iterable[int]) -> List[Course]:
+        """取出行号对应的课程对象"""
+        courses = self._courses
+        return [courses[i] for i in np.asarray(rows).tolist()]
+
+    def courses(self, **filters) -> List[Course]:
+        """按条件筛选课程，按星期、开始时间排序（参数同 select）"""
+        return self.take(self.order_by_time(self.select(**filters)))
+
+    def _encoded(self, column: str):
+        if column not in self._ENCODED:
+            raise ValueError(f"不支持的分组列: {column}")
+        return self._data[f"{column}_ids"][:self._size], getattr(self, f"{column}s")
+
+    def count_by(self, column: str, rows: Optional[np.ndarray] = None) -> Counter:
+        """按列计数，column 为 "day"、"name"、"teacher" 或 "room" """
+        if column == "day":
+            values, labels = self._data["days"][:self._size], range(8)
+        else:
+            values, dictionary = self._encoded(column)
+            labels = dictionary.values
+        if rows is not None:
+            values = values[rows]
+        counts = np.bincount(values, minlength=len(labels))
+        present = np.flatnonzero(counts)
+        return Counter({labels[i]: count for i, count in
+                        zip(present.tolist(), counts[present].tolist())})
+
+    def group_by(self, key: str, value: str,
+                 rows: Optional[np.ndarray] = None) -> Dict[Optional[str], Set[Optional[str]]]:
+        """按 key 列分组，收集每组中 value 列的不同取值"""
+        key_ids, key_dict = self._encoded(key)
+        value_ids, value_dict = self._encoded(value)
+        if rows is not None:
+            key_ids, value_ids = key_ids[rows], value_ids[rows]
+        # 把 (key, value) 编成一个整数后去重
+        width = max(len(value_dict.values), 1)
+        pairs = np.unique(key_ids.astype(np.int64) * width + value_ids)
+        groups: Dict[Optional[str], Set[Optional[str]]] = {}
+        key_values, value_values = key_dict.values, value_dict.values
+        for pair in pairs.tolist():
+            key_id, value_id = divmod(pair, width)
+            groups.setdefault(key_values[key_id], set()).add(value_values[value_id])
+        return groups
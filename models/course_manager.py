@@ -1,179 +1,484 @@
 import sqlite3
-from typing import List, Optional
-from .course import Course
-from datetime import datetime, time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Union
+from .course import Course, format_minutes, parse_minutes
+from .connection_pool import ConnectionPool
+from .conflict_index import ConflictIndex
+from .course_columns import CourseColumns
+from .fuzzy_index import FuzzyCourseIndex
+from .migrations import migrate
+from .weeks import WeekSet, parse_week_mask, week_bit
+from .week_cache import WeekCache
+
+# 构造Course所需的列，顺序与 Course.from_db 的参数一致
+COURSE_COLUMNS = ", ".join(
+    f"courses.{column}" for column in (
+        "id", "name", "room", "teacher", "weeks", "week_mask", "day_of_week",
+        "start_time", "end_time", "description", "score", "color",
+    )
+)
+
+@dataclass
+class ImportRowResult:
+    """批量导入中单条记录的处理结果"""
+    index: int                      # 记录在输入中的序号（从0开始）
+    accepted: bool
+    course: Optional[Course] = None
+    reason: str = ""                # 被拒绝的原因
+
+
+@dataclass
+class BulkImportReport:
+    """批量导入报告"""
+    rows: List[ImportRowResult] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> List[ImportRowResult]:
+        return [row for row in self.rows if row.accepted]
+
+    @property
+    def rejected(self) -> List[ImportRowResult]:
+        return [row for row in self.rows if not row.accepted]
+
+
+@dataclass
+class CourseChange:
+    """课程变更事件
+
+    kind 为 "added"、"updated"、"removed" 或 "reset"（整体替换或清空，需重新加载）。
+    """
+    kind: str
+    course_id: Optional[int] = None
+    course: Optional[Course] = None       # 变更后的课程，removed/reset 时为空
+    old_course: Optional[Course] = None   # 变更前的课程，未建立冲突索引时可能为空
+
 
 class CourseManager:
     """课程数据管理类"""
-    def __init__(self, db_path: str = "courses.db"):
+    def __init__(self, db_path: str = "courses.db", max_readers: int = 4,
+                 cache_size: int = 32):
         self.db_path = db_path
+        self._pool = ConnectionPool(db_path, max_readers=max_readers)
         self._init_db()
-        self._cache = {}  # 添加缓存
+        self._cache = WeekCache(cache_size)  # 按周次缓存课程列表
+        self._conflict_index = None  # 冲突索引，首次使用时建立
+        self._columns = None  # 列式快照，首次使用时建立
+        self._fuzzy_index = None  # 模糊搜索索引，首次使用时建立
+        self._fts_tokenizer = ""  # 全文索引分词器，首次搜索时检测
+        self._listeners: List[Callable[[CourseChange], None]] = []
+        
+    @property
+    def pool(self) -> ConnectionPool:
+        """底层连接池，恢复备份前需要关闭"""
+        return self._pool
+    
+    def close(self):
+        """关闭数据库连接"""
+        self._pool.close()
         
     def _init_db(self):
-        """初始化数据库"""
-        with sqlite3.connect(self.db_path) as conn:
-            # 创建临时表
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS feedback_new (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    course_id INTEGER,
-                    content TEXT,
-                    score REAL DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (course_id) REFERENCES courses (id)
-                )
-            """)
-            
-            # 检查是否存在旧的feedback表
-            cursor = conn.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='feedback'
-            """)
-            if cursor.fetchone():
-                # 复制旧数据到新表
-                conn.execute("""
-                    INSERT INTO feedback_new (id, course_id, content, created_at)
-                    SELECT id, course_id, content, created_at FROM feedback
-                """)
-                # 删除旧表
-                conn.execute("DROP TABLE feedback")
-            
-            # 重命名新表
-            conn.execute("ALTER TABLE feedback_new RENAME TO feedback")
-            
-            # 创建或更新courses表
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS courses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    room TEXT,
-                    teacher TEXT,
-                    weeks TEXT,
-                    day_of_week INTEGER,
-                    start_time TEXT,
-                    end_time TEXT,
-                    description TEXT,
-                    score REAL DEFAULT 0,
-                    color TEXT
-                )
-            """)
+        """初始化数据库（按需执行结构迁移）"""
+        migrate(self._pool)
+    
+    def add_listener(self, listener: Callable[[CourseChange], None]):
+        """注册课程变更监听器，每次增删改成功后调用"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[CourseChange], None]):
+        """移除课程变更监听器"""
+        self._listeners.remove(listener)
+    
+    def _notify(self, change: CourseChange):
+        for listener in list(self._listeners):
+            listener(change)
     
     def add_course(self, course: Course) -> bool:
-        """添加课程"""
+        """添加课程，数据不合法或时间冲突时返回False"""
+        try:
+            self._validate_course(course)
+        except ValueError:
+            return False
         # 检查时间冲突
         if self._check_conflicts(course):
             return False
             
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO courses (name, room, teacher, weeks, day_of_week,
+        with self._pool.writer() as conn:
+            cursor = conn.execute("""
+                INSERT INTO courses (name, room, teacher, weeks, week_mask, day_of_week,
                                    start_time, end_time, description, color)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (course.name, course.room, course.teacher, course.weeks,
-                 course.day_of_week, course.start_time.strftime('%H:%M'),
-                 course.end_time.strftime('%H:%M'), course.description,
+                 course.week_mask, course.day_of_week, format_minutes(course.start_min),
+                 format_minutes(course.end_min), course.description,
                  course.color))
-        # 清除缓存
-        self._clear_cache()
+            course.id = cursor.lastrowid
+        self._get_conflict_index().add(course)
+        if self._columns is not None:
+            self._columns.add(course)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(course)
+        # 只淘汰该课程所在周次的缓存
+        self._cache.invalidate(course.week_mask)
+        self._notify(CourseChange("added", course.id, course))
         return True
     
-    def _parse_weeks(self, weeks_str: str) -> list:
-        """解析周次字符串，如 "1-16周" -> [1,2,3,...,16]"""
-        result = []
-        weeks_str = weeks_str.replace('周', '')
-        for part in weeks_str.split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                result.extend(range(start, end + 1))
-            else:
-                result.append(int(part))
-        return result
-    
-    def get_courses(self, week: Optional[int] = None) -> List[Course]:
-        """获取课程列表（添加缓存）"""
-        cache_key = f"courses_week_{week}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+    def add_courses_bulk(self, records: Iterable[Union[Course, dict]],
+                         replace: bool = False, start: int = 0) -> BulkImportReport:
+        """批量添加课程
+        
+        先在内存中校验整批记录并检查冲突（与已有课程以及批内互相之间），
+        再在一个事务中写入所有通过的记录。records 可以是 Course 或导入文件中的字典；
+        replace 为 True 时在同一事务中先清空已有课程；start 为第一条记录的序号，
+        分批导入时用来让报告中的序号对应整个输入。
+        """
+        report = BulkImportReport()
+        # 已有课程用常驻索引检查，批内课程用临时索引检查
+        existing_index = ConflictIndex() if replace else self._get_conflict_index()
+        batch_index = ConflictIndex()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("SELECT * FROM courses")
-            courses = [self._row_to_course(row) for row in cursor.fetchall()]
+        batch_rows = {}  # 批内已接受课程 -> 序号，用于报告批内冲突
+        for index, record in enumerate(records, start):
+            try:
+                course = record if isinstance(record, Course) else self._course_from_record(record)
+                self._validate_course(course)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                reason = f"缺少字段: {e.args[0]}" if isinstance(e, KeyError) else f"数据无效: {e}"
+                report.rows.append(ImportRowResult(index, False, reason=reason))
+                continue
             
-            if week:
-                courses = [c for c in courses if week in self._parse_weeks(c.weeks)]
+            clash = existing_index.conflicts(course, limit=1)
+            if clash:
+                reason = f"与已有课程《{clash[0].name}》时间冲突"
+                report.rows.append(ImportRowResult(index, False, course, reason))
+                continue
+            clash = batch_index.conflicts(course, limit=1)
+            if clash:
+                other = clash[0]
+                reason = f"与第{batch_rows[id(other)] + 1}条记录《{other.name}》时间冲突"
+                report.rows.append(ImportRowResult(index, False, course, reason))
+                continue
             
-            self._cache[cache_key] = courses
-            return courses
+            batch_index.add(course, key=-(index + 1))  # 入库前还没有ID，用临时键
+            batch_rows[id(course)] = index
+            report.rows.append(ImportRowResult(index, True, course))
+        
+        accepted = [row.course for row in report.accepted]
+        with self._pool.writer() as conn:
+            if replace:
+                conn.execute("DELETE FROM courses")
+            conn.executemany("""
+                INSERT INTO courses (name, room, teacher, weeks, week_mask, day_of_week,
+                                   start_time, end_time, description, score, color)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(c.name, c.room, c.teacher, c.weeks, c.week_mask, c.day_of_week,
+                   format_minutes(c.start_min), format_minutes(c.end_min),
+                   c.description, c.score, c.color) for c in accepted])
+            if accepted:
+                # 同一写事务中自增ID连续递增，回填新生成的ID
+                cursor = conn.execute(
+                    "SELECT id FROM courses ORDER BY id DESC LIMIT ?", (len(accepted),)
+                )
+                for course, (course_id,) in zip(accepted, reversed(cursor.fetchall())):
+                    course.id = course_id
+        if replace:
+            self._conflict_index = ConflictIndex.build(accepted)
+            if self._columns is not None:
+                self._columns = CourseColumns.build(accepted)
+            if self._fuzzy_index is not None:
+                self._fuzzy_index = FuzzyCourseIndex.build(accepted)
+            self._clear_cache()
+            self._notify(CourseChange("reset"))
+        else:
+            touched = 0
+            for course in accepted:
+                existing_index.add(course)
+                touched |= course.week_mask
+            if self._columns is not None:
+                for course in accepted:
+                    self._columns.add(course)
+            if self._fuzzy_index is not None:
+                for course in accepted:
+                    self._fuzzy_index.add(course)
+            self._cache.invalidate(touched)
+            if self._listeners:
+                for course in accepted:
+                    self._notify(CourseChange("added", course.id, course))
+        return report
     
-    def _row_to_course(self, row: sqlite3.Row) -> Course:
-        """将数据库行转换为Course对象"""
+    def _course_from_record(self, data: dict) -> Course:
+        """把导入文件中的一条记录转换为Course对象"""
         return Course(
-            id=row['id'],
-            name=row['name'],
-            room=row['room'],
-            teacher=row['teacher'],
-            weeks=row['weeks'],
-            day_of_week=row['day_of_week'],
-            start_time=datetime.strptime(row['start_time'], '%H:%M').time(),
-            end_time=datetime.strptime(row['end_time'], '%H:%M').time(),
-            description=row['description'],
-            color=row['color']
+            id=-1,  # 新课程的ID由数据库生成
+            name=data['name'],
+            room=data['room'],
+            teacher=data['teacher'],
+            weeks=data['weeks'],
+            day_of_week=int(data['day_of_week']),
+            start_time=parse_minutes(data['start_time']),
+            end_time=parse_minutes(data['end_time']),
+            description=data.get('description', ''),  # 使用get方法处理可选字段
+            score=data.get('score', 0.0),
+            feedback=data.get('feedback', []),
+            color=data.get('color', '#e3f2fd')
+        )
+    
+    def _validate_course(self, course: Course):
+        """校验课程数据，不合法时抛出ValueError"""
+        if not course.name or not course.name.strip():
+            raise ValueError("课程名称为空")
+        if not 1 <= course.day_of_week <= 7:
+            raise ValueError(f"星期超出范围: {course.day_of_week}")
+        if course.start_min >= course.end_min:
+            raise ValueError("开始时间不早于结束时间")
+        if not course.week_mask:
+            try:
+                parse_week_mask(course.weeks or "")
+            except ValueError:
+                raise ValueError(f"周次格式无效: {course.weeks}") from None
+            raise ValueError("周次为空")
+    
+    def get_courses(self, week: Optional[int] = None) -> List[Course]:
+        """获取课程列表（按周次缓存，week 为空或0时返回全部课程）"""
+        week = week or None
+        courses = self._cache.get(week)
+        if courses is not None:
+            return courses
+        return self._load_courses(week)
+    
+    def prefetch(self, weeks: Iterable[Optional[int]]):
+        """预先把指定周次的课程载入缓存（不计入命中统计）"""
+        for week in weeks:
+            week = week or None
+            if week is not None and not 1 <= week <= WeekSet.MAX_WEEK:
+                continue
+            if week not in self._cache:
+                self._load_courses(week)
+    
+    def cache_stats(self) -> dict:
+        """缓存命中统计"""
+        return self._cache.stats()
+    
+    def _load_courses(self, week: Optional[int]) -> List[Course]:
+        """从数据库读取课程并写入缓存"""
+        with self._pool.reader() as conn:
+            if week:
+                # 按周次位掩码在SQL中过滤
+                courses = self._query_courses(
+                    conn, f"SELECT {COURSE_COLUMNS} FROM courses WHERE week_mask & ?",
+                    (week_bit(week),)
+                )
+            else:
+                courses = self._query_courses(conn, f"SELECT {COURSE_COLUMNS} FROM courses")
+        
+        self._cache.put(week, courses)
+        return courses
+    
+    def _query_courses(self, conn: sqlite3.Connection, sql: str, params=()) -> List[Course]:
+        """执行按 COURSE_COLUMNS 取列的查询并转换为Course列表"""
+        cursor = conn.cursor()
+        cursor.row_factory = None  # 按位置取值，省去构造sqlite3.Row
+        cursor.execute(sql, params)
+        return [self._row_to_course(row) for row in cursor.fetchall()]
+    
+    def _row_to_course(self, row: tuple) -> Course:
+        """将按 COURSE_COLUMNS 顺序排列的数据库行转换为Course对象"""
+        (course_id, name, room, teacher, weeks, week_mask, day_of_week,
+         start_time, end_time, description, score, color) = row
+        # 按冒号拆分换算，不走strptime；旧数据中 "8:00" 这样不补零的时间同样可以解析，
+        # 无效的时间抛出ValueError
+        return Course.from_db(
+            course_id, name, room, teacher, weeks, week_mask, day_of_week,
+            parse_minutes(start_time), parse_minutes(end_time),
+            description, score or 0.0, color
         )
     
+    def _get_conflict_index(self) -> ConflictIndex:
+        """获取冲突索引，首次调用时从数据库建立"""
+        if self._conflict_index is None:
+            self._conflict_index = ConflictIndex.build(self.get_courses())
+        return self._conflict_index
+    
+    def columns(self) -> CourseColumns:
+        """课程表的列式快照，用于批量筛选和分组统计，随课程增删改同步更新"""
+        if self._columns is None:
+            self._columns = CourseColumns.build(self.get_courses())
+        return self._columns
+    
+    def fuzzy_search(self, query: str, limit: Optional[int] = None) -> List[Course]:
+        """模糊搜索课程名称、教师和教室，支持部分字符串、拼音首字母和错别字，按相关度排序"""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyCourseIndex.build(self.get_courses())
+        return [course for course, _ in self._fuzzy_index.search(query, limit)]
+    
     def _check_conflicts(self, new_course: Course) -> bool:
         """检查是否存在时间冲突"""
-        existing_courses = self.get_courses()
-        return any(new_course.conflicts_with(course) for course in existing_courses) 
+        return self._get_conflict_index().has_conflict(new_course)
+    
+    def find_conflicts(self, course: Course, exclude_id: Optional[int] = None) -> List[Course]:
+        """返回与给定课程时间冲突的已有课程"""
+        return self._get_conflict_index().conflicts(course, exclude=exclude_id)
     
     def update_course(self, course_id: int, course: Course) -> bool:
-        """更新课程信息"""
+        """更新课程信息，数据不合法或时间冲突时返回False"""
+        try:
+            self._validate_course(course)
+        except ValueError:
+            return False
         # 检查时间冲突（排除当前课程）
-        existing_courses = [c for c in self.get_courses() if c.id != course_id]
-        if any(course.conflicts_with(c) for c in existing_courses):
+        index = self._get_conflict_index()
+        if index.has_conflict(course, exclude=course_id):
             return False
+        old_course = index.get(course_id)
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        with self._pool.writer() as conn:
+            cursor = conn.execute("""
                 UPDATE courses 
-                SET name=?, room=?, teacher=?, weeks=?, day_of_week=?,
+                SET name=?, room=?, teacher=?, weeks=?, week_mask=?, day_of_week=?,
                     start_time=?, end_time=?, description=?, color=?
                 WHERE id=?
             """, (course.name, course.room, course.teacher, course.weeks,
-                  course.day_of_week, course.start_time.strftime('%H:%M'),
-                  course.end_time.strftime('%H:%M'), course.description,
+                  course.week_mask, course.day_of_week, format_minutes(course.start_min),
+                  format_minutes(course.end_min), course.description,
                   course.color, course_id))
-        # 清除缓存
-        self._clear_cache()
+            if cursor.rowcount == 0:
+                return False
+        course.id = course_id
+        index.update(course)
+        if self._columns is not None:
+            self._columns.update(course)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.update(course)
+        # 淘汰新旧周次的缓存
+        self._cache.invalidate(course.week_mask | (old_course.week_mask if old_course else 0))
+        self._notify(CourseChange("updated", course_id, course, old_course))
         return True
     
     def delete_course(self, course_id: int) -> bool:
-        """删除课程"""
+        """删除课程，课程不存在时返回False"""
+        old_course = self._get_conflict_index().get(course_id)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM courses WHERE id=?", (course_id,))
+            with self._pool.writer() as conn:
+                cursor = conn.execute("DELETE FROM courses WHERE id=?", (course_id,))
+                if cursor.rowcount == 0:
+                    return False
                 conn.execute("DELETE FROM feedback WHERE course_id=?", (course_id,))
-            # 清��缓存
-            self._clear_cache()
-            return True
         except sqlite3.Error:
             return False
+        self._conflict_index.remove(course_id)
+        if self._columns is not None:
+            self._columns.remove(course_id)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.remove(course_id)
+        # 只淘汰该课程所在周次的缓存
+        if old_course is None:
+            self._clear_cache()
+        else:
+            self._cache.invalidate(old_course.week_mask)
+        self._notify(CourseChange("removed", course_id, old_course=old_course))
+        return True
     
-    def search_courses(self, keyword: str) -> List[Course]:
-        """搜索课程"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM courses 
-                WHERE name LIKE ? OR teacher LIKE ? OR room LIKE ?
-            """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"))
-            return [self._row_to_course(row) for row in cursor.fetchall()]
+    def search_courses(self, keyword: str, limit: Optional[int] = None) -> List[Course]:
+        """搜索课程名称、教师、教室和描述，按相关度排序
+        
+        关键字按空格拆成多个词，需要同时匹配。优先走FTS5全文索引，
+        FTS5不可用时退回LIKE查询。
+        """
+        terms = keyword.split()
+        if not terms:
+            courses = self.get_courses()
+            return courses[:limit] if limit else list(courses)
+        
+        tokenizer = self._get_fts_tokenizer()
+        if tokenizer == "trigram":
+            # trigram分词器至少需要3个字符，更短的词用LIKE补充过滤
+            fts_terms = [t for t in terms if len(t) >= 3]
+            like_terms = [t for t in terms if len(t) < 3]
+        elif tokenizer:
+            fts_terms, like_terms = terms, []
+        else:
+            fts_terms, like_terms = [], terms
+        
+        if fts_terms:
+            try:
+                return self._search_fts(fts_terms, like_terms, tokenizer, limit)
+            except sqlite3.OperationalError:
+                # 当前SQLite不支持该全文索引，改用LIKE
+                self._fts_tokenizer = None
+        return self._search_like(terms, limit)
+    
+    def _get_fts_tokenizer(self) -> Optional[str]:
+        """全文索引使用的分词器，没有全文索引时返回None"""
+        if self._fts_tokenizer == "":
+            with self._pool.reader() as conn:
+                row = conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type='table' AND name='courses_fts'"
+                ).fetchone()
+            if row is None:
+                self._fts_tokenizer = None
+            else:
+                self._fts_tokenizer = "trigram" if "trigram" in row[0] else "unicode61"
+        return self._fts_tokenizer
+    
+    @staticmethod
+    def _like_clause(terms: List[str], alias: str = "") -> tuple:
+        """生成多个关键词同时匹配的LIKE条件及参数"""
+        clauses, params = [], []
+        for term in terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append("(" + " OR ".join(
+                f"{alias}{column} LIKE ? ESCAPE '\\'"
+                for column in ("name", "teacher", "room", "description")
+            ) + ")")
+            params.extend([pattern] * 4)
+        return " AND ".join(clauses), params
+    
+    def _search_fts(self, fts_terms: List[str], like_terms: List[str],
+                    tokenizer: str, limit: Optional[int]) -> List[Course]:
+        if tokenizer == "trigram":
+            # trigram按子串匹配，本身就覆盖前缀
+            query = " AND ".join('"' + t.replace('"', '""') + '"' for t in fts_terms)
+        else:
+            query = " AND ".join('"' + t.replace('"', '""') + '"*' for t in fts_terms)
+        sql = f"""
+            SELECT {COURSE_COLUMNS} FROM courses_fts
+            JOIN courses ON courses.id = courses_fts.rowid
+            WHERE courses_fts MATCH ?
+        """
+        params = [query]
+        if like_terms:
+            clause, like_params = self._like_clause(like_terms, "courses.")
+            sql += f" AND {clause}"
+            params.extend(like_params)
+        # 列权重：名称 > 教师、教室 > 描述
+        sql += " ORDER BY bm25(courses_fts, 10.0, 5.0, 5.0, 1.0)"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._pool.reader() as conn:
+            return self._query_courses(conn, sql, params)
+    
+    def _search_like(self, terms: List[str], limit: Optional[int]) -> List[Course]:
+        """没有全文索引时的退路：LIKE扫描，名称匹配的排在前面"""
+        clause, params = self._like_clause(terms)
+        first = terms[0]
+        sql = f"""
+            SELECT {COURSE_COLUMNS} FROM courses WHERE {clause}
+            ORDER BY CASE WHEN name = ? THEN 0
+                          WHEN instr(name, ?) = 1 THEN 1
+                          WHEN instr(name, ?) > 0 THEN 2
+                          ELSE 3 END, id
+        """
+        params.extend([first, first, first])
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._pool.reader() as conn:
+            return self._query_courses(conn, sql, params)
     
     def add_feedback(self, course_id: int, content: str, score: float) -> bool:
         """添加课程反馈"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 conn.execute(
                     "INSERT INTO feedback (course_id, content, score) VALUES (?, ?, ?)",
                     (course_id, content, score)
@@ -190,7 +495,7 @@ class CourseManager:
     def update_score(self, course_id: int, score: float) -> bool:
         """更新课程评分"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.writer() as conn:
                 conn.execute(
                     "UPDATE courses SET score = ? WHERE id = ?",
                     (score, course_id)
@@ -199,36 +504,47 @@ class CourseManager:
         except sqlite3.Error:
             return False
     
+    def add_feedback_bulk(self, items: Iterable[tuple]) -> int:
+        """批量添加反馈，items 为 (课程ID, 内容, 评分)
+        
+        在一个事务中写入，不改动课程评分；返回写入条数。
+        """
+        items = list(items)
+        with self._pool.writer() as conn:
+            conn.executemany(
+                "INSERT INTO feedback (course_id, content, score) VALUES (?, ?, ?)",
+                items
+            )
+        return len(items)
+    
     def get_feedback(self, course_id: int) -> List[tuple]:
         """获取课程反馈"""
-        with sqlite3.connect(self.db_path) as conn:
-            try:
-                cursor = conn.execute("""
-                    SELECT content, score, created_at 
-                    FROM feedback 
-                    WHERE course_id = ?
-                    ORDER BY created_at DESC
-                """, (course_id,))
-                return cursor.fetchall()
-            except sqlite3.OperationalError:
-                # 如果score列不存在，返回带默认评分的结果
-                cursor = conn.execute("""
-                    SELECT content, created_at 
-                    FROM feedback 
-                    WHERE course_id = ?
-                    ORDER BY created_at DESC
-                """, (course_id,))
-                return [(content, 0.0, created_at) for content, created_at in cursor.fetchall()]
+        # score列由迁移保证存在
+        with self._pool.reader() as conn:
+            cursor = conn.execute("""
+                SELECT content, score, created_at 
+                FROM feedback 
+                WHERE course_id = ?
+                ORDER BY created_at DESC
+            """, (course_id,))
+            return [tuple(row) for row in cursor.fetchall()]
     
     def clear_courses(self):
         """清空所有课程"""
         try:
-            self.cursor.execute("DELETE FROM courses")
-            self.conn.commit()
-            return True
+            with self._pool.writer() as conn:
+                conn.execute("DELETE FROM courses")
+            self._conflict_index = ConflictIndex()
+            if self._columns is not None:
+                self._columns = CourseColumns()
+            if self._fuzzy_index is not None:
+                self._fuzzy_index = FuzzyCourseIndex()
+            self._clear_cache()
         except Exception as e:
             print(f"清空课程失败: {e}")
             return False
+        self._notify(CourseChange("reset"))
+        return True
     
     def _clear_cache(self):
         """清除缓存"""
@@ -236,7 +552,7 @@ class CourseManager:
     
     def get_course_score(self, course_id: int) -> Optional[float]:
         """获取课程评分"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.reader() as conn:
             cursor = conn.execute(
                 "SELECT score FROM courses WHERE id = ?",
                 (course_id,)
@@ -0,0 +1,206 @@
+import heapq
+import math
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .course import Course
+from .pinyin import initials
+from .text_index import split_terms
+
+# 参与模糊搜索的字段及权重
+FIELD_WEIGHTS = (("name", 1.0), ("teacher", 0.8), ("room", 0.8))
+PINYIN_FACTOR = 0.9       # 拼音首字母命中相对于原文命中的折扣
+FUZZY_FACTOR = 0.6        # 模糊命中相对于子串命中的折扣
+MIN_SIMILARITY = 0.4      # 模糊命中所需的最低相似度
+
+Key = Tuple[int, int]  # (课程ID, 字段序号)
+
+
+@lru_cache(maxsize=16384)
+def grams(text: str) -> FrozenSet[str]:
+    """单字、二元组和三元组（trigram）的集合
+
+    中文课程名很短，只用三元组时一两个错字就会让全部三元组落空，
+    因此同时索引单字和二元组，按共有片段的比例衡量相似度。
+    """
+    result = set(text)
+    for n in (2, 3):
+        result.update(text[i:i + n] for i in range(len(text) - n + 1))
+    return frozenset(result)
+
+
+class _GramIndex:
+    """片段 -> 键 的倒排索引"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Key]] = {}
+        self._texts: Dict[Key, str] = {}
+
+    def add(self, key: Key, text: str):
+        if not text:
+            return
+        self._texts[key] = text
+        for gram in grams(text):
+            keys = self._postings.get(gram)
+            if keys is None:
+                self._postings[gram] = {key}
+            else:
+                keys.add(key)
+
+    def remove(self, key: Key):
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for gram in grams(text):
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def text(self, key: Key) -> str:
+        return self._texts[key]
+
+    def _ordered(self, query_grams: FrozenSet[str]) -> List[Set[Key]]:
+        # 各片段的倒排表，由短到长
+        empty: Set[Key] = set()
+        return sorted((self._postings.get(gram, empty) for gram in query_grams), key=len)
+
+    def containing_all(self, query_grams: FrozenSet[str]) -> Set[Key]:
+        """包含查询全部片段的键（子串命中的必要条件）"""
+        postings = self._ordered(query_grams)
+        if not postings or not postings[0]:
+            return set()
+        return postings[0].intersection(*postings[1:])
+
+    def similar(self, query_grams: FrozenSet[str], min_similarity: float) -> Dict[Key, float]:
+        """与查询共有片段比例不低于 min_similarity 的键及其相似度
+
+        共有 k 个片段的键必然出现在最短的 n-k+1 个倒排表之一中，
+        只从这些倒排表取候选，不必遍历常见单字的长倒排表。
+        """
+        total = len(query_grams)
+        need = max(1, math.ceil(min_similarity * total))
+        postings = self._ordered(query_grams)
+        candidates = set().union(*postings[:total - need + 1])
+        result = {}
+        for key in candidates:
+            shared = len(query_grams & grams(self._texts[key]))
+            if shared >= need:
+                result[key] = shared / total
+        return result
+
+
+def _substring_score(text: str, term: str) -> float:
+    # 子串命中：前缀命中、覆盖比例越高得分越高，范围 [1, 2]
+    position = text.find(term)
+    if position < 0:
+        return 0.0
+    return 1.0 + (0.5 if position == 0 else 0.0) + 0.5 * len(term) / len(text)
+
+
+class FuzzyCourseIndex:
+    """课程模糊搜索索引
+
+    名称、教师、教室规范化后按单字/二元组/三元组建立倒排索引，另建一份拼音首字母的
+    索引。每个搜索词先由倒排表得到候选及共有片段数，再按子串、拼音首字母或相似度打分；
+    多个搜索词须全部命中，得分相加后排序。增删改只更新该课程的条目。
+    """
+
+    def __init__(self):
+        self._text = _GramIndex()
+        self._initials = _GramIndex()
+        self._courses: Dict[int, Course] = {}
+
+    @classmethod
+    def build(cls, courses: Iterable[Course]) -> "FuzzyCourseIndex":
+        index = cls()
+        for course in courses:
+            index.add(course)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._courses)
+
+    def __contains__(self, course_id: int) -> bool:
+        return course_id in self._courses
+
+    def get(self, course_id: int) -> Optional[Course]:
+        return self._courses.get(course_id)
+
+    def add(self, course: Course):
+        """加入课程，已存在时按更新处理"""
+        if course.id in self._courses:
+            self.remove(course.id)
+        self._courses[course.id] = course
+        for field, (attr, _) in enumerate(FIELD_WEIGHTS):
+            text = " ".join(split_terms(getattr(course, attr)))
+            self._text.add((course.id, field), text)
+            self._initials.add((course.id, field), initials(text))
+
+    def update(self, course: Course):
+        self.add(course)
+
+    def remove(self, course_id: int) -> Optional[Course]:
+        course = self._courses.pop(course_id, None)
+        if course is None:
+            return None
+        for field in range(len(FIELD_WEIGHTS)):
+            self._text.remove((course_id, field))
+            self._initials.remove((course_id, field))
+        return course
+
+    def _score_term(self, term: str) -> Dict[int, float]:
+        """单个搜索词对各课程的得分（取各字段中的最高分）"""
+        scores: Dict[int, float] = {}
+
+        def offer(key: Key, score: float):
+            course_id, field = key
+            score *= FIELD_WEIGHTS[field][1]
+            if score > scores.get(course_id, 0.0):
+                scores[course_id] = score
+
+        term_grams = grams(term)
+        exact = set()
+        for key in self._text.containing_all(term_grams):
+            score = _substring_score(self._text.text(key), term)
+            if score:
+                exact.add(key)
+                offer(key, score)
+
+        # 少于三个字的词和含数字的词（如教室号 "12-3"）只做子串匹配：
+        # 两个字谈不上错别字，相近的编号也不是错字
+        if len(term) >= 3 and not any(char.isdigit() for char in term):
+            for key, similarity in self._text.similar(term_grams, MIN_SIMILARITY).items():
+                if key not in exact:
+                    offer(key, FUZZY_FACTOR * similarity)
+
+        # 纯字母的词再按拼音首字母匹配，如 "sjjg" 命中 "数据结构"
+        if term.isascii() and term.isalpha():
+            for key in self._initials.containing_all(term_grams):
+                score = _substring_score(self._initials.text(key), term)
+                if score:
+                    offer(key, PINYIN_FACTOR * score)
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[Course, float]]:
+        """按相关度返回 (课程, 得分)，空查询返回空列表"""
+        terms = split_terms(query)
+        if not terms:
+            return []
+        total: Optional[Dict[int, float]] = None
+        # 长词的候选通常较少，先算长词；后面的词只保留已有候选
+        for term in sorted(terms, key=len, reverse=True):
+            scores = self._score_term(term)
+            if total is None:
+                total = scores
+            else:
+                total = {course_id: score + scores[course_id]
+                         for course_id, score in total.items() if course_id in scores}
+            if not total:
+                return []
+        order = lambda item: (-item[1], item[0])
+        if limit is None:
+            ranked = sorted(total.items(), key=order)
+        else:
+            ranked = heapq.nsmallest(limit, total.items(), key=order)
+        return [(self._courses[course_id], score) for course_id, score in ranked]
@@ -0,0 +1,169 @@
+import logging
+import sqlite3
+from typing import Callable, List
+
+from .connection_pool import ConnectionPool
+from .weeks import WeekSet, parse_week_mask
+
+TERM_WEEKS = 20  # 与 ui.timetable_model.TERM_WEEKS 一致
+
+logger = logging.getLogger(__name__)
+
+
+def _create_base_schema(conn: sqlite3.Connection):
+    """v1: 课程表与反馈表"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS courses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            room TEXT,
+            teacher TEXT,
+            weeks TEXT,
+            day_of_week INTEGER,
+            start_time TEXT,
+            end_time TEXT,
+            description TEXT,
+            score REAL DEFAULT 0,
+            color TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_id INTEGER,
+            content TEXT,
+            score REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (course_id) REFERENCES courses (id)
+        )
+    """)
+    # 早期版本的feedback表没有score列，原地补上即可，无需重建整张表
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(feedback)")}
+    if "score" not in columns:
+        conn.execute("ALTER TABLE feedback ADD COLUMN score REAL DEFAULT 0")
+
+
+def _index_feedback(conn: sqlite3.Connection):
+    """v2: 按课程查询反馈的索引"""
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_feedback_course
+        ON feedback (course_id, created_at)
+    """)
+
+
+def _add_week_mask(conn: sqlite3.Connection):
+    """v3: 周次位掩码列，用于在SQL中按周过滤"""
+    conn.execute("ALTER TABLE courses ADD COLUMN week_mask INTEGER NOT NULL DEFAULT 0")
+    rows = conn.execute("SELECT id, weeks FROM courses").fetchall()
+    updates = []
+    for course_id, weeks in rows:
+        try:
+            updates.append((parse_week_mask(weeks or ""), course_id))
+        except ValueError:
+            continue  # 无法解析的旧数据保持0，由 v5 改为整学期
+    conn.executemany("UPDATE courses SET week_mask = ? WHERE id = ?", updates)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_courses_day_week
+        ON courses (day_of_week, week_mask)
+    """)
+
+
+def _create_search_index(conn: sqlite3.Connection):
+    """v4: FTS5全文索引，由触发器与courses表保持同步
+
+    优先使用trigram分词器（支持中文任意子串），不支持时退回unicode61；
+    SQLite未编译FTS5时跳过，搜索会退回LIKE查询。
+    """
+    for tokenize in ("trigram", "unicode61 remove_diacritics 2"):
+        try:
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE courses_fts USING fts5(
+                    name, teacher, room, description,
+                    content='courses', content_rowid='id',
+                    tokenize='{tokenize}'
+                )
+            """)
+            break
+        except sqlite3.OperationalError:
+            continue
+    else:
+        return
+
+    conn.execute("""
+        CREATE TRIGGER courses_fts_insert AFTER INSERT ON courses BEGIN
+            INSERT INTO courses_fts (rowid, name, teacher, room, description)
+            VALUES (new.id, new.name, new.teacher, new.room, new.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER courses_fts_delete AFTER DELETE ON courses BEGIN
+            INSERT INTO courses_fts (courses_fts, rowid, name, teacher, room, description)
+            VALUES ('delete', old.id, old.name, old.teacher, old.room, old.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER courses_fts_update
+        AFTER UPDATE OF name, teacher, room, description ON courses BEGIN
+            INSERT INTO courses_fts (courses_fts, rowid, name, teacher, room, description)
+            VALUES ('delete', old.id, old.name, old.teacher, old.room, old.description);
+            INSERT INTO courses_fts (rowid, name, teacher, room, description)
+            VALUES (new.id, new.name, new.teacher, new.room, new.description);
+        END
+    """)
+    conn.execute("INSERT INTO courses_fts (courses_fts) VALUES ('rebuild')")
+
+
+def _backfill_unparsed_weeks(conn: sqlite3.Connection):
+    """v5: v3 无法解析周次的课程掩码为0，在任何一周都不显示；改为整学期并列出这些课程"""
+    rows = conn.execute("SELECT id, name, weeks FROM courses WHERE week_mask = 0").fetchall()
+    all_weeks = WeekSet.from_weeks(range(1, TERM_WEEKS + 1)).mask
+    updates = []
+    for course_id, name, weeks in rows:
+        try:
+            parse_week_mask(weeks or "")
+        except ValueError:
+            logger.warning("课程 %s（%s）的周次 %r 无法解析，按第1-%d周显示",
+                           course_id, name, weeks, TERM_WEEKS)
+            updates.append((all_weeks, course_id))
+    conn.executemany("UPDATE courses SET week_mask = ? WHERE id = ?", updates)
+
+
+# 按顺序排列的迁移步骤，第 i 个步骤把库从版本 i 升级到 i+1。
+# 只能在末尾追加，不能修改或删除已发布的步骤。
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _create_base_schema,
+    _index_feedback,
+    _add_week_mask,
+    _create_search_index,
+    _backfill_unparsed_weeks,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """读取数据库的结构版本号"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(pool: ConnectionPool) -> int:
+    """把数据库升级到最新版本，返回升级后的版本号
+
+    结构已是最新时只读取一次 user_version；否则每个步骤在各自的事务中
+    执行，并与版本号一起提交，保证每个步骤只会成功执行一次。
+    """
+    with pool.reader() as conn:
+        version = get_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    while version < SCHEMA_VERSION:
+        with pool.writer() as conn:
+            # 拿到写锁后重新确认，避免多个进程重复执行同一步骤
+            version = get_version(conn)
+            if version >= SCHEMA_VERSION:
+                break
+            MIGRATIONS[version](conn)
+            version += 1
+            conn.execute(f"PRAGMA user_version={version}")
+    return version
@@ -0,0 +1,47 @@
+"""汉字拼音首字母
+
+安装了 pypinyin 时使用它（覆盖全部汉字）；否则按 GB2312 一级汉字的拼音排序查表，
+覆盖 3755 个常用汉字，课程名、教师名中的汉字基本都在其中。
+"""
+from bisect import bisect_right
+from functools import lru_cache
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # 可选依赖
+    lazy_pinyin = None
+
+# GB2312 一级汉字按拼音排序，每个声母首字的区位码
+_GB2312_BOUNDS = [
+    0xB0A1, 0xB0C5, 0xB2C1, 0xB4EE, 0xB6EA, 0xB7A2, 0xB8C1, 0xB9FE, 0xBBF7, 0xBFA6,
+    0xC0AC, 0xC2E8, 0xC4C3, 0xC5B6, 0xC5BE, 0xC6DA, 0xC8BB, 0xC8F6, 0xCBFA, 0xCDDA,
+    0xCEF4, 0xD1B9, 0xD4D1,
+]
+_GB2312_LETTERS = "abcdefghjklmnopqrstwxyz"
+_GB2312_LAST = 0xD7F9
+
+
+@lru_cache(maxsize=8192)
+def _char_initial(char: str) -> str:
+    if char.isascii():
+        return char.lower() if char.isalnum() else ""
+    try:
+        encoded = char.encode("gb2312")
+    except UnicodeEncodeError:
+        return ""
+    if len(encoded) != 2:
+        return ""
+    code = encoded[0] << 8 | encoded[1]
+    if not _GB2312_BOUNDS[0] <= code <= _GB2312_LAST:
+        return ""  # 二级汉字按部首排列，无法查表
+    return _GB2312_LETTERS[bisect_right(_GB2312_BOUNDS, code) - 1]
+
+
+def initials(text: str) -> str:
+    """拼音首字母串，如 "数据结构" -> "sjjg"；字母和数字原样保留（转小写），其余字符忽略"""
+    if not text:
+        return ""
+    if lazy_pinyin is not None:
+        parts = lazy_pinyin(text, style=Style.FIRST_LETTER, errors="default")
+        return "".join(c for c in "".join(parts).lower() if c.isascii() and c.isalnum())
+    return "".join(_char_initial(char) for char in text)
@@ -0,0 +1,141 @@
+import heapq
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .course import Course
+from .course_manager import CourseChange
+from .weeks import WeekSet
+
+Entry = Tuple[datetime, int, int]  # (上课时刻, 课程ID, 版本)
+
+
+class ReminderScheduler:
+    """课程提醒调度
+
+    按开学日期把每门课程在本学期的上课时刻展开，放入以上课时刻排序的小顶堆，
+    调用方只需为堆顶的提醒时刻设置一次单次定时器。提醒时刻 = 上课时刻 - 提前分钟数，
+    修改提前时间不改变堆的顺序。课程变更时只作废该课程的旧条目（版本号惰性删除）
+    并压入新条目；节假日不上课，也不提醒。
+    """
+
+    def __init__(self, term_start: date, lead_minutes: int = 15,
+                 holidays: Iterable[date] = ()):
+        self.lead = timedelta(minutes=lead_minutes)
+        self._monday = term_start - timedelta(days=term_start.weekday())  # 第1周的周一
+        self._holidays: Set[date] = set(holidays)
+        self._heap: List[Entry] = []
+        self._courses: Dict[int, Course] = {}
+        self._versions: Dict[int, int] = {}
+        self._pending: Dict[int, int] = {}  # 课程ID -> 堆中有效条目数
+        self._stale = 0  # 堆中已作废的条目数
+        self._now = datetime.min
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._stale
+
+    def occurrences(self, course: Course) -> List[datetime]:
+        """课程在本学期各周的上课时刻"""
+        result = []
+        for week in WeekSet(course.week_mask):
+            day = self._monday + timedelta(weeks=week - 1, days=course.day_of_week - 1)
+            if day not in self._holidays:
+                result.append(datetime(day.year, day.month, day.day) +
+                              timedelta(minutes=course.start_min))
+        return result
+
+    def set_courses(self, courses: Iterable[Course], now: datetime):
+        """重新展开全部课程，只保留尚未开始的课"""
+        self._now = now
+        self._courses = {}
+        self._versions = {}
+        self._pending = {}
+        self._heap = []
+        self._stale = 0
+        for course in courses:
+            entries = [(start, course.id, 0) for start in self.occurrences(course)
+                       if start >= now]
+            self._courses[course.id] = course
+            self._versions[course.id] = 0
+            self._pending[course.id] = len(entries)
+            self._heap.extend(entries)
+        heapq.heapify(self._heap)
+
+    def add(self, course: Course):
+        """加入课程，已存在时按更新处理"""
+        self.remove(course.id)
+        version = self._versions.get(course.id, -1) + 1
+        self._versions[course.id] = version
+        self._courses[course.id] = course
+        count = 0
+        for start in self.occurrences(course):
+            if start >= self._now:
+                heapq.heappush(self._heap, (start, course.id, version))
+                count += 1
+        self._pending[course.id] = count
+
+    def update(self, course: Course):
+        self.add(course)
+
+    def apply_change(self, change: CourseChange) -> bool:
+        """应用单门课程的变更，返回False表示需要整体重新展开"""
+        if change.kind in ("added", "updated"):
+            self.add(change.course)
+        elif change.kind == "removed":
+            self.remove(change.course_id)
+        else:
+            return False
+        return True
+
+    def remove(self, course_id: int) -> Optional[Course]:
+        course = self._courses.pop(course_id, None)
+        if course is None:
+            return None
+        self._versions[course_id] += 1
+        self._stale += self._pending.pop(course_id)
+        if self._stale > len(self._heap) // 2:
+            self._compact()
+        return course
+
+    def set_term(self, term_start: date, holidays: Iterable[date], now: datetime):
+        """开学日期或节假日变化时按新的日历重新展开"""
+        self._monday = term_start - timedelta(days=term_start.weekday())
+        self._holidays = set(holidays)
+        self.set_courses(list(self._courses.values()), now)
+
+    def set_lead(self, minutes: int):
+        """修改提前提醒的分钟数，上课时刻不变，堆无需重排"""
+        self.lead = timedelta(minutes=minutes)
+
+    def next_due(self) -> Optional[datetime]:
+        """下一次提醒的时刻，没有待提醒的课程时返回 None"""
+        self._drop_stale()
+        if not self._heap:
+            return None
+        return self._heap[0][0] - self.lead
+
+    def pop_due(self, now: datetime) -> List[Tuple[Course, datetime]]:
+        """取出提醒时刻不晚于 now 的 (课程, 上课时刻)，已经开始的课不再提醒"""
+        self._now = now
+        due = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] - self.lead > now:
+                return due
+            start, course_id, _ = heapq.heappop(self._heap)
+            self._pending[course_id] -= 1
+            if start >= now:
+                due.append((self._courses[course_id], start))
+
+    def _is_stale(self, entry: Entry) -> bool:
+        return entry[1] not in self._courses or self._versions[entry[1]] != entry[2]
+
+    def _drop_stale(self):
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def _compact(self):
+        # 作废条目过半时重建堆，避免反复修改的课程让堆无限增长
+        self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+        heapq.heapify(self._heap)
+        self._stale = 0
@@ -1,6 +1,6 @@
 import json
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
 class SettingsManager:
     def __init__(self, settings_file: str = "settings.json"):
@@ -31,6 +31,10 @@ class SettingsManager:
                 }
             }
     
+    def reload(self):
+        """重新读取设置文件，其他对话框可能已修改了它"""
+        self.settings = self._load_settings()
+
     def save_settings(self):
         """保存设置"""
         with open(self.settings_file, 'w', encoding='utf-8') as f:
@@ -51,6 +55,12 @@ class SettingsManager:
         date_str = date.strftime("%Y-%m-%d")
         return self.settings.get("holidays", {}).get(date_str)
         
+    def get_holiday_dates(self) -> List[date]:
+        """所有放假的日期"""
+        return [datetime.strptime(date_str, "%Y-%m-%d").date()
+                for date_str, holiday in self.settings.get("holidays", {}).items()
+                if holiday.get("type", "holiday") == "holiday"]
+        
     def add_holiday(self, date: datetime, name: str, holiday_type: str = "holiday"):
         """添加节假日"""
         date_str = date.strftime("%Y-%m-%d")
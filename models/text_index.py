@@ -0,0 +1,82 @@
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+from .course import Course
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """搜索用的规范化文本：全角转半角、忽略大小写"""
+    if not text:
+        return ""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def split_terms(query: str) -> List[str]:
+    """把搜索词规范化后按空白拆分"""
+    return normalize_text(query).split()
+
+
+class CourseTextIndex:
+    """课程文本索引
+
+    每门课程的名称、教师、教室、描述预先规范化并拼成一个字符串，查询时只做子串判断，
+    不再逐次转换大小写。多个搜索词须全部命中。连续输入时新查询往往是上一次查询的延伸，
+    此时只在上一次的结果中继续筛选。
+    """
+
+    _SEPARATOR = "\x00"  # 字段分隔符，避免搜索词跨字段命中
+
+    def __init__(self):
+        self._texts: Dict[int, str] = {}
+        self._last_query: Optional[str] = None
+        self._last_result: Set[int] = set()
+
+    @classmethod
+    def build(cls, courses: Iterable[Course]) -> "CourseTextIndex":
+        index = cls()
+        for course in courses:
+            index._texts[course.id] = index._text(course)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _text(self, course: Course) -> str:
+        return self._SEPARATOR.join(normalize_text(value) for value in (
+            course.name, course.teacher, course.room, course.description))
+
+    def add(self, course: Course):
+        """加入或更新课程"""
+        self._texts[course.id] = self._text(course)
+        self._last_query = None
+
+    def remove(self, course_id: int):
+        """移除课程"""
+        if self._texts.pop(course_id, None) is not None:
+            self._last_query = None
+
+    def matches(self, course_id: int, query: str) -> bool:
+        """单门课程是否命中"""
+        text = self._texts.get(course_id)
+        terms = split_terms(query)
+        return text is not None and bool(terms) and all(term in text for term in terms)
+
+    def search(self, query: str) -> Set[int]:
+        """返回命中全部搜索词的课程ID，空查询返回空集"""
+        normalized = " ".join(split_terms(query))
+        if not normalized:
+            self._last_query = None
+            return set()
+        last = self._last_query
+        if last is not None and normalized.startswith(last):
+            # 新查询是上一次的延伸：旧的每个词都是某个新词的子串，结果必然是上一次的子集
+            candidates = self._last_result
+        else:
+            candidates = self._texts.keys()
+        texts = self._texts
+        # 逐词筛选，每个词只在前一个词的结果中判断
+        for term in normalized.split():
+            candidates = [course_id for course_id in candidates if term in texts[course_id]]
+        result = set(candidates)
+        self._last_query, self._last_result = normalized, result
+        return result
@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from typing import List, Optional
+
+from .weeks import WeekSet
+
+
+class WeekCache:
+    """按周次缓存课程列表的LRU缓存
+
+    键为周次（None 表示全部课程）。课程变动时只淘汰受影响的周次和全部课程这一项。
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Optional[int], list]" = OrderedDict()
+
+    def __contains__(self, week: Optional[int]) -> bool:
+        return week in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, week: Optional[int]) -> Optional[list]:
+        """读取缓存，命中时移到最近使用的位置"""
+        courses = self._data.get(week)
+        if courses is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(week)
+        self.hits += 1
+        return courses
+
+    def put(self, week: Optional[int], courses: list):
+        self._data[week] = courses
+        self._data.move_to_end(week)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, week_mask: int):
+        """淘汰与给定周次掩码相关的缓存项"""
+        self._data.pop(None, None)
+        for week in WeekSet(week_mask):
+            self._data.pop(week, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def weeks(self) -> List[Optional[int]]:
+        """当前缓存的周次，从最久未用到最近使用"""
+        return list(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,104 @@
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Union
+
+
+class WeekSet:
+    """周次集合，用整数位掩码表示：第n周对应第n位"""
+
+    __slots__ = ("mask",)
+
+    # SQLite的INTEGER是64位有符号整数，最高只能用到第62位
+    MAX_WEEK = 62
+
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+
+    @classmethod
+    def parse(cls, weeks_str: str) -> 'WeekSet':
+        """解析周次字符串，如 "1-16周"、"1,3,5-7周" """
+        return cls(parse_week_mask(weeks_str))
+
+    @classmethod
+    def from_weeks(cls, weeks: Iterable[int]) -> 'WeekSet':
+        mask = 0
+        for week in weeks:
+            mask |= week_bit(week)
+        return cls(mask)
+
+    def __contains__(self, week: int) -> bool:
+        return 0 < week <= self.MAX_WEEK and bool(self.mask >> week & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        mask, week = self.mask, 0
+        while mask:
+            if mask & 1:
+                yield week
+            mask >>= 1
+            week += 1
+
+    def __len__(self) -> int:
+        return bin(self.mask).count("1")
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WeekSet) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __and__(self, other: 'WeekSet') -> 'WeekSet':
+        return WeekSet(self.mask & other.mask)
+
+    def __or__(self, other: 'WeekSet') -> 'WeekSet':
+        return WeekSet(self.mask | other.mask)
+
+    def intersects(self, other: Union['WeekSet', int]) -> bool:
+        """是否有共同的周次"""
+        other_mask = other.mask if isinstance(other, WeekSet) else other
+        return bool(self.mask & other_mask)
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+    def __str__(self) -> str:
+        """格式化为周次字符串，如 "1-8,10周" """
+        parts = []
+        weeks = self.to_list()
+        i = 0
+        while i < len(weeks):
+            j = i
+            while j + 1 < len(weeks) and weeks[j + 1] == weeks[j] + 1:
+                j += 1
+            parts.append(str(weeks[i]) if i == j else f"{weeks[i]}-{weeks[j]}")
+            i = j + 1
+        return ",".join(parts) + "周" if parts else ""
+
+    def __repr__(self) -> str:
+        return f"WeekSet({str(self)!r})"
+
+
+def week_bit(week: int) -> int:
+    """单个周次对应的位"""
+    if not 1 <= week <= WeekSet.MAX_WEEK:
+        raise ValueError(f"周次超出范围: {week}")
+    return 1 << week
+
+
+@lru_cache(maxsize=1024)
+def parse_week_mask(weeks_str: str) -> int:
+    """解析周次字符串为位掩码（结果缓存，同样的字符串只解析一次）"""
+    mask = 0
+    for part in weeks_str.replace('周', '').replace('，', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = map(int, part.split('-'))
+            if start > end:
+                raise ValueError(f"周次范围无效: {part}")
+            mask |= (week_bit(end) << 1) - week_bit(start)
+        else:
+            mask |= week_bit(int(part))
+    return mask
@@ -3,7 +3,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QCalendarWidget,
 from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QColor, QTextCharFormat
 from models.course import Course
-from typing import List, Dict
+from models.weeks import WeekSet
 from datetime import datetime, timedelta
 from .term_settings_dialog import TermSettingsDialog
 from models.settings_manager import SettingsManager
@@ -447,16 +447,11 @@ class CourseCalendarDialog(QDialog):
         week = date.weekNumber()[0] - term_start_date.weekNumber()[0] + 1
         day_of_week = date.dayOfWeek()
         
-        # 获取当天的课程
-        courses = self.course_manager.get_courses()
-        day_courses = [
-            course for course in courses
-            if course.day_of_week == day_of_week and
-            week in self._parse_weeks(course.weeks)
-        ]
-        
-        # 按时间排序
-        day_courses.sort(key=lambda x: x.start_time)
+        # 获取当天的课程（已按时间排序）
+        if 1 <= week <= WeekSet.MAX_WEEK:
+            day_courses = self.course_manager.columns().courses(day=day_of_week, week=week)
+        else:
+            day_courses = []
         
         # 显示课程
         if not day_courses:
@@ -532,15 +527,3 @@ class CourseCalendarDialog(QDialog):
             layout.addWidget(teacher_label)
         
         return card
-        
-    def _parse_weeks(self, weeks_str: str) -> List[int]:
-        """解析周次字符串，如 "1-16周" -> [1,2,3,...,16]"""
-        result = []
-        weeks_str = weeks_str.replace('周', '')
-        for part in weeks_str.split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                result.extend(range(start, end + 1))
-            else:
-                result.append(int(part))
-        return result
@@ -1,15 +1,14 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QTableWidget, QTableWidgetItem, QPushButton,
-                             QLineEdit, QLabel, QFrame, QMessageBox, QMenu, QFileDialog, QMenuBar, QDialog, QComboBox, QHeaderView,
+                             QTableView, QAbstractItemView, QPushButton,
+                             QLineEdit, QMessageBox, QMenu, QFileDialog, QDialog, QComboBox, QHeaderView,
                              QApplication)
-from PyQt6.QtCore import Qt, QTimer, QRect, QPoint
-from PyQt6.QtGui import (QColor, QFont, QIcon, QAction, QPainter, QPdfWriter,
-                        QPixmap, QRegion, QPageSize, QKeySequence, QShortcut)
+from PyQt6.QtCore import Qt, QTimer, QPoint
+from PyQt6.QtGui import QIcon, QAction, QKeySequence, QShortcut
 from datetime import datetime
 from typing import List, Optional
 import os
 from .course_dialog import CourseDialog
-from models.course_manager import CourseManager
+from models.course_manager import CourseManager, CourseChange
 from models.course import Course
 from .feedback_dialog import FeedbackDialog
 from .reminder_settings import ReminderSettings
@@ -17,142 +16,20 @@ from .statistics_dialog import StatisticsDialog
 import json
 from utils.theme_manager import ThemeManager
 from ui.theme_dialog import ThemeDialog
+from utils.notifications import NotificationQueue, Reminder, ToastBackend
+from utils.timetable_renderer import POSTER_SCALE, ExportThread, TimetableRenderer
+from utils.batch_export import BatchExportThread
 from ui.sync_dialog import SyncDialog
 from ui.share_dialog import ShareDialog
 from ui.guide_dialog import GuideDialog
 from .calendar_dialog import CourseCalendarDialog
+from .timetable_model import TimetableModel, CourseCardDelegate, TIME_SLOTS, TERM_WEEKS
 from models.backup_manager import BackupManager
+from models.reminder_scheduler import ReminderScheduler
+from models.settings_manager import SettingsManager
 
-class CourseCard(QFrame):
-    """课程卡片组件"""
-    def __init__(self, course, parent=None):
-        super().__init__(parent)
-        self.course = course
-        self.setObjectName("courseCard")
-        self.setup_ui()
-        
-        # 添加详细的工具提示
-        tooltip = (
-            f"<html>"
-            f"<h3>{course.name}</h3>"
-            f"<p><b>教室：</b>{course.room}</p>"
-            f"<p><b>教师：</b>{course.teacher}</p>"
-            f"<p><b>时间：</b>{course.start_time.strftime('%H:%M')}-{course.end_time.strftime('%H:%M')}</p>"
-            f"<p><b>周次：</b>{course.weeks}</p>"
-            f"<p><b>描述：</b>{course.description}</p>"
-            f"</html>"
-        )
-        self.setToolTip(tooltip)
-        
-        # 启用鼠标追踪
-        self.setMouseTracking(True)
-        
-    def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setSpacing(4)
-        layout.setContentsMargins(8, 8, 8, 8)
-        
-        # 课程名称
-        name_label = QLabel(self.course.name)
-        name_label.setObjectName("courseName")
-        name_label.setWordWrap(True)
-        layout.addWidget(name_label)
-        
-        # 教室信息
-        if self.course.room:
-            room_label = QLabel(f"📍 {self.course.room}")
-            room_label.setObjectName("infoText")
-            layout.addWidget(room_label)
-        
-        # 教师信息
-        if self.course.teacher:
-            teacher_label = QLabel(f"👤 {self.course.teacher}")
-            teacher_label.setObjectName("infoText")
-            layout.addWidget(teacher_label)
-        
-        # 周次信息 - 总课表视图中显示
-        week_label = QLabel(f"🗓️ {self.course.weeks}")
-        week_label.setObjectName("infoText")
-        layout.addWidget(week_label)
-        
-        layout.addStretch()
-        
-        # 设置基本样式
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 1px solid #e2e2e2;
-                border-radius: 6px;
-            }
-        """)
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.RightButton:
-            self.show_context_menu(event.pos())
-            
-    def show_context_menu(self, pos):
-        menu = QMenu(self)
-        
-        edit_action = QAction("编辑", self)
-        edit_action.triggered.connect(self.edit_course)
-        menu.addAction(edit_action)
-        
-        feedback_action = QAction("评分反馈", self)
-        feedback_action.triggered.connect(self.show_feedback)
-        menu.addAction(feedback_action)
-        
-        delete_action = QAction("删除", self)
-        delete_action.triggered.connect(self.delete_course)
-        menu.addAction(delete_action)
-        
-        menu.exec(self.mapToGlobal(pos))
-        
-    def edit_course(self):
-        dialog = CourseDialog(self.parent(), self.course)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            # 获取父窗口（MainWindow）并更新课程
-            main_window = self.window()
-            if hasattr(main_window, 'update_course'):
-                main_window.update_course(self.course.id, dialog.get_course_data())
-                
-    def delete_course(self):
-        reply = QMessageBox.question(
-            self, '确删除',
-            f'确定要删除课程 "{self.course.name}" 吗？',
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            main_window = self.window()
-            if hasattr(main_window, 'delete_course'):
-                main_window.delete_course(self.course.id)
-
-    def show_feedback(self):
-        """显示评分对话框"""
-        dialog = FeedbackDialog(self.course, self.window())
-        dialog.exec()
-
-    def enterEvent(self, event):
-        """鼠标进入事件"""
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #e8f0fe;
-                border: 1px solid #e2e2e2;
-                border-radius: 6px;
-            }
-        """)
-        super().enterEvent(event)
-        
-    def leaveEvent(self, event):
-        """鼠标离开事件"""
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 1px solid #e2e2e2;
-                border-radius: 6px;
-            }
-        """)
-        super().leaveEvent(event)
+SEARCH_DELAY_MS = 150  # 搜索框停止输入多久后执行搜索
+REMINDER_MAX_WAIT_MS = 10 * 60 * 1000  # 提醒定时器单次最长等待时间
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -163,7 +40,7 @@ class MainWindow(QMainWindow):
             self.theme_manager = ThemeManager()
             
             # 初始化backup_manager
-            self.backup_manager = BackupManager("courses.db")
+            self.backup_manager = BackupManager("courses.db", self.course_manager.pool)
             
             # 随机选择一个主题
             import random
@@ -177,70 +54,66 @@ class MainWindow(QMainWindow):
             self.setStyleSheet(self.theme_manager.get_stylesheet())
             
             self.load_courses()
+            # 增删改只重绘受影响的单元格
+            self.course_manager.add_listener(self.on_courses_changed)
             self.setup_timer()
             self.connect_signals()
             self.setup_shortcuts()  # 设置快捷键
+            # 空闲时编译其余主题，切换主题、打开主题对话框时直接使用缓存
+            QTimer.singleShot(0, self.theme_manager.compile_all)
         except Exception as e:
             QMessageBox.critical(self, "初始化错误", f"窗口初始化失败：{str(e)}")
 
     def setup_timer(self):
-        """设置定时器用于课程提醒"""
+        """设置课程提醒：按学期日历预先算出提醒时刻，只在下一次提醒到期时触发"""
         self.reminder_timer = QTimer(self)
+        self.reminder_timer.setSingleShot(True)
+        self.reminder_timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.reminder_timer.timeout.connect(self.check_course_reminders)
-        self.reminder_timer.start(60000)  # 每分钟检查一次
+        self.notifications = NotificationQueue(ToastBackend(self), self)
         
         # 加载提醒设置
+        self.settings_manager = SettingsManager()
         self.load_reminder_settings()
+        self.reminder_scheduler = ReminderScheduler(
+            self.settings_manager.get_term_start().date(),
+            self.reminder_settings['reminder_time'],
+            self.settings_manager.get_holiday_dates()
+        )
+        self.reminder_scheduler.set_courses(self.course_manager.get_courses(), datetime.now())
+        self.schedule_next_reminder()
         
     def load_reminder_settings(self):
         """加载提醒设置"""
-        try:
-            with open('settings.json', 'r') as f:
-                self.reminder_settings = json.load(f)
-        except:
-            self.reminder_settings = {
-                'reminder_time': 15,
-                'sound_type': '默认'
-            }
+        self.settings_manager.reload()
+        self.reminder_settings = {
+            'reminder_time': self.settings_manager.settings.get('reminder_time', 15),
+            'sound_type': self.settings_manager.settings.get('sound_type', '默认')
+        }
+        self.notifications.sound = self.reminder_settings['sound_type']
+        
+    def schedule_next_reminder(self):
+        """为最近的一次提醒设置单次定时器"""
+        due = self.reminder_scheduler.next_due()
+        if due is None:
+            self.reminder_timer.stop()
+            return
+        delay = (due - datetime.now()).total_seconds() * 1000
+        # 最长等待一段时间后重新计算，系统休眠或调整时钟后也不会错过提醒
+        self.reminder_timer.start(int(min(max(delay, 0), REMINDER_MAX_WAIT_MS)))
         
     def check_course_reminders(self):
-        """检查是否需要发送课程提醒"""
-        current_time = datetime.now().time()
-        current_weekday = datetime.now().weekday() + 1
-        
-        for course in self.course_manager.get_courses(self.current_week):
-            if course.day_of_week == current_weekday:
-                # 计算提醒时间（课程开始前15分钟）
-                reminder_minutes = course.start_time.hour * 60 + course.start_time.minute - 15
-                if reminder_minutes < 0:
-                    reminder_minutes = 0
-                    
-                reminder_hour = reminder_minutes // 60
-                reminder_minute = reminder_minutes % 60
-                reminder_time = datetime.strptime(f"{reminder_hour:02d}:{reminder_minute:02d}", "%H:%M").time()
-                
-                if current_time.hour == reminder_time.hour and \
-                   current_time.minute == reminder_time.minute:
-                    self.show_course_reminder(course)
-                    
-    def show_course_reminder(self, course):
-        """显示课程提醒"""
-        QMessageBox.information(
-            self,
-            "课程提",
-            f"课程 {course.name} 将在15分钟后开始\n"
-            f"教室: {course.room}\n"
-            f"教师: {course.teacher}"
-        )
+        """发送已到提醒时刻的课程提醒"""
+        now = datetime.now()
+        lead = self.reminder_scheduler.lead
+        due = self.reminder_scheduler.pop_due(now)
+        self.schedule_next_reminder()
+        # 同时到期的提醒合并为一条通知，不阻塞事件循环
+        self.notifications.push(Reminder(course, start, start - lead) for course, start in due)
 
     def check_course_conflicts(self, course: Course) -> List[Course]:
         """检查课程冲突并返回冲突的课程列表"""
-        conflicts = []
-        existing_courses = self.course_manager.get_courses()
-        for existing_course in existing_courses:
-            if course.id != existing_course.id and course.conflicts_with(existing_course):
-                conflicts.append(existing_course)
-        return conflicts
+        return self.course_manager.find_conflicts(course, exclude_id=course.id)
 
     def show_conflict_warning(self, conflicts: List[Course]):
         """显示课程冲突警"""
@@ -268,9 +141,7 @@ class MainWindow(QMainWindow):
             if conflicts and not self.show_conflict_warning(conflicts):
                 return
             
-            if self.course_manager.add_course(course):
-                self.load_courses()
-            else:
+            if not self.course_manager.add_course(course):
                 QMessageBox.critical(
                     self,
                     "添加失败",
@@ -279,9 +150,7 @@ class MainWindow(QMainWindow):
 
     def update_course(self, course_id: int, new_course_data: Course):
         """更新课程信息"""
-        if self.course_manager.update_course(course_id, new_course_data):
-            self.load_courses()
-        else:
+        if not self.course_manager.update_course(course_id, new_course_data):
             QMessageBox.warning(
                 self,
                 "新失败",
@@ -290,9 +159,7 @@ class MainWindow(QMainWindow):
 
     def delete_course(self, course_id: int):
         """删除课程"""
-        if self.course_manager.delete_course(course_id):
-            self.load_courses()
-        else:
+        if not self.course_manager.delete_course(course_id):
             QMessageBox.warning(
                 self,
                 "删除失败",
@@ -301,48 +168,24 @@ class MainWindow(QMainWindow):
 
     def load_courses(self):
         """加载课程数据到表格"""
-        # 清空现有课程
-        for row in range(self.table.rowCount()):
-            for col in range(self.table.columnCount()):
-                self.table.setCellWidget(row, col, None)
-        
-        # 加载课程
-        courses = self.course_manager.get_courses()
-        for course in courses:
-            # 如果是总课表或者课程在当前周进行，则显示
-            if self.current_week == 0 or self.current_week in self._parse_weeks(course.weeks):
-                row = self._get_time_slot_index(course.start_time)
-                col = course.day_of_week - 1
-                if row is not None:
-                    self.table.setCellWidget(row, col, CourseCard(course))
-
-    def _parse_weeks(self, weeks_str: str) -> List[int]:
-        """解析周次字符串，如 "1-16周" -> [1,2,3,...,16]"""
-        result = []
-        weeks_str = weeks_str.replace('周', '')
-        for part in weeks_str.split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                result.extend(range(start, end + 1))
-            else:
-                result.append(int(part))
-        return result
-
-    def _get_time_slot_index(self, time) -> Optional[int]:
-        """根据时间获取对应时间段索引"""
-        time_slots = [
-            ("08:20", "09:55"),  # 第1-2节
-            ("10:15", "11:50"),  # 第3-4节
-            ("14:00", "15:35"),  # 第5-6节
-            ("15:55", "17:30"),  # 第7-8节
-            ("19:00", "20:35"),  # 晚上
-        ]
-        
-        time_str = time.strftime("%H:%M")
-        for i, (start, end) in enumerate(time_slots):
-            if start <= time_str <= end:
-                return i
-        return None
+        # 总课表显示全部，否则只取当前周的课程；卡片由委托绘制，不再逐格创建控件
+        courses = self.course_manager.get_courses(self.current_week or None)
+        self.timetable_model.set_courses(courses, self.current_week)
+        
+        # 空闲时预取相邻周次，翻周时直接命中缓存
+        if self.current_week:
+            neighbours = (self.current_week - 1, self.current_week + 1)
+            QTimer.singleShot(0, lambda: self.course_manager.prefetch(neighbours))
+
+    def on_courses_changed(self, change: CourseChange):
+        """课程变更时增量更新表格，无法增量应用时整体重新加载"""
+        if not self.timetable_model.apply_change(change):
+            self.load_courses()
+        if not self.reminder_scheduler.apply_change(change):
+            self.reminder_scheduler.set_courses(self.course_manager.get_courses(), datetime.now())
+        self.schedule_next_reminder()
+        if self.search_input.text():
+            self.apply_search()  # 模糊命中随课程变化
 
     def export_schedule(self):
         """导出课表"""
@@ -355,10 +198,11 @@ class MainWindow(QMainWindow):
         dialog.setFileMode(QFileDialog.FileMode.AnyFile)
         dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)  # 设置为保存模式
         
-        # 设置文件类型过滤器
+        # 设置文件类型过滤器：(扩展名, PNG的放大倍数)，海报尺寸的图片分块渲染
         filters = {
-            "PDF文件 (*.pdf)": ".pdf",
-            "PNG图片 (*.png)": ".png"
+            "PDF文件 (*.pdf)": (".pdf", None),
+            "PNG图片 (*.png)": (".png", 2.0),
+            "PNG海报，8倍尺寸 (*.png)": (".png", POSTER_SCALE)
         }
         dialog.setNameFilters(list(filters.keys()))
         
@@ -366,143 +210,75 @@ class MainWindow(QMainWindow):
         dialog.selectFile(default_filename)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            try:
-                # 获取选择的文件类型和路径
-                selected_filter = dialog.selectedNameFilter()
-                file_path = dialog.selectedFiles()[0]
-                extension = filters[selected_filter]
-                
-                # 确保文件有正确的扩展名
-                if not file_path.endswith(extension):
-                    file_path += extension
-                
-                # 根据文件类型导出
-                if extension == '.pdf':
-                    self.export_to_pdf(file_path)
-                else:
-                    self.export_to_image(file_path)
-                
-                QMessageBox.information(
-                    self,
-                    "导出成功",
-                    f"课表已成功导出到：\n{file_path}"
-                )
-                
-                # 在访达中显示文件
-                os.system(f'open -R "{file_path}"')
-                
-            except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    "导出失败",
-                    f"导出课表发生错误：\n{str(e)}"
-                )
-
-    def export_to_pdf(self, file_path: str):
-        """导出为PDF"""
-        # 创建PDF写入器
-        writer = QPdfWriter(file_path)
-        writer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-        writer.setResolution(300)  # 设置高分辨率
-        
-        # 计算页面大小和边距
-        page_width = writer.width()
-        page_height = writer.height()
-        margin = int(writer.resolution() * 0.4)  # 1cm边距
-        
-        # 创建绘图器
-        painter = QPainter()
-        painter.begin(writer)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # 抗锯齿
-        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)  # 文字抗锯齿
-        
-        # 使用系统默认字体
-        font = QFont()
-        font.setPointSize(16)
-        font.setBold(True)
-        painter.setFont(font)
-        
-        # 绘制标题
-        week_text = "总课表" if self.current_week == 0 else f"第{self.current_week}周课表"
-        title_text = f"课程表 - {week_text}"
-        
-        # 绘制标题
-        title_rect = QRect(margin, margin, page_width - 2 * margin, margin)
-        painter.drawText(title_rect, Qt.AlignmentFlag.AlignCenter, title_text)
-        
-        # 计算表格区域
-        content_rect = QRect(
-            margin,
-            margin * 2,  # 标题下
-            page_width - 2 * margin,
-            page_height - 3 * margin
+            # 获取选择的文件类型和路径
+            selected_filter = dialog.selectedNameFilter()
+            file_path = dialog.selectedFiles()[0]
+            extension, scale = filters[selected_filter]
+            
+            # 确保文件有正确的扩展名
+            if not file_path.endswith(extension):
+                file_path += extension
+            
+            # 在工作线程中按课程数据绘制，导出期间界面保持响应
+            week = self.current_week
+            thread = ExportThread(file_path, self.course_manager.get_courses(week or None),
+                                  week, self.theme_manager.current_theme, scale or 2.0, self)
+            thread.succeeded.connect(self.on_export_succeeded)
+            thread.failed.connect(self.on_export_failed)
+            thread.finished.connect(thread.deleteLater)
+            thread.start()
+
+    def on_export_succeeded(self, file_path: str):
+        """导出完成"""
+        QMessageBox.information(
+            self,
+            "导出成功",
+            f"课表已成功导出到：\n{file_path}"
         )
         
-        # 保存当前状态
-        painter.save()
-        
-        # 移动到内容区域并缩放
-        painter.translate(content_rect.topLeft())
-        scale = min(
-            content_rect.width() / self.table.width(),
-            content_rect.height() / self.table.height()
+        # 在访达中显示文件
+        os.system(f'open -R "{file_path}"')
+
+    def on_export_failed(self, message: str):
+        """导出失败"""
+        QMessageBox.critical(
+            self,
+            "导出失败",
+            f"导出课表发生错误：\n{message}"
         )
-        painter.scale(scale, scale)
-        
-        # 只渲染表格部分
-        self.table.render(painter)
-        
-        # 恢复状态
-        painter.restore()
-        painter.end()
 
-    def export_to_image(self, file_path: str):
-        """导出为高清PNG图片"""
-        # 获取表格尺寸
-        table_width = self.table.horizontalHeader().length() + self.table.verticalHeader().width()
-        table_height = self.table.verticalHeader().length() + self.table.horizontalHeader().height()
-        
-        # 设置2倍分辨率
-        scale_factor = 2.0
-        title_height = 60 * scale_factor
-        
-        # 创建高分辨率图片
-        image = QPixmap(int(table_width * scale_factor), int(table_height * scale_factor + title_height))
-        image.fill(Qt.GlobalColor.white)
-        
-        # 创建绘图器
-        painter = QPainter(image)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        
-        # 使用系统默认字体
-        font = QFont()
-        font.setPointSize(int(16 * scale_factor))
-        font.setBold(True)
-        painter.setFont(font)
-        
-        # 绘制标题
-        week_text = "总课表" if self.current_week == 0 else f"第{self.current_week}周课表"
-        title_text = f"课程表 - {week_text}"
-        
-        title_rect = QRect(0, 0, int(table_width * scale_factor), int(title_height))
-        painter.drawText(title_rect, Qt.AlignmentFlag.AlignCenter, title_text)
-        
-        # 绘制表格
-        painter.translate(0, title_height)
-        painter.scale(scale_factor, scale_factor)
-        
-        # 设置裁剪区域以确保不会绘制到边界外
-        painter.setClipRect(0, 0, table_width, table_height)
-        
-        # 渲染表格
-        self.table.render(painter)
-        
-        painter.end()
-        
-        # 保存高质量图片
-        image.save(file_path, "PNG", quality=100)
+    def export_all_weeks(self):
+        """把第1周到最后一周的课表导出为多页PDF或一个PNG图片目录"""
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "导出全部周次", f"课表_全部周次_{current_time}",
+            "PDF文件（每周一页） (*.pdf);;PNG图片（每周一张） (*.png)"
+        )
+        if not file_path:
+            return
+        fmt = "pdf" if selected_filter.startswith("PDF") else "png"
+        output_dir, name = os.path.split(os.path.splitext(file_path)[0])
+        
+        # 由进程池渲染各周，后台线程等待结果
+        thread = BatchExportThread({name: self.course_manager.get_courses()}, output_dir, fmt,
+                                   theme_name=self.theme_manager.current_theme, parent=self)
+        thread.succeeded.connect(lambda result: QMessageBox.information(
+            self, "导出成功", f"{result.summary()}\n位置：{os.path.join(output_dir, name)}"))
+        thread.failed.connect(self.on_export_failed)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def export_to_pdf(self, file_path: str, week: Optional[int] = None):
+        """导出为PDF，week 默认为当前周次"""
+        week = self.current_week if week is None else week
+        TimetableRenderer(self.theme_manager.current_theme).save_pdf(
+            file_path, self.course_manager.get_courses(week or None), week)
+
+    def export_to_image(self, file_path: str, week: Optional[int] = None, scale: float = 2.0):
+        """导出为高清PNG图片，week 默认为当前周次，scale 为放大倍数"""
+        week = self.current_week if week is None else week
+        TimetableRenderer(self.theme_manager.current_theme).save_image(
+            file_path, self.course_manager.get_courses(week or None), week, scale)
 
     def connect_signals(self):
         """连接信号和槽"""
@@ -522,30 +298,19 @@ class MainWindow(QMainWindow):
         self.next_week_btn.clicked.connect(self.next_week)
 
     def on_search(self, text: str):
-        """搜索课程"""
-        # 清空表格
-        for row in range(self.table.rowCount()):
-            for col in range(self.table.columnCount()):
-                widget = self.table.cellWidget(row, col)
-                if widget:
-                    if text.lower() in widget.course.name.lower() or \
-                       text.lower() in widget.course.teacher.lower() or \
-                       text.lower() in widget.course.room.lower() or \
-                       text.lower() in widget.course.description.lower():
-                        widget.setStyleSheet("""
-                            QFrame {
-                                background-color: #e3f2fd;
-                                border: 2px solid #2196f3;
-                                border-radius: 6px;
-                            }
-                        """)
-                    else:
-                        widget.setStyleSheet("""
-                            QFrame {
-                                background-color: #f8f9fa;
-                                border-radius: 6px;
-                            }
-                        """)
+        """搜索框内容变化：清空时立即取消高亮，否则等输入停顿后再搜索"""
+        if text:
+            self.search_timer.start()
+        else:
+            self.apply_search()
+
+    def apply_search(self):
+        """按搜索框内容高亮课程"""
+        self.search_timer.stop()
+        text = self.search_input.text()
+        # 子串之外，再高亮拼音首字母、错别字等模糊命中的课程
+        fuzzy_hits = [course.id for course in self.course_manager.fuzzy_search(text)]
+        self.timetable_model.set_search_text(text, fuzzy_hits)
 
     def on_import_clicked(self):
         """入课表"""
@@ -569,35 +334,29 @@ class MainWindow(QMainWindow):
                     # 旧版本格式（直接的课程列表）
                     courses_data = data
                 
-                # 清空现有课程
-                self.course_manager.clear_courses()
+                # 清空现有课程并在同一事务中导入新课程
+                # 导入后由变更通知整体刷新显示
+                report = self.course_manager.add_courses_bulk(courses_data, replace=True)
                 
-                # 导入新课程
-                for course_data in courses_data:
-                    course = Course(
-                        id=-1,  # 新课程的ID由数据库生成
-                        name=course_data['name'],
-                        room=course_data['room'],
-                        teacher=course_data['teacher'],
-                        weeks=course_data['weeks'],
-                        day_of_week=course_data['day_of_week'],
-                        start_time=datetime.strptime(course_data['start_time'], '%H:%M').time(),
-                        end_time=datetime.strptime(course_data['end_time'], '%H:%M').time(),
-                        description=course_data.get('description', ''),  # 使用get方法处理可选字段
-                        score=course_data.get('score', 0.0),
-                        feedback=course_data.get('feedback', []),
-                        color=course_data.get('color', '#e3f2fd')
+                rejected = report.rejected
+                if rejected:
+                    details = "\n".join(
+                        f"第{row.index + 1}条: {row.reason}" for row in rejected[:10]
+                    )
+                    if len(rejected) > 10:
+                        details += f"\n……等共{len(rejected)}条"
+                    QMessageBox.warning(
+                        self,
+                        "部分导入",
+                        f"成功导入{len(report.accepted)}门课程，"
+                        f"{len(rejected)}条记录未导入：\n\n{details}"
+                    )
+                else:
+                    QMessageBox.information(
+                        self,
+                        "导入成功",
+                        f"课表导入成功！共导入{len(report.accepted)}门课程。"
                     )
-                    self.course_manager.add_course(course)
-                
-                # 导入完成后立即刷新显示
-                self.load_courses()
-                
-                QMessageBox.information(
-                    self,
-                    "导入成功",
-                    "课表导入成功！"
-                )
                 
             except Exception as e:
                 QMessageBox.critical(
@@ -609,13 +368,19 @@ class MainWindow(QMainWindow):
     def on_custom_clicked(self):
         """显示主题设置对话框"""
         dialog = ThemeDialog(self)
-        dialog.theme_changed.connect(self.change_theme)
+        # 等对话框销毁后再切换，否则已关闭的对话框也会随主窗口重新套用一遍样式
+        dialog.theme_changed.connect(
+            lambda theme_name: QTimer.singleShot(0, lambda: self.change_theme(theme_name)))
         dialog.exec()
 
     def change_theme(self, theme_name: str):
         """切换主题"""
+        if theme_name == self.theme_manager.current_theme:
+            return  # 样式没有变化，不必重新套用
         self.theme_manager.set_theme(theme_name)
         self.setStyleSheet(self.theme_manager.get_stylesheet())
+        self.card_delegate.set_palette(self.theme_manager.get_card_palette())
+        self.table.viewport().update()
 
     def on_week_changed(self, index):
         """周次下拉框改变事件"""
@@ -718,7 +483,7 @@ class MainWindow(QMainWindow):
         self.week_combo = QComboBox()
         self.week_combo.setObjectName("weekCombo")
         self.week_combo.addItem("总课表")
-        for i in range(1, 21):
+        for i in range(1, TERM_WEEKS + 1):
             self.week_combo.addItem(f"第{i}周")
         self.week_combo.setCurrentIndex(self.current_week)
         
@@ -736,6 +501,13 @@ class MainWindow(QMainWindow):
         self.search_input.setMinimumWidth(240)
         self.search_input.setMaximumWidth(400)
         self.search_input.textChanged.connect(self.on_search)  # 添加搜索信号连接
+        self.search_input.returnPressed.connect(self.apply_search)  # 回车立即搜索
+        
+        # 搜索防抖：连续输入时只在停顿后搜索一次
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_search)
         
         # 右侧按钮组
         right_buttons = QWidget()
@@ -763,7 +535,6 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(toolbar)
 
         # 课程表
-        self.table = CustomTableWidget()
         self.setup_table()
         main_layout.addWidget(self.table)
 
@@ -782,6 +553,10 @@ class MainWindow(QMainWindow):
         export_action.triggered.connect(self.export_schedule)
         file_menu.addAction(export_action)
         
+        export_all_action = QAction("导出全部周次", self)
+        export_all_action.triggered.connect(self.export_all_weeks)
+        file_menu.addAction(export_all_action)
+        
         # 设置菜单
         settings_menu = menubar.addMenu("设置")
         
@@ -824,6 +599,9 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             dialog.save_settings()
             # 更新提醒设置
+            self.load_reminder_settings()
+            self.reminder_scheduler.set_lead(self.reminder_settings['reminder_time'])
+            self.schedule_next_reminder()
 
     def show_statistics(self):
         """显示统计对话框"""
@@ -832,37 +610,20 @@ class MainWindow(QMainWindow):
 
     def setup_table(self):
         """初始化课程表格"""
-        self.table = CustomTableWidget()
-        self.table.setColumnCount(7)  # 周一到周日
-        self.table.setRowCount(5)     # 5个时间段
-        
-        # 设置表头
-        headers = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-        self.table.setHorizontalHeaderLabels(headers)
-        
-        # 设置左侧时间签
-        time_slots = [
-            "第1-2节\n08:20-09:55",
-            "第3-4节\n10:15-11:50",
-            "第5-6节\n14:00-15:35",
-            "第7-8节\n15:55-17:30",
-            "晚上\n19:00-20:35"
-        ]
-        self.table.setVerticalHeaderLabels(time_slots)
+        self.table = QTableView()
+        self.timetable_model = TimetableModel(self)
+        self.table.setModel(self.timetable_model)
+        # 卡片颜色取自主题编译好的调色板，悬停、选中、搜索命中都不再设置样式表
+        self.card_delegate = CourseCardDelegate(self.theme_manager.get_card_palette(), self.table)
+        self.table.setItemDelegate(self.card_delegate)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         
         # 设置单元格大小
-        for i in range(self.table.rowCount()):
+        for i in range(self.timetable_model.rowCount()):
             self.table.setRowHeight(i, 130)  # 稍微小行高
         
-        # 动态设置列宽，确保显示所有列
-        viewport_width = self.table.viewport().width()
-        header_width = 100  # 垂直表头宽度
-        available_width = viewport_width - header_width
-        column_width = available_width // 7  # 平均分配宽度给7列
-        
-        for i in range(self.table.columnCount()):
-            self.table.setColumnWidth(i, column_width)
-        
         # 设置表头属性
         header = self.table.horizontalHeader()
         header.setDefaultAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -885,32 +646,25 @@ class MainWindow(QMainWindow):
         """)
         
         # 启用双击事件
-        self.table.cellDoubleClicked.connect(self.on_cell_double_clicked)
+        self.table.doubleClicked.connect(self.on_cell_double_clicked)
         
-        # 启用鼠标追踪
+        # 悬停高亮由委托根据 State_MouseOver 绘制
         self.table.setMouseTracking(True)
-        # 使用 cellEntered 信号
-        self.table.cellEntered.connect(self.on_cell_entered)
-        # 创建一个变量来跟踪上一个高亮的单元格
-        self.last_highlighted_cell = None
+        self.table.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover, True)
+        
+        # 课程卡片的右键菜单
+        self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.table.customContextMenuRequested.connect(self.show_course_menu)
 
-    def on_cell_double_clicked(self, row: int, column: int):
+    def on_cell_double_clicked(self, index):
         """处理单元格双击事件"""
-        # 检单元格是否已有课程
-        if self.table.cellWidget(row, column) is not None:
+        # 检查单元格是否已有课程
+        if self.timetable_model.course_at(index) is not None:
             return
         
-        # 获取对应的时间段
-        time_slots = [
-            ("08:20", "09:55"),  # 第1-2节
-            ("10:15", "11:50"),  # 第3-4节
-            ("14:00", "15:35"),  # 第5-6节
-            ("15:55", "17:30"),  # 第7-8节
-            ("19:00", "20:35"),  # 晚上
-        ]
-        
-        if 0 <= row < len(time_slots):
-            start_time, end_time = time_slots[row]
+        row, column = index.row(), index.column()
+        if 0 <= row < len(TIME_SLOTS):
+            _, start_time, end_time = TIME_SLOTS[row]
             day_of_week = column + 1  # 转换为星期几（1-7）
             
             # 打开添加课程对话框并预填充时间信息
@@ -922,45 +676,51 @@ class MainWindow(QMainWindow):
             
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 course = dialog.get_course_data()
-                if self.course_manager.add_course(course):
-                    self.load_courses()
-                else:
+                if not self.course_manager.add_course(course):
                     QMessageBox.warning(
                         self,
                         "添加失败",
                         "课程时间存在冲突，请选择其他时间"
                     )
 
-    def on_cell_entered(self, row: int, column: int):
-        """鼠标进入单元格时的处理"""
-        # 清除上一个高亮的单元格
-        if self.last_highlighted_cell:
-            last_row, last_col = self.last_highlighted_cell
-            if self.table.cellWidget(last_row, last_col) is None:
-                item = self.table.item(last_row, last_col)
-                if item:
-                    item.setBackground(QColor("#ffffff"))
-        
-        # 高亮当前单元格
-        if self.table.cellWidget(row, column) is None:
-            item = self.table.item(row, column)
-            if not item:
-                item = QTableWidgetItem()
-                self.table.setItem(row, column, item)
-            item.setBackground(QColor("#f8f9fa"))
-            self.last_highlighted_cell = (row, column)
+    def show_course_menu(self, pos: QPoint):
+        """课程卡片的右键菜单"""
+        course = self.timetable_model.course_at(self.table.indexAt(pos))
+        if course is None:
+            return
+        
+        menu = QMenu(self)
+        
+        edit_action = QAction("编辑", self)
+        edit_action.triggered.connect(lambda: self.edit_course_dialog(course))
+        menu.addAction(edit_action)
+        
+        feedback_action = QAction("评分反馈", self)
+        feedback_action.triggered.connect(lambda: FeedbackDialog(course, self).exec())
+        menu.addAction(feedback_action)
+        
+        delete_action = QAction("删除", self)
+        delete_action.triggered.connect(lambda: self.confirm_delete_course(course))
+        menu.addAction(delete_action)
+        
+        menu.exec(self.table.viewport().mapToGlobal(pos))
+
+    def edit_course_dialog(self, course: Course):
+        """编辑课程"""
+        dialog = CourseDialog(self, course)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            self.update_course(course.id, dialog.get_course_data())
 
-    def leaveEvent(self, event):
-        """鼠标离开表格时的处理"""
-        # 清除高亮
-        if self.last_highlighted_cell:
-            row, col = self.last_highlighted_cell
-            if self.table.cellWidget(row, col) is None:
-                item = self.table.item(row, col)
-                if item:
-                    item.setBackground(QColor("#ffffff"))
-            self.last_highlighted_cell = None
-        super().leaveEvent(event)
+    def confirm_delete_course(self, course: Course):
+        """确认后删除课程"""
+        reply = QMessageBox.question(
+            self, '确认删除',
+            f'确定要删除课程 "{course.name}" 吗？',
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            self.delete_course(course.id)
 
     def show_sync_dialog(self):
         """显示同步对话框"""
@@ -976,6 +736,14 @@ class MainWindow(QMainWindow):
         """显示课程日历对话框"""
         dialog = CourseCalendarDialog(self.course_manager, self)
         dialog.exec()
+        # 日历中可能修改了开学时间或节假日，按新的日历重新安排提醒
+        self.load_reminder_settings()
+        self.reminder_scheduler.set_term(
+            self.settings_manager.get_term_start().date(),
+            self.settings_manager.get_holiday_dates(),
+            datetime.now()
+        )
+        self.schedule_next_reminder()
 
     def setup_shortcuts(self):
         """设置快捷键"""
@@ -1060,43 +828,10 @@ class MainWindow(QMainWindow):
         """重启应用程序"""
         import sys
         import os
+        self.course_manager.close()
         os.execl(sys.executable, sys.executable, *sys.argv)
 
-# 添加自定义表格类
-class CustomTableWidget(QTableWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.last_highlighted_cell = None
-        self.setMouseTracking(True)
-        self.cellEntered.connect(self.on_cell_entered)
-
-    def on_cell_entered(self, row: int, column: int):
-        """鼠标进入单元格时的处理"""
-        # 清除上一个高亮的单元格
-        if self.last_highlighted_cell:
-            last_row, last_col = self.last_highlighted_cell
-            if self.cellWidget(last_row, last_col) is None:
-                item = self.item(last_row, last_col)
-                if item:
-                    item.setBackground(QColor("#ffffff"))
-        
-        # 高亮当前单元格
-        if self.cellWidget(row, column) is None:
-            item = self.item(row, column)
-            if not item:
-                item = QTableWidgetItem()
-                self.setItem(row, column, item)
-            item.setBackground(QColor("#f8f9fa"))
-            self.last_highlighted_cell = (row, column)
-
-    def leaveEvent(self, event):
-        """鼠标离开表格时的处理"""
-        # 清除高亮
-        if self.last_highlighted_cell:
-            row, col = self.last_highlighted_cell
-            if self.cellWidget(row, col) is None:
-                item = self.item(row, col)
-                if item:
-                    item.setBackground(QColor("#ffffff"))
-            self.last_highlighted_cell = None
-        super().leaveEvent(event)
+    def closeEvent(self, event):
+        """关闭窗口时释放数据库连接"""
+        self.course_manager.close()
+        super().closeEvent(event)
@@ -59,7 +59,7 @@ class ReminderSettings(QDialog):
     def load_settings(self):
         """加载设置"""
         try:
-            with open('settings.json', 'r') as f:
+            with open('settings.json', 'r', encoding='utf-8') as f:
                 settings = json.load(f)
                 self.time_spin.setValue(settings.get('reminder_time', 15))
                 self.sound_combo.setCurrentText(settings.get('sound_type', '默认'))
@@ -67,13 +67,16 @@ class ReminderSettings(QDialog):
             pass
             
     def save_settings(self):
-        """保存设置"""
-        settings = {
-            'reminder_time': self.time_spin.value(),
-            'sound_type': self.sound_combo.currentText()
-        }
-        with open('settings.json', 'w') as f:
-            json.dump(settings, f)
+        """保存设置，保留设置文件中的开学时间、节假日等其他项"""
+        try:
+            with open('settings.json', 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            settings = {}
+        settings['reminder_time'] = self.time_spin.value()
+        settings['sound_type'] = self.sound_combo.currentText()
+        with open('settings.json', 'w', encoding='utf-8') as f:
+            json.dump(settings, f, ensure_ascii=False, indent=4)
             
     def choose_sound_file(self):
         """选择自定义声音文件"""
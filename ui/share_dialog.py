@@ -4,6 +4,7 @@ from PyQt6.QtCore import Qt
 import json
 from datetime import datetime
 import os
+from models.weeks import WeekSet
 
 class ShareDialog(QDialog):
     def __init__(self, course_manager, parent=None):
@@ -81,25 +82,12 @@ class ShareDialog(QDialog):
     
     def get_current_week_courses(self, week: int) -> list:
         """获取当前周的课程"""
-        return [course for course in self.course_manager.get_courses()
-                if week in self._parse_weeks(course.weeks)]
+        return self.course_manager.get_courses(week) if week else []
     
     def get_weeks_courses(self, weeks: list) -> list:
         """获取指定周次的课程"""
-        return [course for course in self.course_manager.get_courses()
-                if any(week in self._parse_weeks(course.weeks) for week in weeks)]
-    
-    def _parse_weeks(self, weeks_str: str) -> list:
-        """解析周次字符串"""
-        result = []
-        weeks_str = weeks_str.replace('周', '')
-        for part in weeks_str.split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                result.extend(range(start, end + 1))
-            else:
-                result.append(int(part))
-        return result
+        mask = WeekSet.from_weeks(weeks).mask
+        return self.course_manager.columns().courses(weeks_mask=mask)
     
     def select_weeks(self) -> list:
         """选择周次对话框"""
@@ -111,15 +99,8 @@ class ShareDialog(QDialog):
         )
         if ok and text:
             try:
-                weeks = []
-                for part in text.split(','):
-                    if '-' in part:
-                        start, end = map(int, part.split('-'))
-                        weeks.extend(range(start, end + 1))
-                    else:
-                        weeks.append(int(part))
-                return sorted(set(weeks))  # 去重并排序
-            except:
+                return WeekSet.parse(text).to_list()  # 已去重并排序
+            except ValueError:
                 QMessageBox.warning(self, "输入错误", "请输入正确的周次格式！")
         return []
     
@@ -1,7 +1,6 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QTabWidget, QWidget,
                             QTableWidget, QTableWidgetItem, QLabel, QHeaderView)
 from PyQt6.QtCore import Qt
-from collections import Counter
 
 class StatisticsDialog(QDialog):
     def __init__(self, course_manager, parent=None):
@@ -21,15 +20,15 @@ class StatisticsDialog(QDialog):
         # 基本统计
         basic_tab = QWidget()
         basic_layout = QVBoxLayout(basic_tab)
-        courses = self.course_manager.get_courses()
+        columns = self.course_manager.columns()
         
         # 总课程数
-        total_label = QLabel(f"总课程数：{len(courses)}门")
+        total_label = QLabel(f"总课程数：{len(columns)}门")
         total_label.setStyleSheet("font-size: 14px; font-weight: bold; margin: 10px 0;")
         basic_layout.addWidget(total_label)
         
         # 每天课程数统计
-        daily_stats = Counter(course.day_of_week for course in courses)
+        daily_stats = columns.count_by("day")
         days = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
         daily_text = "每天课程数：\n"
         for i, day in enumerate(days, 1):
@@ -44,22 +43,14 @@ class StatisticsDialog(QDialog):
         course_table.setHorizontalHeaderLabels(["课程名称", "上课次数", "任课教师"])
         
         # 统计课程信息
-        course_stats = {}
-        for course in courses:
-            if course.name not in course_stats:
-                course_stats[course.name] = {
-                    'count': 1,
-                    'teachers': {course.teacher}
-                }
-            else:
-                course_stats[course.name]['count'] += 1
-                course_stats[course.name]['teachers'].add(course.teacher)
-        
-        course_table.setRowCount(len(course_stats))
-        for i, (name, info) in enumerate(sorted(course_stats.items())):
+        name_counts = columns.count_by("name")
+        name_teachers = columns.group_by("name", "teacher")
+        
+        course_table.setRowCount(len(name_counts))
+        for i, name in enumerate(sorted(name_counts)):
             course_table.setItem(i, 0, QTableWidgetItem(name))
-            course_table.setItem(i, 1, QTableWidgetItem(str(info['count'])))
-            course_table.setItem(i, 2, QTableWidgetItem(', '.join(info['teachers'])))
+            course_table.setItem(i, 1, QTableWidgetItem(str(name_counts[name])))
+            course_table.setItem(i, 2, QTableWidgetItem(', '.join(name_teachers[name])))
         
         # 设置表格样式
         course_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
@@ -82,7 +73,7 @@ class StatisticsDialog(QDialog):
         # 教师统计
         teacher_tab = QWidget()
         teacher_layout = QVBoxLayout(teacher_tab)
-        teacher_stats = Counter(course.teacher for course in courses)
+        teacher_stats = columns.count_by("teacher")
         
         teacher_table = QTableWidget()
         teacher_table.setColumnCount(2)
@@ -100,7 +91,7 @@ class StatisticsDialog(QDialog):
         # 教室统计
         room_tab = QWidget()
         room_layout = QVBoxLayout(room_tab)
-        room_stats = Counter(course.room for course in courses)
+        room_stats = columns.count_by("room")
         
         room_table = QTableWidget()
         room_table.setColumnCount(2)
@@ -54,8 +54,7 @@ class SyncDialog(QDialog):
                 # 获取主窗口的当前周次
                 main_window = self.parent()
                 current_week = main_window.current_week if hasattr(main_window, 'current_week') else 1
-                courses = [c for c in self.course_manager.get_courses() 
-                          if current_week in self._parse_weeks(c.weeks)]
+                courses = self.course_manager.columns().courses(week=current_week) if current_week else []
             else:
                 courses = self.course_manager.get_courses()
             
@@ -77,18 +76,6 @@ class SyncDialog(QDialog):
         finally:
             self.progress.hide()
     
-    def _parse_weeks(self, weeks_str: str) -> list:
-        """解析周次字符串"""
-        result = []
-        weeks_str = weeks_str.replace('周', '')
-        for part in weeks_str.split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                result.extend(range(start, end + 1))
-            else:
-                result.append(int(part))
-        return sorted(set(result))  # 去重并排序
-    
     def sync_all_courses(self):
         """同步所有课程"""
         self.sync_courses(current_week_only=False)
@@ -128,7 +115,7 @@ class SyncDialog(QDialog):
             # 添加每个课程
             for course in courses:
                 # 解析周次
-                weeks = self._parse_weeks(course.weeks)
+                weeks = course.week_set
                 
                 # 获取上课时间
                 start_time = datetime.strptime(course.start_time.strftime('%H:%M'), '%H:%M')
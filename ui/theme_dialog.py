@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-                            QLabel, QFrame, QWidget, QApplication)
+                            QLabel, QFrame, QWidget)
 from PyQt6.QtCore import pyqtSignal, Qt, QTimer, QEvent
 from utils.theme_manager import ThemeManager
 
@@ -155,54 +155,11 @@ class ThemeDialog(QDialog):
         name_layout.addStretch()
         layout.addWidget(name_container)
         
-        # 颜色预览
-        colors_container = QWidget()
-        colors_layout = QHBoxLayout(colors_container)
-        colors_layout.setSpacing(8)
-        colors_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # 添加颜色预览
-        for color_name, color in [
-            ("主色调", theme['primary']),
-            ("强调色", theme['accent'])
-        ]:
-            color_widget = QWidget()
-            color_layout = QVBoxLayout(color_widget)
-            color_layout.setSpacing(4)
-            color_layout.setContentsMargins(0, 0, 0, 0)
-            
-            color_preview = QFrame()
-            color_preview.setFixedSize(32, 32)
-            color_preview.setStyleSheet(f"""
-                background-color: {color};
-                border-radius: 4px;
-                border: 1px solid {theme['border']};
-            """)
-            
-            color_label = QLabel(color_name)
-            color_label.setStyleSheet(f"""
-                color: {theme['text_secondary']};
-                font-size: 12px;
-            """)
-            color_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            color_layout.addWidget(color_preview, alignment=Qt.AlignmentFlag.AlignCenter)
-            color_layout.addWidget(color_label, alignment=Qt.AlignmentFlag.AlignCenter)
-            colors_layout.addWidget(color_widget)
-        
-        layout.addWidget(colors_container)
-        
-        # 预览文本
-        preview_text = QLabel("预览文本")
-        preview_text.setStyleSheet(f"""
-            color: {theme['text']};
-            font-size: 13px;
-            padding: 8px;
-            background: {theme['surface']};
-            border-radius: 4px;
-        """)
-        preview_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(preview_text)
+        # 色块和预览文本绘制在缓存的预览图中，不再为每个主题创建一组带样式表的控件
+        preview = QLabel()
+        preview.setPixmap(self.theme_manager.get_preview_pixmap(theme_name))
+        preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(preview)
         
         # 应用按钮
         apply_btn = QPushButton("应用主题")
@@ -227,8 +184,8 @@ class ThemeDialog(QDialog):
     
     def apply_theme(self, theme_name: str):
         """应用主题"""
-        self.theme_changed.emit(theme_name)
         self.close()
+        self.theme_changed.emit(theme_name)
     
     def closeEvent(self, event):
         """关闭事件处理"""
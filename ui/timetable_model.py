@@ -0,0 +1,314 @@
+from bisect import insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QRectF
+from PyQt6.QtGui import QFont, QFontMetrics, QPainter
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from models.course import Course, parse_minutes
+from models.course_manager import CourseChange
+from models.text_index import CourseTextIndex
+from models.weeks import week_bit
+from utils.theme_manager import CardPalette, CardState
+
+# 时间段 (表头文字, 开始, 结束)
+TIME_SLOTS = [
+    ("第1-2节", "08:20", "09:55"),
+    ("第3-4节", "10:15", "11:50"),
+    ("第5-6节", "14:00", "15:35"),
+    ("第7-8节", "15:55", "17:30"),
+    ("晚上", "19:00", "20:35"),
+]
+WEEKDAY_HEADERS = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
+TERM_WEEKS = 20  # 一学期的周数
+
+_SLOT_MINUTES = [(parse_minutes(start), parse_minutes(end)) for _, start, end in TIME_SLOTS]
+
+# 自定义数据角色
+CourseRole = Qt.ItemDataRole.UserRole + 1        # 单元格中的 Course 对象
+HighlightRole = Qt.ItemDataRole.UserRole + 2     # 是否命中搜索
+ConflictRole = Qt.ItemDataRole.UserRole + 3      # 单元格内是否有时间冲突的课程
+
+
+def time_slot_index(minutes: int) -> Optional[int]:
+    """根据开始时间（分钟）获取对应时间段索引"""
+    for i, (start, end) in enumerate(_SLOT_MINUTES):
+        if start <= minutes <= end:
+            return i
+    return None
+
+
+def course_cell(course: Course, week: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """课程在课程表中的单元格 (行, 列)；不在 week 周上课或不在任何时间段内时返回None"""
+    if week and not course.week_mask & week_bit(week):
+        return None
+    row = time_slot_index(course.start_min)
+    if row is None or not 1 <= course.day_of_week <= len(WEEKDAY_HEADERS):
+        return None
+    return row, course.day_of_week - 1
+
+
+def course_tooltip(course: Course) -> str:
+    """课程卡片的详细工具提示"""
+    return (
+        f"<html>"
+        f"<h3>{course.name}</h3>"
+        f"<p><b>教室：</b>{course.room}</p>"
+        f"<p><b>教师：</b>{course.teacher}</p>"
+        f"<p><b>时间：</b>{course.start_time.strftime('%H:%M')}-{course.end_time.strftime('%H:%M')}</p>"
+        f"<p><b>周次：</b>{course.weeks}</p>"
+        f"<p><b>描述：</b>{course.description}</p>"
+        f"</html>"
+    )
+
+
+class TimetableModel(QAbstractTableModel):
+    """课程表模型：行为时间段，列为星期
+
+    同一单元格有多门课程时显示ID最大的一门，与原先按ID顺序逐格放置卡片的效果一致；
+    其余课程仍保留在单元格列表中，删除或移走显示的课程后露出下一门。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._week: Optional[int] = None
+        self._cells: Dict[Tuple[int, int], List[Course]] = {}  # 单元格 -> 按ID排序的课程
+        self._positions: Dict[int, Tuple[int, int]] = {}       # 课程ID -> 单元格
+        self._text_index = CourseTextIndex()  # 单元格中课程的规范化文本
+        self._search_text = ""
+        self._extra_hits: Set[int] = set()  # 额外命中的课程ID（模糊搜索结果）
+        self._matched: set = set()  # 命中搜索的单元格
+        self._conflicts: set = set()  # 课程时间互相冲突的单元格
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(TIME_SLOTS)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(WEEKDAY_HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        course = self._visible((index.row(), index.column()))
+        if course is None:
+            return None
+        if role == CourseRole:
+            return course
+        if role == Qt.ItemDataRole.DisplayRole:
+            return course.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            # 悬停时才生成，加载课表时不构造HTML
+            return course_tooltip(course)
+        if role == HighlightRole:
+            return (index.row(), index.column()) in self._matched
+        if role == ConflictRole:
+            return (index.row(), index.column()) in self._conflicts
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return WEEKDAY_HEADERS[section]
+        label, start, end = TIME_SLOTS[section]
+        return f"{label}\n{start}-{end}"
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def set_courses(self, courses: Iterable[Course], week: Optional[int] = None):
+        """整体替换课程，week 为当前周次（空或0表示总课表）"""
+        self.beginResetModel()
+        self._week = week or None
+        self._cells = {}
+        self._positions = {}
+        placed = [course for course in sorted(courses, key=lambda c: c.id)
+                  if self._place(course, index_text=False) is not None]
+        self._text_index = CourseTextIndex.build(placed)
+        self._matched = self._match(self._search_text)
+        self._conflicts = {cell for cell, courses in self._cells.items()
+                           if self._has_conflict(courses)}
+        self.endResetModel()
+
+    def apply_change(self, change: CourseChange) -> bool:
+        """把单门课程的变更应用到受影响的单元格，返回False表示需要整体重新加载"""
+        if change.kind == "added":
+            self._refresh(self._place(change.course))
+        elif change.kind == "updated":
+            old_cell = self._take(change.course_id)
+            new_cell = self._place(change.course)
+            self._refresh(old_cell)
+            if new_cell != old_cell:
+                self._refresh(new_cell)
+        elif change.kind == "removed":
+            self._refresh(self._take(change.course_id))
+        else:
+            return False
+        return True
+
+    def _place(self, course: Course, index_text: bool = True) -> Optional[Tuple[int, int]]:
+        """按周次和时间段放入单元格，不显示时返回None"""
+        cell = course_cell(course, self._week)
+        if cell is None:
+            return None
+        insort(self._cells.setdefault(cell, []), course, key=lambda c: c.id)
+        self._positions[course.id] = cell
+        if index_text:
+            self._text_index.add(course)
+        return cell
+
+    def _take(self, course_id: int) -> Optional[Tuple[int, int]]:
+        """从单元格中移除课程，返回其原来所在的单元格"""
+        cell = self._positions.pop(course_id, None)
+        if cell is None:
+            return None
+        self._text_index.remove(course_id)
+        courses = self._cells[cell]
+        courses[:] = [c for c in courses if c.id != course_id]
+        if not courses:
+            del self._cells[cell]
+        return cell
+
+    def _refresh(self, cell: Optional[Tuple[int, int]]):
+        """重新计算单元格的搜索命中、冲突状态并通知视图重绘"""
+        if cell is None:
+            return
+        if self._has_conflict(self._cells.get(cell, ())):
+            self._conflicts.add(cell)
+        else:
+            self._conflicts.discard(cell)
+        course = self._visible(cell)
+        if course is not None and (course.id in self._extra_hits
+                                   or self._text_index.matches(course.id, self._search_text)):
+            self._matched.add(cell)
+        else:
+            self._matched.discard(cell)
+        index = self.index(*cell)
+        self.dataChanged.emit(index, index)
+
+    @staticmethod
+    def _has_conflict(courses: List[Course]) -> bool:
+        # 单元格内课程很少，两两比较即可
+        return any(a.conflicts_with(b) for i, a in enumerate(courses) for b in courses[i + 1:])
+
+    def _visible(self, cell: Tuple[int, int]) -> Optional[Course]:
+        courses = self._cells.get(cell)
+        return courses[-1] if courses else None
+
+    def course_at(self, index: QModelIndex) -> Optional[Course]:
+        """单元格中显示的课程，空单元格返回None"""
+        if not index.isValid():
+            return None
+        return self._visible((index.row(), index.column()))
+
+    def courses(self) -> List[Course]:
+        """当前显示的课程"""
+        return [courses[-1] for courses in self._cells.values()]
+
+    def set_search_text(self, text: str, extra_hits: Iterable[int] = ()):
+        """高亮名称、教师、教室或描述包含全部搜索词的课程，空字符串取消高亮
+
+        extra_hits 为另外需要高亮的课程ID（如模糊搜索的结果）。只重绘命中状态变化的单元格。
+        """
+        self._search_text = text
+        self._extra_hits = set(extra_hits)
+        matched = self._match(text)
+        changed = matched ^ self._matched
+        self._matched = matched
+        for row, col in changed:
+            index = self.index(row, col)
+            self.dataChanged.emit(index, index, [HighlightRole])
+
+    def _match(self, text: str) -> set:
+        hits = self._text_index.search(text) | self._extra_hits
+        if not hits:
+            return set()
+        return {cell for cell, courses in self._cells.items() if courses[-1].id in hits}
+
+
+class CardPainter:
+    """绘制单张课程卡片，表格委托和离屏渲染共用"""
+
+    MARGIN = 4          # 卡片与单元格边缘的距离
+    PADDING = 8         # 卡片内边距
+    SPACING = 4         # 行间距
+
+    def __init__(self, palette: CardPalette):
+        self.palette = palette
+        self.name_font = QFont()
+        self.name_font.setPixelSize(12)
+        self.name_font.setWeight(QFont.Weight.Medium)
+        self.info_font = QFont()
+        self.info_font.setPixelSize(11)
+
+    def paint(self, painter: QPainter, cell: QRect, course: Course, state: CardState):
+        """在单元格 cell 内绘制课程卡片"""
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        card = QRectF(cell).adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        painter.setPen(state.border)
+        painter.setBrush(state.background)
+        painter.drawRoundedRect(card.adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+
+        self._paint_text(painter, card.toRect().adjusted(
+            self.PADDING, self.PADDING, -self.PADDING, -self.PADDING), course)
+        painter.restore()
+
+    def _paint_text(self, painter: QPainter, rect: QRect, course: Course):
+        # 课程名称可换行，其余信息单行省略
+        painter.setFont(self.name_font)
+        painter.setPen(self.palette.name_color)
+        flags = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+        used = painter.drawText(rect, flags | Qt.TextFlag.TextWordWrap, course.name)
+        top = used.bottom() + self.SPACING
+
+        lines = []
+        if course.room:
+            lines.append(f"📍 {course.room}")
+        if course.teacher:
+            lines.append(f"👤 {course.teacher}")
+        lines.append(f"🗓️ {course.weeks}")
+
+        painter.setFont(self.info_font)
+        painter.setPen(self.palette.info_color)
+        metrics = QFontMetrics(self.info_font)
+        for line in lines:
+            if top + metrics.height() > rect.bottom() + 1:
+                break
+            text = metrics.elidedText(line, Qt.TextElideMode.ElideRight, rect.width())
+            painter.drawText(QRect(rect.left(), top, rect.width(), metrics.height()), flags, text)
+            top += metrics.height() + self.SPACING
+
+
+class CourseCardDelegate(QStyledItemDelegate):
+    """直接绘制课程卡片，不为每门课程创建控件"""
+
+    def __init__(self, palette: CardPalette, parent=None):
+        super().__init__(parent)
+        self.palette = palette
+        self.card_painter = CardPainter(palette)
+
+    def set_palette(self, palette: CardPalette):
+        """切换主题时替换调色板，由视图重绘生效"""
+        self.palette = palette
+        self.card_painter.palette = palette
+
+    def card_state(self, option: QStyleOptionViewItem, index: QModelIndex) -> CardState:
+        """按 搜索命中 > 冲突 > 选中 > 悬停 的优先级选择卡片状态"""
+        palette = self.palette
+        if index.data(HighlightRole):
+            return palette.match
+        if index.data(ConflictRole):
+            return palette.conflict
+        if option.state & QStyle.StateFlag.State_Selected:
+            return palette.selected
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            return palette.hover
+        return palette.normal
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        course = index.data(CourseRole)
+        if course is None:
+            if option.state & (QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_Selected):
+                painter.fillRect(option.rect, self.palette.empty_hover)
+            return
+        self.card_painter.paint(painter, option.rect, course, self.card_state(option, index))
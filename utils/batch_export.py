@@ -0,0 +1,177 @@
+"""批量导出课程表
+
+把多份课程表的各个周次分给进程池渲染：导出 PDF 时每份课程表一个任务，各周依次成为
+同一文件的一页；导出 PNG 时每份课程表的每一周一个任务，写入以课程表命名的目录。
+工作进程以 spawn 方式启动并使用 offscreen 平台，各自创建一个 QGuiApplication。
+
+命令行：python -m utils.batch_export 课表1.db [课表2.db ...] -o 输出目录
+        [--format pdf|png] [--weeks 1-20] [--workers N] [--theme 主题名]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QGuiApplication, QPainter
+
+from models.course import Course
+from models.course_manager import CourseManager
+from models.weeks import WeekSet, parse_week_mask, week_bit
+from ui.timetable_model import TERM_WEEKS
+from utils.timetable_renderer import TimetableRenderer
+
+_app = None  # 工作进程中的 QGuiApplication
+
+
+@dataclass
+class BatchResult:
+    """批量导出的结果统计"""
+    files: List[str]
+    pages: int
+    seconds: float
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (f"导出 {len(self.files)} 个文件、{self.pages} 页，"
+                f"用时 {self.seconds:.1f} 秒（{self.pages_per_second:.1f} 页/秒）")
+
+
+def _init_worker():
+    global _app
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    _app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def _export_pdf(file_path: str, courses: List[Course], weeks: Sequence[int],
+                theme_name: Optional[str]) -> int:
+    """把多个周次写入同一个PDF，每周一页，返回页数"""
+    renderer = TimetableRenderer(theme_name)
+    writer = renderer.new_pdf_writer(file_path)
+    writer.setTitle(os.path.splitext(os.path.basename(file_path))[0])
+    painter = QPainter()
+    if not painter.begin(writer):
+        raise OSError(f"无法写入PDF：{file_path}")
+    for i, week in enumerate(weeks):
+        if i:
+            writer.newPage()
+        renderer.paint_page(painter, writer, courses, week)
+    painter.end()
+    return len(weeks)
+
+
+def _export_png(file_path: str, courses: List[Course], week: int,
+                theme_name: Optional[str], scale: float) -> int:
+    TimetableRenderer(theme_name).save_image(file_path, courses, week, scale)
+    return 1
+
+
+def _jobs(timetables: Dict[str, List[Course]], output_dir: str, fmt: str,
+          weeks: Sequence[int], theme_name: Optional[str], scale: float) -> List[Tuple]:
+    """(函数, 输出文件, 参数...) 列表；每份课程表只传给工作进程本周次用得到的课程"""
+    jobs = []
+    for name, courses in timetables.items():
+        if fmt == "pdf":
+            mask = 0
+            for week in weeks:
+                mask |= week_bit(week)
+            used = [course for course in courses if course.week_mask & mask]
+            jobs.append((_export_pdf, os.path.join(output_dir, f"{name}.pdf"),
+                         used, list(weeks), theme_name))
+        else:
+            folder = os.path.join(output_dir, name)
+            os.makedirs(folder, exist_ok=True)
+            for week in weeks:
+                used = [course for course in courses if course.week_mask & week_bit(week)]
+                jobs.append((_export_png, os.path.join(folder, f"第{week:02d}周.png"),
+                             used, week, theme_name, scale))
+    return jobs
+
+
+def batch_export(timetables: Dict[str, List[Course]], output_dir: str, fmt: str = "pdf",
+                 weeks: Sequence[int] = None, workers: Optional[int] = None,
+                 theme_name: str = None, scale: float = 2.0) -> BatchResult:
+    """导出多份课程表的多个周次
+
+    timetables 为 {课程表名: 课程列表}；weeks 默认为整学期；scale 为PNG的放大倍数，
+    大尺寸图片自动分块渲染。workers 为 1 时在当前进程中
+    依次导出（当前进程需已创建 QGuiApplication），否则使用进程池，默认进程数为CPU核数。
+    """
+    if fmt not in ("pdf", "png"):
+        raise ValueError(f"不支持的导出格式：{fmt}")
+    weeks = list(weeks or range(1, TERM_WEEKS + 1))
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = _jobs(timetables, output_dir, fmt, weeks, theme_name, scale)
+
+    start = time.perf_counter()
+    if workers == 1:
+        pages = [func(*args) for func, *args in jobs]
+    else:
+        context = multiprocessing.get_context("spawn")  # Qt 进程不能安全地 fork
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+            futures = [pool.submit(func, *args) for func, *args in jobs]
+            pages = [future.result() for future in futures]
+    files = [args[0] for _, *args in jobs]
+    return BatchResult(files, sum(pages), time.perf_counter() - start)
+
+
+class BatchExportThread(QThread):
+    """在后台线程中等待进程池完成批量导出，界面保持响应"""
+    succeeded = pyqtSignal(object)  # BatchResult
+    failed = pyqtSignal(str)        # 错误信息
+
+    def __init__(self, timetables: Dict[str, List[Course]], output_dir: str, fmt: str,
+                 weeks: Sequence[int] = None, theme_name: str = None, parent=None):
+        super().__init__(parent)
+        self.timetables = timetables
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.weeks = weeks
+        self.theme_name = theme_name
+
+    def run(self):
+        try:
+            result = batch_export(self.timetables, self.output_dir, self.fmt, self.weeks,
+                                  theme_name=self.theme_name)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.succeeded.emit(result)
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description="批量导出课程表")
+    parser.add_argument("databases", nargs="+", help="课程数据库文件")
+    parser.add_argument("-o", "--output", required=True, help="输出目录")
+    parser.add_argument("--format", choices=("pdf", "png"), default="pdf")
+    parser.add_argument("--weeks", default=f"1-{TERM_WEEKS}", help="周次，如 1-16 或 1,3,5")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认CPU核数")
+    parser.add_argument("--theme", default=None, help="主题名")
+    parser.add_argument("--scale", type=float, default=2.0, help="PNG的放大倍数")
+    args = parser.parse_args(argv)
+
+    timetables = {}
+    for path in args.databases:
+        manager = CourseManager(path)
+        timetables[os.path.splitext(os.path.basename(path))[0]] = manager.get_courses()
+        manager.close()
+
+    # workers 为 1 时在本进程中绘制
+    app = QGuiApplication.instance() or QGuiApplication([])  # noqa: F841
+    weeks = WeekSet(parse_week_mask(args.weeks)).to_list()
+    result = batch_export(timetables, args.output, args.format, weeks, args.workers, args.theme,
+                          args.scale)
+    print(result.summary())
+    return result
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    main(sys.argv[1:])
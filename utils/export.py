@@ -1,57 +1,231 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+import os
 from datetime import datetime
-from typing import List
-from models import Course
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-def export_to_pdf(courses: List[Course], filename: str):
-    doc = SimpleDocTemplate(filename, pagesize=A4)
-    elements = []
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
 
-    # 创建表格数据
-    data = [['时间', '星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日']]
-    
-    # 初始化时间表
-    time_slots = {}
-    for hour in range(8, 20):  # 8:00 - 19:00
-        for course in courses:
-            if course.start_time.hour <= hour < course.end_time.hour:
-                if hour not in time_slots:
-                    time_slots[hour] = [f"{hour}:00"] + [""] * 7
-                time_slots[hour][course.weekday + 1] = f"{course.name}\n{course.teacher}\n{course.location}"
-
-    # 填充数据
-    for hour in range(8, 20):
-        if hour in time_slots:
-            data.append(time_slots[hour])
-        else:
-            data.append([f"{hour}:00"] + [""] * 7)
+from models.course import Course, format_minutes, parse_minutes
+from models.weeks import week_bit
+from ui.timetable_model import TIME_SLOTS
 
-    # 创建表格
-    table = Table(data)
-    
-    # 设置表格样式
-    style = TableStyle([
+# 常见系统中的中文 TrueType 字体 (路径, TTC中的序号)。reportlab 不支持 CFF 轮廓，
+# 思源黑体、Noto Sans CJK 等 OTF 字体不能使用
+CJK_FONT_CANDIDATES = [
+    ("/System/Library/Fonts/STHeiti Medium.ttc", 0),               # macOS
+    ("/System/Library/Fonts/Hiragino Sans GB.ttc", 0),
+    ("C:/Windows/Fonts/msyh.ttc", 0),                              # Windows 微软雅黑
+    ("C:/Windows/Fonts/simhei.ttf", 0),
+    ("C:/Windows/Fonts/simsun.ttc", 0),
+    ("/usr/share/fonts/truetype/wqy/wqy-microhei.ttc", 0),         # Linux 文泉驿
+    ("/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc", 0),
+    ("/usr/share/fonts/truetype/arphic/uming.ttc", 0),
+]
+CJK_FONT_ENV = "TIMETABLE_PDF_FONT"  # 指定字体文件的环境变量
+CID_FALLBACK_FONT = "STSong-Light"   # 找不到 TrueType 字体时使用的 CID 字体
+
+PAGE_SIZE = landscape(A4)
+PAGE_MARGIN = 10 * mm
+HEADERS = ['时间', '星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日']
+
+
+@lru_cache(maxsize=None)
+def register_cjk_font(font_path: Optional[str] = None) -> str:
+    """注册中文字体并返回字体名，同一进程中每个字体文件只解析一次
+
+    TrueType 字体只嵌入文档中用到的字形子集（reportlab 的默认做法）；无法解析的字体文件
+    跳过，找不到可用的 TrueType 字体时退回不嵌入字形的 CID 字体，由PDF阅读器提供字形，
+    文件最小。
+    """
+    if font_path:
+        if not os.path.exists(font_path):
+            raise FileNotFoundError(f"字体文件不存在：{font_path}")
+        candidates = [(font_path, 0)]
+    else:
+        candidates = [(os.environ.get(CJK_FONT_ENV), 0)] + CJK_FONT_CANDIDATES
+    for path, index in candidates:
+        if path and os.path.exists(path):
+            name = f"{os.path.splitext(os.path.basename(path))[0]}-{index}"
+            try:
+                font = TTFont(name, path, subfontIndex=index)
+            except (TTFError, OSError):
+                continue  # 文件损坏或格式不支持，尝试下一个
+            pdfmetrics.registerFont(font)
+            return name
+    pdfmetrics.registerFont(UnicodeCIDFont(CID_FALLBACK_FONT))
+    return CID_FALLBACK_FONT
+
+
+@lru_cache(maxsize=None)
+def _table_style(font_name: str) -> TableStyle:
+    # 样式只依赖字体，所有文档共用同一个对象
+    return TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 0), (-1, -1), font_name),
         ('FONTSIZE', (0, 0), (-1, 0), 14),
         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
         ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
         ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
         ('FONTSIZE', (0, 1), (-1, -1), 10),
         ('GRID', (0, 0), (-1, -1), 1, colors.black),
         ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('WORDWRAP', (0, 0), (-1, -1), True),
     ])
-    table.setStyle(style)
+
+
+@lru_cache(maxsize=None)
+def _title_style(font_name: str) -> ParagraphStyle:
+    return ParagraphStyle('timetable-title', fontName=font_name, fontSize=18,
+                          leading=24, alignment=1, spaceAfter=6 * mm)
+
+
+Segment = Tuple[int, int, Optional[str]]  # (开始分钟, 结束分钟, 节次名；课间等空档为None)
+
+
+@lru_cache(maxsize=None)
+def _segments() -> Tuple[List[Segment], bytes]:
+    """按时间段边界把一天切成若干段，并预先算出每一分钟所在的段"""
+    segments = []
+    previous = 0
+    for label, start, end in TIME_SLOTS:
+        start, end = parse_minutes(start), parse_minutes(end)
+        if start > previous:
+            segments.append((previous, start, None))
+        segments.append((start, end, label))
+        previous = end
+    if previous < 24 * 60:
+        segments.append((previous, 24 * 60, None))
+    minute_segment = bytearray(24 * 60)
+    for i, (start, end, _) in enumerate(segments):
+        minute_segment[start:end] = bytes([i]) * (end - start)
+    return segments, bytes(minute_segment)
+
+
+def _row_label(segment: Segment) -> str:
+    start, end, label = segment
+    times = f"{format_minutes(start)}-{format_minutes(end)}"
+    return f"{label}\n{times}" if label else times
+
+
+def _cell_text(course: Course) -> str:
+    return f"{course.name}\n{course.teacher}\n{course.room}"
+
+
+def build_week_grid(courses: List[Course], week: Optional[int] = None
+                    ) -> Tuple[List[List[str]], List[tuple]]:
+    """按预先计算的时间段索引构造表格各行（不含表头）及合并单元格的 SPAN 命令
+
+    行为各个时间段，只有课程完全落在课间等空档中时才为该空档加一行。每门课程按
+    开始、结束时间直接查出覆盖的行；同一天中时间互相重叠的课程归为一组，合并为
+    一个跨行单元格并依次列出，不会互相覆盖。耗时与课程数成正比。
+    """
+    segments, minute_segment = _segments()
+    mask = week_bit(week) if week else 0
+    last_minute = 24 * 60 - 1
+
+    placed = []          # (列, 首段, 末段, 课程)
+    used_gaps = set()
+    for course in courses:
+        if mask and not course.week_mask & mask:
+            continue
+        if not 1 <= course.day_of_week <= 7:
+            continue
+        first = minute_segment[min(course.start_min, last_minute)]
+        last = minute_segment[min(max(course.end_min - 1, course.start_min), last_minute)]
+        slots = [i for i in range(first, last + 1) if segments[i][2] is not None]
+        if slots:
+            first, last = slots[0], slots[-1]
+        else:
+            used_gaps.update(range(first, last + 1))
+        placed.append((course.day_of_week, first, last, course))
+
+    kept = [i for i, segment in enumerate(segments) if segment[2] is not None or i in used_gaps]
+    row_of = {segment: row for row, segment in enumerate(kept, start=1)}  # 第0行是表头
+    rows = [[_row_label(segments[i])] + [""] * 7 for i in kept]
+
+    # 按 (列, 首行) 分桶，再自上而下把重叠的课程归组
+    starts = [[[] for _ in kept] for _ in range(7)]
+    for day, first, last, course in placed:
+        starts[day - 1][row_of[first] - 1].append((row_of[last], course))
+
+    spans = []
+    for col, column in enumerate(starts, start=1):
+        group, top, bottom = [], 0, 0
+        for row, starting in enumerate(column, start=1):
+            if not starting:
+                continue
+            if group and row > bottom:
+                spans.extend(_fill(rows, col, group, top, bottom))
+                group = []
+            if not group:
+                top = bottom = row
+            for last, course in starting:
+                group.append(course)
+                bottom = max(bottom, last)
+        if group:
+            spans.extend(_fill(rows, col, group, top, bottom))
+    return rows, spans
+
+
+def _fill(rows: List[List[str]], col: int, group: List[Course], top: int, bottom: int):
+    # 一组重叠的课程按开始时间依次写入首行，跨多行时返回 SPAN 命令
+    group.sort(key=lambda c: (c.start_min, c.id))
+    rows[top - 1][col] = "\n\n".join(_cell_text(course) for course in group)
+    if bottom > top:
+        yield ('SPAN', (col, top), (col, bottom))
+
+
+def _column_widths() -> List[float]:
+    width = PAGE_SIZE[0] - 2 * PAGE_MARGIN
+    time_width = 22 * mm
+    return [time_width] + [(width - time_width) / 7] * 7
+
+
+def export_to_pdf(courses: List[Course], filename: str, title: str = "课程表",
+                  font_path: Optional[str] = None, week: Optional[int] = None):
+    """导出为矢量PDF，文字使用中文字体；week 为空时导出全部课程"""
+    font_name = register_cjk_font(font_path)
+    doc = SimpleDocTemplate(filename, pagesize=PAGE_SIZE, title=title,
+                            leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN,
+                            topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN)
+    elements = [Paragraph(title, _title_style(font_name))]
+
+    # 创建表格数据
+    data = [list(HEADERS)]
+    
+    grid, spans = build_week_grid(courses, week)
+    data.extend(grid)
+
+    # 创建表格
+    table = Table(data, colWidths=_column_widths())
+    table.setStyle(_table_style(font_name))
+    if spans:
+        table.setStyle(TableStyle(spans))
     
     elements.append(table)
     doc.build(elements)
 
+
+def export_many_to_pdf(timetables: Dict[str, List[Course]], output_dir: str,
+                       font_path: Optional[str] = None) -> List[str]:
+    """为每份课程表导出一个PDF，字体和样式在各文档间共用"""
+    os.makedirs(output_dir, exist_ok=True)
+    files = []
+    for name, courses in timetables.items():
+        filename = os.path.join(output_dir, f"{name}.pdf")
+        export_to_pdf(courses, filename, title=f"{name} 课程表", font_path=font_path)
+        files.append(filename)
+    return files
+
+
 def export_to_ical(courses: List[Course], filename: str):
     from icalendar import Calendar, Event
     from datetime import date, timedelta
@@ -70,7 +244,7 @@ def export_to_ical(courses: List[Course], filename: str):
         event.add('summary', course.name)
         
         # 计算课程日期
-        course_date = monday + timedelta(days=course.weekday)
+        course_date = monday + timedelta(days=course.day_of_week - 1)
         
         # 设置开始和结束时间
         start_dt = datetime.combine(course_date, course.start_time)
@@ -78,7 +252,7 @@ def export_to_ical(courses: List[Course], filename: str):
         
         event.add('dtstart', start_dt)
         event.add('dtend', end_dt)
-        event.add('location', course.location)
+        event.add('location', course.room)
         event.add('description', f"教师: {course.teacher}\n{course.description or ''}")
         
         # 设置每周重复
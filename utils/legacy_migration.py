@@ -0,0 +1,222 @@
+"""把旧版 Database 的 courses.json 迁移到 SQLite 的 CourseManager
+
+旧文件按块流式读取，内存占用只与块大小和单条记录大小有关，与文件大小无关；
+每攒够一批记录就在一个事务中写入。
+
+运行：python -m utils.legacy_migration courses.json courses.db [--batch 1000] [--weeks 1-16周]
+"""
+import argparse
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple
+
+from models.course_manager import CourseManager
+
+JOURNAL_SUFFIX = '.journal'  # 与 database.JOURNAL_SUFFIX 一致
+MAX_REJECTED_SAMPLES = 100
+_DELIMITERS = ",] \t\r\n"
+
+
+@dataclass
+class MigrationProgress:
+    """迁移进度"""
+    bytes_read: int = 0
+    total_bytes: int = 0
+    records: int = 0            # 已读取的记录数
+    migrated: int = 0           # 已写入的课程数
+    rejected: int = 0           # 被拒绝的记录数
+    feedback: int = 0           # 已写入的反馈数
+
+    @property
+    def fraction(self) -> float:
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+
+@dataclass
+class MigrationReport:
+    """迁移结果"""
+    progress: MigrationProgress
+    # 被拒绝记录的 (序号, 原因)，只保留前 MAX_REJECTED_SAMPLES 条
+    rejected_samples: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 64 * 1024) -> Iterator[object]:
+    """逐个产出JSON数组中的元素，每次只读入一块"""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip():
+        # 跳过空白，必要时继续读入
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or not fill():
+                return
+
+    def expect_more():
+        skip()
+        if pos >= len(buf):
+            raise ValueError("旧课程文件不完整：缺少 ]")
+
+    skip()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("旧课程文件应为JSON数组")
+    pos += 1
+    expect_more()
+    if buf[pos] == "]":
+        return
+    while True:
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise
+                continue
+            # 元素后面必须紧跟分隔符；否则可能是在块尾被截断的数字（如 "0." ），读入更多后重解
+            if not eof and (end == len(buf) or buf[end] not in _DELIMITERS) and fill():
+                continue
+            break
+        pos = end
+        yield item
+
+        expect_more()
+        if buf[pos] == "]":
+            return
+        if buf[pos] != ",":
+            raise ValueError("旧课程文件格式错误：元素之间缺少逗号")
+        pos += 1
+        expect_more()
+
+
+def legacy_to_record(data: dict, weeks: str) -> dict:
+    """把旧版课程字典转换为 CourseManager.add_courses_bulk 接受的记录
+
+    旧版星期为0-6，新版为1-7；location 对应 room，rating 对应 score；
+    旧版没有周次，统一使用 weeks。缺少的字段不补，由 add_courses_bulk 校验并拒绝。
+    """
+    if not isinstance(data, dict):
+        return data
+    record = {
+        'room': data.get('location') or "",
+        'teacher': data.get('teacher') or "",
+        'weeks': weeks,
+        'description': data.get('description') or "",
+        'score': data.get('rating') or 0.0,
+    }
+    for key in ('name', 'start_time', 'end_time'):
+        if key in data:
+            record[key] = data[key]
+    if 'weekday' in data:
+        try:
+            record['day_of_week'] = int(data['weekday']) + 1
+        except (TypeError, ValueError):
+            record['day_of_week'] = data['weekday']  # 保留原值，校验时报告
+    return record
+
+
+def _check_journal(legacy_path: str):
+    """旧版存储的日志需要整表重放才能还原，迁移前必须先合并"""
+    journal_path = legacy_path + JOURNAL_SUFFIX
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, 'rb') as f:
+        f.readline()  # 文件头
+        if f.readline().strip():
+            raise ValueError(f"{journal_path} 中有未合并的修改，请先用 Database.save_data() 合并")
+
+
+def migrate_legacy_json(legacy_path: str, manager: CourseManager, batch_size: int = 1000,
+                        weeks: str = "1-16周",
+                        progress: Optional[Callable[[MigrationProgress], None]] = None,
+                        chunk_size: int = 64 * 1024) -> MigrationReport:
+    """流式迁移旧版课程文件
+
+    每批记录通过 add_courses_bulk 在一个事务中写入（与已有课程冲突的记录被拒绝并计入报告），
+    其反馈随后在另一个事务中写入。progress 在每批写入后调用。
+    """
+    _check_journal(legacy_path)
+    state = MigrationProgress(total_bytes=os.path.getsize(legacy_path))
+    report = MigrationReport(state)
+
+    def reject(index: int, reason: str):
+        state.rejected += 1
+        if len(report.rejected_samples) < MAX_REJECTED_SAMPLES:
+            report.rejected_samples.append((index, reason))
+
+    def flush(batch: List[Tuple[dict, list]], start: int):
+        if not batch:
+            return
+        result = manager.add_courses_bulk([record for record, _ in batch], start=start)
+        feedback = []
+        for row in result.rows:
+            _, texts = batch[row.index - start]
+            if not row.accepted:
+                reject(row.index, row.reason)
+                continue
+            state.migrated += 1
+            score = row.course.score
+            feedback.extend((row.course.id, text, score) for text in texts)
+        if feedback:
+            state.feedback += manager.add_feedback_bulk(feedback)
+        batch.clear()
+        state.bytes_read = f.buffer.tell()
+        if progress:
+            progress(state)
+
+    batch: List[Tuple[dict, list]] = []  # (记录, 反馈)，序号从 start 起连续
+    start = 0
+    with open(legacy_path, 'r', encoding='utf-8') as f:
+        for data in iter_json_array(f, chunk_size):
+            state.records += 1
+            feedback = data.get('feedback') if isinstance(data, dict) else None
+            batch.append((legacy_to_record(data, weeks),
+                          feedback if isinstance(feedback, list) else []))
+            if len(batch) >= batch_size:
+                flush(batch, start)
+                start = state.records
+        flush(batch, start)
+    state.bytes_read = state.total_bytes
+    if progress:
+        progress(state)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="把旧版 courses.json 迁移到 SQLite 数据库")
+    parser.add_argument("legacy", help="旧版课程文件（JSON）")
+    parser.add_argument("database", help="目标SQLite数据库")
+    parser.add_argument("--batch", type=int, default=1000, help="每个事务写入的记录数")
+    parser.add_argument("--weeks", default="1-16周", help="旧数据没有周次，迁移后使用的周次")
+    args = parser.parse_args(argv)
+
+    def show(state: MigrationProgress):
+        print(f"\r{state.fraction:6.1%}  已迁移 {state.migrated}  拒绝 {state.rejected}"
+              f"  反馈 {state.feedback}", end="", flush=True)
+
+    manager = CourseManager(args.database)
+    try:
+        report = migrate_legacy_json(args.legacy, manager, args.batch, args.weeks, show)
+    finally:
+        manager.close()
+    print()
+    for index, reason in report.rejected_samples:
+        print(f"第{index + 1}条: {reason}")
+    if report.progress.rejected > len(report.rejected_samples):
+        print(f"……共 {report.progress.rejected} 条被拒绝")
+
+
+if __name__ == "__main__":
+    main()
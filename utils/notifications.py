@@ -0,0 +1,212 @@
+"""课程提醒通知
+
+到期的提醒先进入队列，同一轮事件循环内到期的提醒合并为一条通知；上一条通知关闭前
+到达的提醒也合并为一条等待显示。通知由后端显示：ToastBackend 在主窗口右下角弹出
+不阻塞的提示框并播放提醒声音，HeadlessBackend 只记录通知及送达时刻，
+用于在没有界面的环境中验证提醒是否准时送达。
+"""
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, QUrl, Qt, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QFrame, QLabel, QVBoxLayout, QWidget
+
+from models.course import Course
+
+try:
+    from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+except ImportError:  # 可选组件，缺少系统音频库时无法导入，退回系统提示音
+    QMediaPlayer = None
+
+TOAST_DURATION_MS = 8000   # 提示框自动关闭前的显示时间
+DEFAULT_SOUND = "默认"
+SILENT = "无声"
+
+
+@dataclass
+class Reminder:
+    """一次课程提醒"""
+    course: Course
+    start: datetime   # 上课时刻
+    due: datetime     # 应当提醒的时刻
+
+
+@dataclass
+class Notification:
+    """合并后的一条通知"""
+    title: str
+    message: str
+    sound: str
+    reminders: List[Reminder]
+
+
+def build_notification(reminders: List[Reminder], now: datetime, sound: str) -> Notification:
+    """把若干提醒合并为一条通知，按上课时间排列"""
+    reminders = sorted(reminders, key=lambda r: (r.start, r.course.name))
+
+    def remaining(reminder: Reminder) -> str:
+        minutes = round((reminder.start - now).total_seconds() / 60)
+        return f"将在{minutes}分钟后开始" if minutes > 0 else "已经开始"
+
+    if len(reminders) == 1:
+        course = reminders[0].course
+        return Notification(
+            "课程提醒",
+            f"课程 {course.name} {remaining(reminders[0])}\n"
+            f"教室: {course.room}\n"
+            f"教师: {course.teacher}",
+            sound, reminders
+        )
+    lines = [f"{r.start:%H:%M} {r.course.name}（{r.course.room}，{r.course.teacher}）"
+             f"{remaining(r)}" for r in reminders]
+    return Notification(f"{len(reminders)} 门课程即将开始", "\n".join(lines), sound, reminders)
+
+
+class NotificationBackend(ABC):
+    """通知后端：显示通知，通知关闭后调用 on_finished"""
+
+    def __init__(self):
+        self.on_finished: Optional[Callable[[], None]] = None
+
+    @abstractmethod
+    def show(self, notification: Notification):
+        """显示一条通知"""
+
+    def _finish(self):
+        if self.on_finished is not None:
+            self.on_finished()
+
+
+class HeadlessBackend(NotificationBackend):
+    """无界面后端：按给定时钟记录每条通知的送达时刻，显示后立即视为关闭"""
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        super().__init__()
+        self.clock = clock
+        self.delivered: List[Tuple[datetime, Notification]] = []
+
+    def show(self, notification: Notification):
+        self.delivered.append((self.clock(), notification))
+        self._finish()
+
+
+class _Toast(QFrame):
+    """右下角的提示框，点击或超时后关闭"""
+    closed = pyqtSignal()
+
+    def __init__(self, notification: Notification, parent: QWidget):
+        super().__init__(parent, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint |
+                         Qt.WindowType.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setObjectName("reminderToast")
+        self.setStyleSheet("""
+            #reminderToast {
+                background: #ffffff;
+                border: 1px solid #dadce0;
+                border-radius: 8px;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 12, 16, 12)
+        title = QLabel(notification.title)
+        title.setStyleSheet("font-size: 14px; font-weight: bold; color: #202124;")
+        message = QLabel(notification.message)
+        message.setStyleSheet("font-size: 13px; color: #5f6368;")
+        layout.addWidget(title)
+        layout.addWidget(message)
+
+        QTimer.singleShot(TOAST_DURATION_MS, self.close)
+
+    def mousePressEvent(self, event):
+        self.close()
+
+    def closeEvent(self, event):
+        self.closed.emit()
+        super().closeEvent(event)
+
+
+class ToastBackend(NotificationBackend):
+    """在窗口右下角弹出提示框并播放提醒声音，不阻塞事件循环"""
+
+    def __init__(self, window: QWidget):
+        super().__init__()
+        self._window = window
+        self._player = None
+
+    def show(self, notification: Notification):
+        toast = _Toast(notification, self._window)
+        toast.closed.connect(self._finish)
+        toast.adjustSize()
+        corner = self._window.mapToGlobal(self._window.rect().bottomRight())
+        toast.move(corner.x() - toast.width() - 24, corner.y() - toast.height() - 24)
+        toast.show()
+        self._play(notification.sound)
+
+    def _play(self, sound: str):
+        if sound == SILENT:
+            return
+        if sound == DEFAULT_SOUND or QMediaPlayer is None or not os.path.exists(sound):
+            QApplication.beep()
+            return
+        if self._player is None:
+            self._player = QMediaPlayer(self._window)
+            self._player.setAudioOutput(QAudioOutput(self._player))
+        self._player.setSource(QUrl.fromLocalFile(sound))
+        self._player.play()
+
+
+class NotificationQueue(QObject):
+    """提醒通知队列
+
+    push 的提醒在本轮事件循环结束时合并为一批；后端正在显示通知时，新的一批与
+    尚未显示的那一批合并，因此任何时刻最多只有一条通知在等待。
+    """
+
+    def __init__(self, backend: NotificationBackend, parent: QObject = None,
+                 clock: Callable[[], datetime] = datetime.now):
+        super().__init__(parent)
+        self.backend = backend
+        self.backend.on_finished = self._on_finished
+        self.clock = clock
+        self.sound = DEFAULT_SOUND
+        self._pending: List[Reminder] = []
+        self._waiting: Deque[List[Reminder]] = deque()
+        self._showing = False
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def push(self, reminders: Iterable[Reminder]):
+        """加入到期的提醒"""
+        self._pending.extend(reminders)
+        if self._pending and not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """立即处理已加入的提醒"""
+        self._flush_timer.stop()
+        if self._pending:
+            if self._showing and self._waiting:
+                self._waiting[-1].extend(self._pending)
+            else:
+                self._waiting.append(self._pending)
+            self._pending = []
+        self._show_next()
+
+    def _show_next(self):
+        if self._showing or not self._waiting:
+            return
+        self._showing = True
+        self.backend.show(build_notification(self._waiting.popleft(), self.clock(), self.sound))
+
+    def _on_finished(self):
+        self._showing = False
+        self._show_next()
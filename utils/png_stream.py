@@ -0,0 +1,68 @@
+"""逐行写入的 PNG 编码器
+
+只保存压缩器状态和尚未写出的压缩数据，不需要整张图片在内存中，
+配合分块渲染可以导出任意尺寸的图片。输出 8 位 RGB、不隔行、每行不使用预测滤波。
+"""
+import struct
+import zlib
+from typing import BinaryIO, Iterable
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_SIZE = 1 << 16  # 压缩数据攒够这么多字节后写出一个 IDAT 块
+
+
+class PngStreamWriter:
+    """按从上到下的顺序逐行写入 PNG"""
+
+    def __init__(self, file: BinaryIO, width: int, height: int, level: int = 6):
+        if width <= 0 or height <= 0:
+            raise ValueError(f"图片尺寸无效：{width}x{height}")
+        self.file = file
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._row_bytes = width * 3
+        self._compressor = zlib.compressobj(level)
+        self._pending = bytearray()
+        self.file.write(_SIGNATURE)
+        # 宽、高、位深 8、颜色类型 2（RGB）、压缩、滤波、不隔行
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def write_rows(self, rows: Iterable[bytes]):
+        """写入若干行，每行为 width*3 字节的 RGB 数据"""
+        for row in rows:
+            if len(row) != self._row_bytes:
+                raise ValueError(f"行长度应为 {self._row_bytes} 字节，实际为 {len(row)}")
+            if self.rows_written == self.height:
+                raise ValueError("写入的行数超过图片高度")
+            self._pending += self._compressor.compress(b"\x00")  # 滤波类型：无
+            self._pending += self._compressor.compress(row)
+            self.rows_written += 1
+            if len(self._pending) >= IDAT_SIZE:
+                self._flush()
+
+    def close(self):
+        """写出剩余数据和 IEND 块"""
+        if self.rows_written != self.height:
+            raise ValueError(f"只写入了 {self.rows_written}/{self.height} 行")
+        self._pending += self._compressor.flush()
+        self._flush()
+        self._chunk(b"IEND", b"")
+
+    def __enter__(self) -> "PngStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def _flush(self):
+        if self._pending:
+            self._chunk(b"IDAT", bytes(self._pending))
+            self._pending.clear()
+
+    def _chunk(self, kind: bytes, data: bytes):
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
@@ -1,5 +1,36 @@
-from typing import Dict, Any
-from PyQt6.QtGui import QColor
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QColor, QFont, QGuiApplication, QPainter, QPen, QPixmap
+
+
+@dataclass(frozen=True)
+class CardState:
+    """课程卡片某一状态下的背景与边框"""
+    background: QColor
+    border: QPen
+
+
+@dataclass(frozen=True)
+class CardPalette:
+    """课程卡片的调色板，由主题编译一次后缓存，绘制时直接取用"""
+    normal: CardState
+    hover: CardState
+    selected: CardState
+    match: CardState        # 命中搜索
+    conflict: CardState     # 单元格内课程时间冲突
+    name_color: QColor
+    info_color: QColor
+    empty_hover: QColor     # 空单元格悬停
+
+
+def _mix(color: str, base: str, amount: float) -> QColor:
+    """按比例把 color 混入 base"""
+    a, b = QColor(color), QColor(base)
+    return QColor(round(a.red() * amount + b.red() * (1 - amount)),
+                  round(a.green() * amount + b.green() * (1 - amount)),
+                  round(a.blue() * amount + b.blue() * (1 - amount)))
+
 
 class ThemeManager:
     """主题管理器"""
@@ -63,6 +94,16 @@ class ThemeManager:
         }
     }
     
+    CONFLICT_COLOR = "#e53935"  # 冲突提示色，不随主题变化
+    
+    # 样式模板的版本：修改样式表模板、调色板或预览图的生成规则时加一，旧缓存随之失效
+    STYLE_VERSION = 1
+    
+    # 编译结果按 (主题名, 版本) 缓存，所有实例共享
+    _stylesheets: Dict[Tuple[str, int], str] = {}
+    _card_palettes: Dict[Tuple[str, int], CardPalette] = {}
+    _previews: Dict[Tuple[str, int, int, int, float], QPixmap] = {}
+    
     def __init__(self):
         self.current_theme = "默认主题"
     
@@ -75,10 +116,96 @@ class ThemeManager:
         if theme_name in self.THEMES:
             self.current_theme = theme_name
     
+    def get_card_palette(self, theme_name: str = None) -> CardPalette:
+        """获取课程卡片调色板，每个主题只编译一次"""
+        key = (theme_name or self.current_theme, self.STYLE_VERSION)
+        palette = self._card_palettes.get(key)
+        if palette is None:
+            palette = self._card_palettes[key] = self._compile_card_palette(
+                self.get_theme(key[0]))
+        return palette
+    
+    @classmethod
+    def _compile_card_palette(cls, theme: Dict[str, str]) -> CardPalette:
+        background, primary = theme['background'], theme['primary']
+        return CardPalette(
+            normal=CardState(QColor(theme['surface']), QPen(QColor(theme['border']), 1)),
+            hover=CardState(QColor(theme['hover']), QPen(QColor(primary), 1)),
+            selected=CardState(_mix(primary, background, 0.12), QPen(QColor(primary), 2)),
+            match=CardState(_mix(primary, background, 0.18), QPen(QColor(primary), 2)),
+            conflict=CardState(_mix(cls.CONFLICT_COLOR, background, 0.1),
+                               QPen(QColor(cls.CONFLICT_COLOR), 2)),
+            name_color=QColor(theme['text']),
+            info_color=QColor(theme['text_secondary']),
+            empty_hover=QColor(theme['hover']),
+        )
+    
     def get_stylesheet(self, theme_name: str = None) -> str:
-        """生成主题样式表"""
-        theme = self.get_theme(theme_name)
+        """获取主题样式表，每个主题只生成一次"""
+        key = (theme_name or self.current_theme, self.STYLE_VERSION)
+        stylesheet = self._stylesheets.get(key)
+        if stylesheet is None:
+            stylesheet = self._stylesheets[key] = self._build_stylesheet(self.get_theme(key[0]))
+        return stylesheet
+    
+    def get_preview_pixmap(self, theme_name: str, width: int = 104, height: int = 96) -> QPixmap:
+        """主题预览图（主色调、强调色色块和预览文本），按屏幕缩放比例绘制并缓存"""
+        ratio = QGuiApplication.primaryScreen().devicePixelRatio()
+        key = (theme_name, self.STYLE_VERSION, width, height, ratio)
+        pixmap = self._previews.get(key)
+        if pixmap is None:
+            pixmap = self._previews[key] = self._render_preview(
+                self.get_theme(theme_name), width, height, ratio)
+        return pixmap
+    
+    def compile_all(self):
+        """预先编译所有主题的样式表、调色板和预览图，可在启动后空闲时调用"""
+        for theme_name in self.THEMES:
+            self.get_stylesheet(theme_name)
+            self.get_card_palette(theme_name)
+            self.get_preview_pixmap(theme_name)
+    
+    @staticmethod
+    def _render_preview(theme: Dict[str, str], width: int, height: int, ratio: float) -> QPixmap:
+        pixmap = QPixmap(round(width * ratio), round(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        font = QFont()
+        font.setPixelSize(12)
+        painter.setFont(font)
+        
+        # 主色调、强调色色块
+        swatch = 32
+        gap = (width - 2 * swatch) / 3
+        for i, (label, color) in enumerate((("主色调", theme['primary']),
+                                            ("强调色", theme['accent']))):
+            x = gap + i * (swatch + gap)
+            painter.setPen(QPen(QColor(theme['border']), 1))
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(QRectF(x + 0.5, 0.5, swatch - 1, swatch - 1), 4, 4)
+            painter.setPen(QColor(theme['text_secondary']))
+            painter.drawText(QRectF(x - gap / 2, swatch + 4, swatch + gap, 16),
+                             Qt.AlignmentFlag.AlignCenter, label)
         
+        # 预览文本
+        font.setPixelSize(13)
+        painter.setFont(font)
+        box = QRectF(0, swatch + 28, width, height - swatch - 28)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(theme['surface']))
+        painter.drawRoundedRect(box, 4, 4)
+        painter.setPen(QColor(theme['text']))
+        painter.drawText(box, Qt.AlignmentFlag.AlignCenter, "预览文本")
+        painter.end()
+        return pixmap
+    
+    @staticmethod
+    def _build_stylesheet(theme: Dict[str, str]) -> str:
+        """生成主题样式表"""
         return f"""
         /* 主窗口样式 */
         QMainWindow {{
@@ -219,13 +346,13 @@ class ThemeManager:
         }}
         
         /* 表格样式 */
-        QTableWidget {{
+        QTableView {{
             background-color: {theme['background']};
             border: none;
             gridline-color: {theme['border']};
         }}
         
-        QTableWidget::item {{
+        QTableView::item {{
             padding: 2px;
         }}
         
@@ -254,7 +381,7 @@ class ThemeManager:
         }}
         
         /* 空单元格悬停效果 */
-        QTableWidget::item:empty:hover {{
+        QTableView::item:empty:hover {{
             background-color: {theme['hover']};
             border: 1px dashed {theme['border']};
             border-radius: 6px;
@@ -0,0 +1,240 @@
+"""离屏课程表渲染
+
+直接按课程数据把任意一周的课程表画到 QImage 或 QPdfWriter 上，不依赖主窗口和表格控件，
+因此与窗口大小、当前选中的周次无关。只用到 QImage、QPdfWriter 和 QPainter，
+可在 offscreen 平台、脚本和工作线程中调用（进程中需已创建 QGuiApplication 或 QApplication）。
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QMarginsF, QRect, QRectF, QSize, Qt, QThread, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QImage, QPageLayout, QPageSize, QPainter, QPdfWriter, QPen
+
+from models.course import Course
+from utils.png_stream import PngStreamWriter
+from ui.timetable_model import (TIME_SLOTS, WEEKDAY_HEADERS, CardPainter, course_cell)
+from utils.theme_manager import ThemeManager
+
+Cell = Tuple[int, int]
+
+TILE_BYTES = 16 << 20       # 分块渲染时每块图片的内存上限
+MAX_IMAGE_BYTES = 64 << 20  # 超过此大小的图片改为分块渲染
+POSTER_SCALE = 8.0          # 海报尺寸PNG的放大倍数，约 10900x6000 像素，超过上面的阈值
+
+
+def week_title(week: Optional[int]) -> str:
+    """导出文件的标题"""
+    return "课程表 - 总课表" if not week else f"课程表 - 第{week}周课表"
+
+
+class TimetableRenderer:
+    """按课程数据绘制课程表
+
+    布局以逻辑像素计算，与界面中的表格一致（表头高 40、时间列宽 100、行高 130），
+    绘制时整体缩放到目标设备，卡片文字随之放大，不会因分辨率而错位。
+    """
+
+    TITLE_HEIGHT = 60
+    HEADER_HEIGHT = 40
+    TIME_COLUMN_WIDTH = 100
+    COLUMN_WIDTH = 180
+    ROW_HEIGHT = 130
+
+    def __init__(self, theme_name: str = None):
+        manager = ThemeManager()
+        self.theme = manager.get_theme(theme_name)
+        self.palette = manager.get_card_palette(theme_name or manager.current_theme)
+        self.card_painter = CardPainter(self.palette)
+
+    def size(self) -> QSize:
+        """整张课程表（含标题）的逻辑尺寸，多留 1 像素给右侧和底部的网格线"""
+        return QSize(self.TIME_COLUMN_WIDTH + self.COLUMN_WIDTH * len(WEEKDAY_HEADERS) + 1,
+                     self.TITLE_HEIGHT + self.HEADER_HEIGHT + self.ROW_HEIGHT * len(TIME_SLOTS) + 1)
+
+    @staticmethod
+    def layout(courses: Iterable[Course], week: Optional[int] = None
+               ) -> Tuple[Dict[Cell, Course], set]:
+        """课程所在的单元格及有时间冲突的单元格，同一单元格显示ID最大的课程"""
+        cells: Dict[Cell, List[Course]] = {}
+        for course in courses:
+            cell = course_cell(course, week)
+            if cell is not None:
+                cells.setdefault(cell, []).append(course)
+        visible = {}
+        conflicts = set()
+        for cell, group in cells.items():
+            group.sort(key=lambda c: c.id)
+            visible[cell] = group[-1]
+            if any(a.conflicts_with(b) for i, a in enumerate(group) for b in group[i + 1:]):
+                conflicts.add(cell)
+        return visible, conflicts
+
+    def paint(self, painter: QPainter, target: QRectF, courses: Iterable[Course],
+              week: Optional[int] = None, title: str = None):
+        """把课程表等比缩放绘制到 target 区域中，水平居中"""
+        size = self.size()
+        scale = min(target.width() / size.width(), target.height() / size.height())
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.translate(target.left() + (target.width() - size.width() * scale) / 2, target.top())
+        painter.scale(scale, scale)
+        self._paint_title(painter, title or week_title(week))
+        painter.translate(0, self.TITLE_HEIGHT)
+        self._paint_grid(painter)
+        visible, conflicts = self.layout(courses, week)
+        for cell, course in visible.items():
+            state = self.palette.conflict if cell in conflicts else self.palette.normal
+            self.card_painter.paint(painter, self._cell_rect(*cell), course, state)
+        painter.restore()
+
+    def render_image(self, courses: Iterable[Course], week: Optional[int] = None,
+                     scale: float = 2.0) -> QImage:
+        """渲染为 QImage，scale 为相对逻辑尺寸的放大倍数"""
+        size = self.size()
+        image = QImage(round(size.width() * scale), round(size.height() * scale),
+                       QImage.Format.Format_RGB32)
+        image.fill(QColor(self.theme['background']))
+        painter = QPainter(image)
+        self.paint(painter, QRectF(0, 0, image.width(), image.height()), courses, week)
+        painter.end()
+        return image
+
+    def save_image(self, file_path: str, courses: Iterable[Course],
+                   week: Optional[int] = None, scale: float = 2.0):
+        """导出为PNG图片，图片过大时分块渲染"""
+        size = self.size()
+        if size.width() * size.height() * scale * scale * 4 > MAX_IMAGE_BYTES:
+            self.save_image_tiled(file_path, courses, week, scale)
+        elif not self.render_image(courses, week, scale).save(file_path, "PNG"):
+            raise OSError(f"无法写入图片：{file_path}")
+
+    def save_image_tiled(self, file_path: str, courses: Iterable[Course],
+                         week: Optional[int] = None, scale: float = 2.0,
+                         tile_bytes: int = TILE_BYTES):
+        """分块渲染并逐行编码为PNG
+
+        每次只把一条横带画到同一块大小固定的 QImage 上，再把其中的各行交给流式编码器，
+        内存占用取决于 tile_bytes 而不是输出分辨率。
+        """
+        courses = list(courses)
+        size = self.size()
+        width, height = round(size.width() * scale), round(size.height() * scale)
+        band = max(1, min(height, tile_bytes // (width * 3)))
+        tile = QImage(width, band, QImage.Format.Format_RGB888)
+        target = QRectF(0, 0, width, height)
+        row_bytes = width * 3
+        stride = tile.bytesPerLine()
+        background = QColor(self.theme['background'])
+
+        with open(file_path, "wb") as file, PngStreamWriter(file, width, height) as png:
+            for top in range(0, height, band):
+                rows = min(band, height - top)
+                tile.fill(background)
+                painter = QPainter(tile)
+                painter.translate(0, -top)
+                painter.setClipRect(QRectF(0, top, width, rows))
+                self.paint(painter, target, courses, week)
+                painter.end()
+                bits = tile.constBits()
+                bits.setsize(tile.sizeInBytes())
+                data = memoryview(bits)
+                png.write_rows(data[y * stride:y * stride + row_bytes] for y in range(rows))
+
+    def new_pdf_writer(self, file_path: str, resolution: int = 300) -> QPdfWriter:
+        """A4横向、1cm边距的PDF写入器"""
+        writer = QPdfWriter(file_path)
+        writer.setResolution(resolution)
+        writer.setPageLayout(QPageLayout(QPageSize(QPageSize.PageSizeId.A4),
+                                         QPageLayout.Orientation.Landscape,
+                                         QMarginsF(10, 10, 10, 10), QPageLayout.Unit.Millimeter))
+        return writer
+
+    def paint_page(self, painter: QPainter, writer: QPdfWriter, courses: Iterable[Course],
+                   week: Optional[int] = None):
+        """在PDF的当前页绘制一周的课程表"""
+        page = writer.pageLayout().paintRectPixels(writer.resolution())
+        self.paint(painter, QRectF(0, 0, page.width(), page.height()), courses, week)
+
+    def save_pdf(self, file_path: str, courses: Iterable[Course],
+                 week: Optional[int] = None, resolution: int = 300):
+        """导出为单页PDF"""
+        writer = self.new_pdf_writer(file_path, resolution)
+        painter = QPainter()
+        if not painter.begin(writer):
+            raise OSError(f"无法写入PDF：{file_path}")
+        self.paint_page(painter, writer, courses, week)
+        painter.end()
+
+    def _cell_rect(self, row: int, col: int) -> QRect:
+        return QRect(self.TIME_COLUMN_WIDTH + col * self.COLUMN_WIDTH,
+                     self.HEADER_HEIGHT + row * self.ROW_HEIGHT,
+                     self.COLUMN_WIDTH, self.ROW_HEIGHT)
+
+    def _paint_title(self, painter: QPainter, title: str):
+        font = QFont()
+        font.setPixelSize(22)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor(self.theme['text']))
+        painter.drawText(QRect(0, 0, self.size().width(), self.TITLE_HEIGHT),
+                         Qt.AlignmentFlag.AlignCenter, title)
+
+    def _paint_grid(self, painter: QPainter):
+        theme = self.theme
+        width = self.TIME_COLUMN_WIDTH + self.COLUMN_WIDTH * len(WEEKDAY_HEADERS)
+        height = self.HEADER_HEIGHT + self.ROW_HEIGHT * len(TIME_SLOTS)
+
+        # 表头背景
+        painter.fillRect(QRect(0, 0, width, self.HEADER_HEIGHT), QColor(theme['surface']))
+        painter.fillRect(QRect(0, 0, self.TIME_COLUMN_WIDTH, height), QColor(theme['surface']))
+
+        font = QFont()
+        font.setPixelSize(13)
+        painter.setFont(font)
+        painter.setPen(QColor(theme['text']))
+        for col, header in enumerate(WEEKDAY_HEADERS):
+            painter.drawText(QRect(self.TIME_COLUMN_WIDTH + col * self.COLUMN_WIDTH, 0,
+                                   self.COLUMN_WIDTH, self.HEADER_HEIGHT),
+                             Qt.AlignmentFlag.AlignCenter, header)
+        for row, (label, start, end) in enumerate(TIME_SLOTS):
+            painter.drawText(QRect(0, self.HEADER_HEIGHT + row * self.ROW_HEIGHT,
+                                   self.TIME_COLUMN_WIDTH, self.ROW_HEIGHT),
+                             Qt.AlignmentFlag.AlignCenter, f"{label}\n{start}-{end}")
+
+        # 网格线
+        painter.setPen(QPen(QColor(theme['border']), 1))
+        for col in range(len(WEEKDAY_HEADERS) + 1):
+            x = self.TIME_COLUMN_WIDTH + col * self.COLUMN_WIDTH
+            painter.drawLine(x, 0, x, height)
+        painter.drawLine(0, 0, 0, height)
+        for row in range(len(TIME_SLOTS) + 1):
+            y = self.HEADER_HEIGHT + row * self.ROW_HEIGHT
+            painter.drawLine(0, y, width, y)
+        painter.drawLine(0, 0, width, 0)
+
+
+class ExportThread(QThread):
+    """在工作线程中导出课程表，导出期间界面保持响应"""
+    succeeded = pyqtSignal(str)  # 导出的文件路径
+    failed = pyqtSignal(str)     # 错误信息
+
+    def __init__(self, file_path: str, courses: List[Course], week: Optional[int] = None,
+                 theme_name: str = None, scale: float = 2.0, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.courses = courses
+        self.week = week
+        self.theme_name = theme_name
+        self.scale = scale  # PNG的放大倍数
+
+    def run(self):
+        try:
+            renderer = TimetableRenderer(self.theme_name)
+            if self.file_path.lower().endswith(".pdf"):
+                renderer.save_pdf(self.file_path, self.courses, self.week)
+            else:
+                renderer.save_image(self.file_path, self.courses, self.week, self.scale)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.succeeded.emit(self.file_path)